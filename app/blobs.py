@@ -0,0 +1,49 @@
+"""Content-addressed blob store for payloads too large to keep in graph state."""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BlobStore:
+    """Files named by the sha256 of their bytes, fanned out by digest prefix.
+
+    Writes are idempotent and atomic, so processes sharing a directory can
+    store the same payload concurrently.
+    """
+
+    def __init__(self, root: str) -> None:
+        self._root = Path(root)
+
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if path.exists():
+            return digest
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        data = self._path(digest).read_bytes()
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Blob {digest} is corrupt")
+        return data
+
+    def _path(self, digest: str) -> Path:
+        if not _DIGEST_RE.match(digest):
+            raise ValueError(f"Invalid blob digest: {digest!r}")
+        return self._root / digest[:2] / digest[2:]
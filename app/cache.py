@@ -0,0 +1,222 @@
+"""Result caches shared by the nodes."""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+_TABLE_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_SQLITE_TIMEOUT_SECONDS = 5
+
+
+def make_cache_key(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryCache:
+    """Thread-safe LRU cache with an optional TTL; `None` values are not stored."""
+
+    def __init__(self, *, max_entries: int = 1024, ttl_seconds: Optional[float] = None) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[Optional[float], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, *, ttl_seconds: Optional[float] = None) -> None:
+        """Store `value`; `ttl_seconds` can only shorten the cache TTL for this entry."""
+        if value is None:
+            return
+        ttls = [ttl for ttl in (self._ttl_seconds, ttl_seconds) if ttl is not None]
+        expires_at = time.monotonic() + min(ttls) if ttls else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteCache:
+    """JSON values in a SQLite table that several processes can share."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        table: str = "cache",
+        max_entries: int = 10000,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        if not _TABLE_NAME_RE.match(table):
+            raise ValueError(f"Invalid cache table name: {table!r}")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._table = table
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path,
+            timeout=_SQLITE_TIMEOUT_SECONDS,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_accessed_at ON {table} (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_with_ttl(key)
+        return None if entry is None else entry[0]
+
+    def get_with_ttl(self, key: str) -> Optional[tuple[Any, Optional[float]]]:
+        """Return the value and its remaining lifetime in seconds (None if unbounded)."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self._table} WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                f"UPDATE {self._table} SET accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+        return json.loads(value), None if expires_at is None else expires_at - now
+
+    def set(self, key: str, value: Any) -> None:
+        if value is None:
+            return
+        now = time.time()
+        expires_at = None
+        if self._ttl_seconds is not None:
+            expires_at = now + self._ttl_seconds
+        payload = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self._table} "
+                "(key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, now),
+            )
+            self._conn.execute(
+                f"DELETE FROM {self._table} WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (now,),
+            )
+            self._conn.execute(
+                f"DELETE FROM {self._table} WHERE key IN ("
+                f"SELECT key FROM {self._table} ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self._table}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+
+class TieredCache:
+    """Memory tier in front of an optional SQLite tier; disk hits are promoted."""
+
+    def __init__(self, memory: MemoryCache, disk: Optional[SqliteCache] = None) -> None:
+        self.memory = memory
+        self.disk = disk
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            entry = self.disk.get_with_ttl(key)
+            if entry is not None:
+                # The promoted copy must not outlive the disk entry.
+                value, remaining = entry
+                self.memory.set(key, value, ttl_seconds=remaining)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
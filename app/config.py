@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import json
 import os
 import re
 import shlex
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Optional
 
 from dotenv import load_dotenv
 
@@ -18,6 +19,18 @@ class MilvusConfig:
     collection: Optional[str]
     partition: Optional[str]
     db_name: Optional[str]
+    health_check_interval: Optional[float] = None
+    consistency_level: Optional[str] = None
+    flush_on_write: Optional[bool] = None
+    index_type: Optional[str] = None
+    metric_type: Optional[str] = None
+    index_params: Optional[dict[str, Any]] = None
+    search_nprobe: Optional[int] = None
+    search_ef: Optional[int] = None
+    search_list: Optional[int] = None
+    backend: Optional[str] = None
+    local_path: Optional[str] = None
+    dedupe: Optional[bool] = None
 
 
 @dataclass
@@ -25,6 +38,18 @@ class Mem0Config:
     server_url: Optional[str]
     api_key: Optional[str]
     user_id: Optional[str]
+    connect_timeout: Optional[float] = None
+    read_timeout: Optional[float] = None
+    pool_size: Optional[int] = None
+    max_retries: Optional[int] = None
+    retry_backoff: Optional[float] = None
+    write_mode: Optional[str] = None
+    write_queue_size: Optional[int] = None
+    batch_window: Optional[float] = None
+    batch_max_items: Optional[int] = None
+    search_cache_enabled: Optional[bool] = None
+    search_cache_ttl: Optional[float] = None
+    search_cache_max_entries: Optional[int] = None
 
 
 @dataclass
@@ -34,6 +59,13 @@ class LLMConfig:
     model: Optional[str]
     timeout: Optional[int]
     temperature: Optional[float]
+    max_connections: Optional[int] = None
+    keepalive_expiry: Optional[float] = None
+    cache_enabled: Optional[bool] = None
+    cache_path: Optional[str] = None
+    cache_ttl: Optional[float] = None
+    cache_max_entries: Optional[int] = None
+    stream: Optional[bool] = None
 
 
 @dataclass
@@ -52,6 +84,16 @@ class MCPConfig:
     api_key: Optional[str]
     command: Optional[str]
     args: list[str]
+    session_pool: Optional[bool] = None
+    max_concurrent_calls: Optional[int] = None
+    health_check_interval: Optional[float] = None
+    capability_ttl: Optional[float] = None
+    cache_tools: Optional[list[str]] = None
+    cache_ttl: Optional[float] = None
+    cache_max_entries: Optional[int] = None
+    cache_path: Optional[str] = None
+    inline_limit: Optional[int] = None
+    blob_dir: Optional[str] = None
 
 
 @dataclass
@@ -60,6 +102,11 @@ class CheckpointConfig:
     path: Optional[str]
 
 
+@dataclass
+class GraphConfig:
+    topology: Optional[str] = None
+
+
 @dataclass
 class AppConfig:
     milvus: MilvusConfig
@@ -68,6 +115,7 @@ class AppConfig:
     langfuse: LangfuseConfig
     mcp: MCPConfig
     checkpoint: CheckpointConfig
+    graph: GraphConfig = field(default_factory=GraphConfig)
 
 
 def _normalize(value: Optional[str]) -> Optional[str]:
@@ -90,6 +138,19 @@ def _normalize_url(value: Optional[str]) -> Optional[str]:
     return f"http://{value}"
 
 
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+def _parse_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in _TRUE_VALUES:
+        return True
+    if lowered in _FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid boolean: {value!r}")
+
+
 def _get_env(name: str, cast=None) -> Optional[object]:
     value = _normalize(os.getenv(name))
     if value is None:
@@ -113,6 +174,17 @@ def _parse_args(value: Optional[str]) -> list[str]:
     return shlex.split(value)
 
 
+def _parse_names(value: str) -> list[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def _parse_json_object(value: str) -> dict[str, Any]:
+    data = json.loads(value)
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object")
+    return data
+
+
 def load_config() -> AppConfig:
     load_dotenv(override=False)
 
@@ -124,11 +196,35 @@ def load_config() -> AppConfig:
         collection=_get_env("MILVUS_COLLECTION"),
         partition=_get_env("MILVUS_PARTITION"),
         db_name=_get_env("MILVUS_DB_NAME"),
+        health_check_interval=_get_env("MILVUS_HEALTH_CHECK_INTERVAL", cast=float),
+        consistency_level=_get_env("MILVUS_CONSISTENCY_LEVEL"),
+        flush_on_write=_get_env("MILVUS_FLUSH_ON_WRITE", cast=_parse_bool),
+        index_type=_get_env("MILVUS_INDEX_TYPE"),
+        metric_type=_get_env("MILVUS_METRIC_TYPE"),
+        index_params=_get_env("MILVUS_INDEX_PARAMS", cast=_parse_json_object),
+        search_nprobe=_get_env("MILVUS_SEARCH_NPROBE", cast=int),
+        search_ef=_get_env("MILVUS_SEARCH_EF", cast=int),
+        search_list=_get_env("MILVUS_SEARCH_LIST", cast=int),
+        backend=_get_env("MILVUS_BACKEND"),
+        local_path=_get_env("MILVUS_LOCAL_PATH"),
+        dedupe=_get_env("MILVUS_DEDUPE", cast=_parse_bool),
     )
     mem0 = Mem0Config(
         server_url=_get_env_url("MEM0_SERVER_URL"),
         api_key=_get_env("MEM0_API_KEY"),
         user_id=_get_env("MEM0_USER_ID"),
+        connect_timeout=_get_env("MEM0_CONNECT_TIMEOUT", cast=float),
+        read_timeout=_get_env("MEM0_READ_TIMEOUT", cast=float),
+        pool_size=_get_env("MEM0_POOL_SIZE", cast=int),
+        max_retries=_get_env("MEM0_MAX_RETRIES", cast=int),
+        retry_backoff=_get_env("MEM0_RETRY_BACKOFF", cast=float),
+        write_mode=_get_env("MEM0_WRITE_MODE"),
+        write_queue_size=_get_env("MEM0_WRITE_QUEUE_SIZE", cast=int),
+        batch_window=_get_env("MEM0_BATCH_WINDOW", cast=float),
+        batch_max_items=_get_env("MEM0_BATCH_MAX_ITEMS", cast=int),
+        search_cache_enabled=_get_env("MEM0_SEARCH_CACHE", cast=_parse_bool),
+        search_cache_ttl=_get_env("MEM0_SEARCH_CACHE_TTL", cast=float),
+        search_cache_max_entries=_get_env("MEM0_SEARCH_CACHE_MAX_ENTRIES", cast=int),
     )
     llm = LLMConfig(
         api_key=_get_env("LLM_API_KEY"),
@@ -136,6 +232,13 @@ def load_config() -> AppConfig:
         model=_get_env("LLM_MODEL"),
         timeout=_get_env("LLM_TIMEOUT", cast=int),
         temperature=_get_env("LLM_TEMPERATURE", cast=float),
+        max_connections=_get_env("LLM_MAX_CONNECTIONS", cast=int),
+        keepalive_expiry=_get_env("LLM_KEEPALIVE_EXPIRY", cast=float),
+        cache_enabled=_get_env("LLM_CACHE", cast=_parse_bool),
+        cache_path=_get_env("LLM_CACHE_PATH"),
+        cache_ttl=_get_env("LLM_CACHE_TTL", cast=float),
+        cache_max_entries=_get_env("LLM_CACHE_MAX_ENTRIES", cast=int),
+        stream=_get_env("LLM_STREAM", cast=_parse_bool),
     )
     langfuse = LangfuseConfig(
         public_key=_get_env("LANGFUSE_PUBLIC_KEY"),
@@ -150,11 +253,24 @@ def load_config() -> AppConfig:
         api_key=_get_env("MCP_API_KEY"),
         command=_get_env("MCP_COMMAND"),
         args=_parse_args(os.getenv("MCP_ARGS")),
+        session_pool=_get_env("MCP_SESSION_POOL", cast=_parse_bool),
+        max_concurrent_calls=_get_env("MCP_MAX_CONCURRENT_CALLS", cast=int),
+        health_check_interval=_get_env("MCP_HEALTH_CHECK_INTERVAL", cast=float),
+        capability_ttl=_get_env("MCP_CAPABILITY_TTL", cast=float),
+        cache_tools=_get_env("MCP_CACHE_TOOLS", cast=_parse_names),
+        cache_ttl=_get_env("MCP_CACHE_TTL", cast=float),
+        cache_max_entries=_get_env("MCP_CACHE_MAX_ENTRIES", cast=int),
+        cache_path=_get_env("MCP_CACHE_PATH"),
+        inline_limit=_get_env("MCP_INLINE_LIMIT", cast=int),
+        blob_dir=_get_env("MCP_BLOB_DIR"),
     )
     checkpoint = CheckpointConfig(
         backend=_get_env("CHECKPOINT_BACKEND"),
         path=_get_env("CHECKPOINT_PATH"),
     )
+    graph = GraphConfig(
+        topology=_get_env("GRAPH_TOPOLOGY"),
+    )
 
     return AppConfig(
         milvus=milvus,
@@ -163,4 +279,5 @@ def load_config() -> AppConfig:
         langfuse=langfuse,
         mcp=mcp,
         checkpoint=checkpoint,
+        graph=graph,
     )
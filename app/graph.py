@@ -1,20 +1,32 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Optional, TypedDict
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Optional, TypedDict
 
 from langgraph.checkpoint.memory import MemorySaver
-from langgraph.graph import END, StateGraph
-from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
+from langgraph.graph import END, START, StateGraph
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 
 from app.config import AppConfig, CheckpointConfig
-from app.nodes.llm import run_llm_node
-from app.nodes.mem0 import run_mem0_node
-from app.nodes.milvus import run_milvus_node
-from app.nodes.mcp import run_mcp_node
+from app.nodes.llm import arun_llm_node, run_llm_node
+from app.nodes.mem0 import arun_mem0_node, run_mem0_node
+from app.nodes.milvus import arun_milvus_node, run_milvus_node
+from app.nodes.mcp import arun_mcp_batch, arun_mcp_node, run_mcp_batch, run_mcp_node
 from app.observability.langfuse import (
+    LANGFUSE_TRACE_CONFIG_KEY,
     clear_langfuse_trace,
     end_langfuse_span,
     ensure_langfuse_trace,
+    extract_langfuse_trace,
     extract_thread_id,
     get_langfuse_trace,
     start_langfuse_span,
@@ -22,8 +34,16 @@ from app.observability.langfuse import (
 )
 
 
+logger = logging.getLogger(__name__)
 DEFAULT_VECTOR = [0.1, 0.2, 0.3]
 DEFAULT_MEM0_QUERY = "What did the user say?"
+GRAPH_TOPOLOGIES = ("sequential", "parallel")
+_GRAPH_CACHE_MAX_ENTRIES = 32
+_GRAPH_CACHE: OrderedDict[tuple[Any, ...], tuple[Any, ...]] = OrderedDict()
+_CHECKPOINTERS: dict[str, object] = {}
+_GRAPH_CACHE_LOCK = threading.Lock()
+# Ordered `run_agent_many` buffers at most this many results per worker.
+_ORDERED_BUFFER_FACTOR = 4
 
 
 class AgentState(TypedDict, total=False):
@@ -32,6 +52,7 @@ class AgentState(TypedDict, total=False):
     milvus_vector: list[float]
     milvus_query_vector: list[float]
     mcp_tool_args: dict[str, Any]
+    mcp_tool_calls: list[dict[str, Any]]
     llm: dict[str, Any]
     mem0: dict[str, Any]
     milvus: dict[str, Any]
@@ -39,68 +60,156 @@ class AgentState(TypedDict, total=False):
     result: dict[str, Any]
 
 
+NodeFn = Callable[[AgentState], dict[str, Any]]
+AsyncNodeFn = Callable[[AgentState], Awaitable[dict[str, Any]]]
+
+
 def _get_override(
-    overrides: Optional[dict[str, Callable[[AgentState], dict[str, Any]]]],
+    overrides: Optional[dict[str, NodeFn]],
     name: str,
-    default: Callable[[AgentState], dict[str, Any]],
-) -> Callable[[AgentState], dict[str, Any]]:
+    default: NodeFn,
+    adefault: Optional[AsyncNodeFn] = None,
+) -> tuple[NodeFn, Optional[AsyncNodeFn]]:
+    # Overrides are plain callables; under ainvoke they run in a worker thread.
     if overrides and name in overrides:
-        return overrides[name]
-    return default
+        return overrides[name], None
+    return default, adefault
+
+
+def _resolve_topology(config: AppConfig, topology: Optional[str]) -> str:
+    value = (topology or config.graph.topology or "sequential").lower()
+    if value not in GRAPH_TOPOLOGIES:
+        raise ValueError(f"Unsupported graph topology: {value!r}")
+    return value
 
 
 def build_graph(
     config: AppConfig,
     *,
-    node_overrides: Optional[dict[str, Callable[[AgentState], dict[str, Any]]]] = None,
+    node_overrides: Optional[dict[str, NodeFn]] = None,
     langfuse_trace: Optional[object] = None,
+    topology: Optional[str] = None,
 ) -> StateGraph:
     app_config = config
+    graph_topology = _resolve_topology(config, topology)
+    # Parallel branches run with copied contexts, so a lazily created trace is
+    # shared through this map instead of the context variable alone.
+    lazy_traces: dict[str, object] = {}
+    lazy_traces_lock = threading.Lock()
+
+    def _resolve_trace(config: Optional[RunnableConfig]) -> Optional[object]:
+        active_trace = (
+            langfuse_trace
+            or extract_langfuse_trace(config)
+            or get_langfuse_trace()
+        )
+        if active_trace is not None:
+            return active_trace
+        thread_id = extract_thread_id(config)
+        with lazy_traces_lock:
+            active_trace = lazy_traces.get(thread_id)
+            if active_trace is None:
+                active_trace, _ = ensure_langfuse_trace(
+                    config=app_config.langfuse,
+                    trace_name="agent-run",
+                    metadata={"thread_id": thread_id},
+                )
+                if active_trace is not None:
+                    lazy_traces[thread_id] = active_trace
+        return active_trace
+
+    def _start_span(name: str, config: Optional[RunnableConfig]) -> Optional[object]:
+        return start_langfuse_span(
+            _resolve_trace(config),
+            span_name=name,
+            metadata={"node": name},
+        )
+
+    def _end_span(name: str, span: Optional[object], config: Optional[RunnableConfig]) -> None:
+        end_langfuse_span(span)
+        if langfuse_trace is None and name == "final":
+            with lazy_traces_lock:
+                lazy_traces.pop(extract_thread_id(config), None)
+            clear_langfuse_trace()
 
     def _wrap_with_span(
         name: str,
-        node_fn: Callable[[AgentState], dict[str, Any]],
-    ) -> Callable[[AgentState], dict[str, Any]]:
+        node_fns: tuple[NodeFn, Optional[AsyncNodeFn]],
+    ) -> RunnableLambda:
+        node_fn, anode_fn = node_fns
+
         def _wrapped(
             state: AgentState,
             config: Optional[RunnableConfig] = None,
         ) -> dict[str, Any]:
-            active_trace = langfuse_trace or get_langfuse_trace()
-            if active_trace is None:
-                active_trace, _ = ensure_langfuse_trace(
-                    config=app_config.langfuse,
-                    trace_name="agent-run",
-                    metadata={"thread_id": extract_thread_id(config)},
-                )
-            span = start_langfuse_span(
-                active_trace,
-                span_name=name,
-                metadata={"node": name},
-            )
+            span = _start_span(name, config)
             try:
                 return node_fn(state)
             finally:
-                end_langfuse_span(span)
-                if langfuse_trace is None and name == "final":
-                    clear_langfuse_trace()
+                _end_span(name, span, config)
 
-        return _wrapped
+        async def _awrapped(
+            state: AgentState,
+            config: Optional[RunnableConfig] = None,
+        ) -> dict[str, Any]:
+            span = _start_span(name, config)
+            try:
+                if anode_fn is not None:
+                    return await anode_fn(state)
+                return await asyncio.to_thread(node_fn, state)
+            finally:
+                _end_span(name, span, config)
 
-    def _llm_node(state: AgentState) -> dict[str, Any]:
-        prompt = state.get("prompt", "")
-        return {"llm": run_llm_node(prompt, config=config.llm)}
+        return RunnableLambda(_wrapped, afunc=_awrapped, name=name)
 
-    def _mem0_node(state: AgentState) -> dict[str, Any]:
+    def _llm_prompt(state: AgentState) -> str:
+        return state.get("prompt", "")
+
+    def _mem0_inputs(state: AgentState) -> tuple[str, str]:
         content = ""
         if isinstance(state.get("llm"), dict):
             content = state["llm"].get("output_text") or ""
         content = content or state.get("prompt", "")
         query = state.get("mem0_query", DEFAULT_MEM0_QUERY)
+        return content, query
+
+    def _milvus_inputs(state: AgentState) -> tuple[list[float], Optional[list[float]]]:
+        return state.get("milvus_vector", DEFAULT_VECTOR), state.get("milvus_query_vector")
+
+    def _mcp_tool_args(state: AgentState) -> dict[str, Any]:
+        return state.get("mcp_tool_args", {})
+
+    def _llm_stream_kwargs() -> dict[str, Any]:
+        # Deltas go to the "custom" stream mode; plain invoke discards them.
+        if not config.llm.stream:
+            return {}
+        writer = get_stream_writer()
+        return {"on_token": lambda delta: writer({"node": "llm", "delta": delta})}
+
+    def _llm_node(state: AgentState) -> dict[str, Any]:
+        return {
+            "llm": run_llm_node(
+                _llm_prompt(state), config=config.llm, **_llm_stream_kwargs()
+            )
+        }
+
+    async def _allm_node(state: AgentState) -> dict[str, Any]:
+        return {
+            "llm": await arun_llm_node(
+                _llm_prompt(state), config=config.llm, **_llm_stream_kwargs()
+            )
+        }
+
+    def _mem0_node(state: AgentState) -> dict[str, Any]:
+        content, query = _mem0_inputs(state)
         return {"mem0": run_mem0_node(content, query, config=config.mem0)}
 
+    async def _amem0_node(state: AgentState) -> dict[str, Any]:
+        content, query = _mem0_inputs(state)
+        return {"mem0": await arun_mem0_node(content, query, config=config.mem0)}
+
     def _milvus_node(state: AgentState) -> dict[str, Any]:
-        vector = state.get("milvus_vector", DEFAULT_VECTOR)
-        query_vector = state.get("milvus_query_vector")
+        vector, query_vector = _milvus_inputs(state)
         return {
             "milvus": run_milvus_node(
                 vector,
@@ -109,9 +218,26 @@ def build_graph(
             )
         }
 
+    async def _amilvus_node(state: AgentState) -> dict[str, Any]:
+        vector, query_vector = _milvus_inputs(state)
+        return {
+            "milvus": await arun_milvus_node(
+                vector,
+                config=config.milvus,
+                query_vector=query_vector,
+            )
+        }
+
     def _mcp_node(state: AgentState) -> dict[str, Any]:
-        tool_args = state.get("mcp_tool_args", {})
-        return {"mcp": run_mcp_node(tool_args, config=config.mcp)}
+        # A list of calls replaces the single MCP_TOOL_NAME call.
+        if state.get("mcp_tool_calls"):
+            return {"mcp": run_mcp_batch(state["mcp_tool_calls"], config=config.mcp)}
+        return {"mcp": run_mcp_node(_mcp_tool_args(state), config=config.mcp)}
+
+    async def _amcp_node(state: AgentState) -> dict[str, Any]:
+        if state.get("mcp_tool_calls"):
+            return {"mcp": await arun_mcp_batch(state["mcp_tool_calls"], config=config.mcp)}
+        return {"mcp": await arun_mcp_node(_mcp_tool_args(state), config=config.mcp)}
 
     def _final_node(state: AgentState) -> dict[str, Any]:
         return {
@@ -126,29 +252,50 @@ def build_graph(
     graph = StateGraph(AgentState)
     graph.add_node(
         "llm",
-        _wrap_with_span("llm", _get_override(node_overrides, "llm", _llm_node)),
+        _wrap_with_span(
+            "llm",
+            _get_override(node_overrides, "llm", _llm_node, _allm_node),
+        ),
     )
     graph.add_node(
         "mem0",
-        _wrap_with_span("mem0", _get_override(node_overrides, "mem0", _mem0_node)),
+        _wrap_with_span(
+            "mem0",
+            _get_override(node_overrides, "mem0", _mem0_node, _amem0_node),
+        ),
     )
     graph.add_node(
         "milvus",
-        _wrap_with_span("milvus", _get_override(node_overrides, "milvus", _milvus_node)),
+        _wrap_with_span(
+            "milvus",
+            _get_override(node_overrides, "milvus", _milvus_node, _amilvus_node),
+        ),
     )
     graph.add_node(
         "mcp",
-        _wrap_with_span("mcp", _get_override(node_overrides, "mcp", _mcp_node)),
+        _wrap_with_span(
+            "mcp",
+            _get_override(node_overrides, "mcp", _mcp_node, _amcp_node),
+        ),
     )
     graph.add_node(
         "final",
         _wrap_with_span("final", _get_override(node_overrides, "final", _final_node)),
     )
-    graph.set_entry_point("llm")
-    graph.add_edge("llm", "mem0")
-    graph.add_edge("mem0", "milvus")
-    graph.add_edge("milvus", "mcp")
-    graph.add_edge("mcp", "final")
+    if graph_topology == "parallel":
+        # Only mem0 reads another node's output, so milvus and mcp fan out from
+        # the start alongside llm and everything joins at final.
+        graph.add_edge(START, "llm")
+        graph.add_edge(START, "milvus")
+        graph.add_edge(START, "mcp")
+        graph.add_edge("llm", "mem0")
+        graph.add_edge(["mem0", "milvus", "mcp"], "final")
+    else:
+        graph.set_entry_point("llm")
+        graph.add_edge("llm", "mem0")
+        graph.add_edge("mem0", "milvus")
+        graph.add_edge("milvus", "mcp")
+        graph.add_edge("mcp", "final")
     graph.add_edge("final", END)
     return graph
 
@@ -170,31 +317,290 @@ def build_checkpointer(config: CheckpointConfig):
     raise ValueError(f"Unsupported checkpoint backend: {config.backend!r}")
 
 
-def run_agent(
-    initial_state: dict[str, Any],
-    *,
+def _config_cache_key(config: object) -> str:
+    return json.dumps(asdict(config), sort_keys=True, default=str)
+
+
+def _overrides_cache_key(
+    node_overrides: Optional[dict[str, NodeFn]],
+) -> tuple[tuple[str, int], ...]:
+    if not node_overrides:
+        return ()
+    return tuple(sorted((name, id(fn)) for name, fn in node_overrides.items()))
+
+
+def get_shared_checkpointer(config: CheckpointConfig):
+    key = _config_cache_key(config)
+    with _GRAPH_CACHE_LOCK:
+        if key not in _CHECKPOINTERS:
+            _CHECKPOINTERS[key] = build_checkpointer(config)
+        return _CHECKPOINTERS[key]
+
+
+def get_compiled_graph(
     config: AppConfig,
-    thread_id: Optional[str] = None,
-    node_overrides: Optional[dict[str, Callable[[AgentState], dict[str, Any]]]] = None,
+    *,
+    node_overrides: Optional[dict[str, NodeFn]] = None,
     checkpointer: Optional[object] = None,
-) -> dict[str, Any]:
-    effective_thread_id = thread_id or "default"
-    trace = start_langfuse_trace(
-        config=config.langfuse,
-        trace_name="agent-run",
-        metadata={"thread_id": effective_thread_id},
+):
+    key = (
+        _config_cache_key(config),
+        _overrides_cache_key(node_overrides),
+        id(checkpointer),
     )
-    graph = build_graph(
+    with _GRAPH_CACHE_LOCK:
+        entry = _GRAPH_CACHE.get(key)
+        if entry is not None:
+            _GRAPH_CACHE.move_to_end(key)
+            return entry[0]
+        app = build_graph(config, node_overrides=node_overrides).compile(
+            checkpointer=checkpointer
+        )
+        # Keep the overrides and checkpointer alive with the entry so the ids in
+        # the key cannot be reused by unrelated objects while it is cached.
+        pinned = tuple((node_overrides or {}).values())
+        _GRAPH_CACHE[key] = (app, pinned, checkpointer)
+        while len(_GRAPH_CACHE) > _GRAPH_CACHE_MAX_ENTRIES:
+            _GRAPH_CACHE.popitem(last=False)
+        return app
+
+
+def clear_graph_cache() -> None:
+    with _GRAPH_CACHE_LOCK:
+        _GRAPH_CACHE.clear()
+        _CHECKPOINTERS.clear()
+
+
+def _build_run_config(
+    thread_id: str,
+    trace: Optional[object],
+    checkpointer: Optional[object],
+) -> RunnableConfig:
+    configurable: dict[str, Any] = {LANGFUSE_TRACE_CONFIG_KEY: trace}
+    if checkpointer is not None:
+        configurable["thread_id"] = thread_id
+    return {"configurable": configurable}
+
+
+def _resolve_app(
+    config: AppConfig,
+    node_overrides: Optional[dict[str, NodeFn]],
+    checkpointer: Optional[object],
+):
+    active_checkpointer = checkpointer or get_shared_checkpointer(config.checkpoint)
+    app = get_compiled_graph(
         config,
         node_overrides=node_overrides,
-        langfuse_trace=trace,
+        checkpointer=active_checkpointer,
     )
-    active_checkpointer = checkpointer or build_checkpointer(config.checkpoint)
-    app = graph.compile(checkpointer=active_checkpointer)
-    run_config = None
-    if active_checkpointer is not None:
-        run_config = {"configurable": {"thread_id": effective_thread_id}}
-    result_state = app.invoke(initial_state, config=run_config)
+    return app, active_checkpointer
+
+
+def _start_run(
+    config: AppConfig,
+    thread_id: str,
+    checkpointer: Optional[object],
+) -> RunnableConfig:
+    trace = start_langfuse_trace(
+        config=config.langfuse,
+        trace_name="agent-run",
+        metadata={"thread_id": thread_id},
+    )
+    return _build_run_config(thread_id, trace, checkpointer)
+
+
+def _discard_thread(checkpointer: Optional[object], thread_id: str) -> None:
+    delete_thread = getattr(checkpointer, "delete_thread", None)
+    if delete_thread is not None:
+        delete_thread(thread_id)
+
+
+def _discard_run(checkpointer: Optional[object], run_config: RunnableConfig) -> None:
+    if checkpointer is not None:
+        _discard_thread(checkpointer, run_config["configurable"]["thread_id"])
+
+
+def _prepare_run(
+    config: AppConfig,
+    thread_id: Optional[str],
+    node_overrides: Optional[dict[str, NodeFn]],
+    checkpointer: Optional[object],
+):
+    """Return the app, its run config and the checkpointer to discard from.
+
+    Without a caller-supplied `thread_id` nothing can resume the run, so it
+    gets a fresh thread whose checkpoints are dropped once it finishes.
+    """
+    app, active_checkpointer = _resolve_app(config, node_overrides, checkpointer)
+    run_config = _start_run(config, thread_id or uuid.uuid4().hex, active_checkpointer)
+    return app, run_config, active_checkpointer if thread_id is None else None
+
+
+def _extract_result(result_state: Any) -> dict[str, Any]:
     if isinstance(result_state, dict):
         return result_state.get("result", {})
     return {}
+
+
+def run_agent(
+    initial_state: dict[str, Any],
+    *,
+    config: AppConfig,
+    thread_id: Optional[str] = None,
+    node_overrides: Optional[dict[str, NodeFn]] = None,
+    checkpointer: Optional[object] = None,
+) -> dict[str, Any]:
+    app, run_config, transient = _prepare_run(config, thread_id, node_overrides, checkpointer)
+    try:
+        return _extract_result(app.invoke(initial_state, config=run_config))
+    finally:
+        _discard_run(transient, run_config)
+
+
+def _unwrap_update(update: Any) -> Any:
+    # Every node writes a single state key, so the event carries its value.
+    if isinstance(update, dict) and len(update) == 1:
+        return next(iter(update.values()))
+    return update
+
+
+def _update_status(output: Any) -> str:
+    if isinstance(output, dict) and isinstance(output.get("status"), str):
+        return output["status"]
+    return "success"
+
+
+def stream_agent(
+    initial_state: dict[str, Any],
+    *,
+    config: AppConfig,
+    thread_id: Optional[str] = None,
+    node_overrides: Optional[dict[str, NodeFn]] = None,
+    checkpointer: Optional[object] = None,
+) -> Iterator[dict[str, Any]]:
+    app, run_config, transient = _prepare_run(config, thread_id, node_overrides, checkpointer)
+    try:
+        yield from _stream_events(app, initial_state, run_config)
+    finally:
+        _discard_run(transient, run_config)
+
+
+def _stream_events(
+    app: Any,
+    initial_state: dict[str, Any],
+    run_config: RunnableConfig,
+) -> Iterator[dict[str, Any]]:
+    started = time.perf_counter()
+    for mode, chunk in app.stream(
+        initial_state, config=run_config, stream_mode=["updates", "custom"]
+    ):
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        if mode == "custom":
+            if isinstance(chunk, dict) and "delta" in chunk:
+                yield {
+                    "node": chunk.get("node"),
+                    "status": "streaming",
+                    "elapsed_ms": elapsed_ms,
+                    "delta": chunk["delta"],
+                }
+            continue
+        if not isinstance(chunk, dict):
+            continue
+        for node_name, update in chunk.items():
+            output = _unwrap_update(update)
+            yield {
+                "node": node_name,
+                "status": _update_status(output),
+                "elapsed_ms": elapsed_ms,
+                "output": output,
+            }
+
+
+async def arun_agent(
+    initial_state: dict[str, Any],
+    *,
+    config: AppConfig,
+    thread_id: Optional[str] = None,
+    node_overrides: Optional[dict[str, NodeFn]] = None,
+    checkpointer: Optional[object] = None,
+) -> dict[str, Any]:
+    app, run_config, transient = _prepare_run(config, thread_id, node_overrides, checkpointer)
+    try:
+        return _extract_result(await app.ainvoke(initial_state, config=run_config))
+    finally:
+        _discard_run(transient, run_config)
+
+
+def run_agent_many(
+    states: Iterable[dict[str, Any]],
+    *,
+    config: AppConfig,
+    concurrency: int = 4,
+    ordered: bool = False,
+    node_overrides: Optional[dict[str, NodeFn]] = None,
+    checkpointer: Optional[object] = None,
+) -> Iterator[dict[str, Any]]:
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    app, active_checkpointer = _resolve_app(config, node_overrides, checkpointer)
+
+    def _run_one(index: int, initial_state: dict[str, Any]) -> dict[str, Any]:
+        thread_id = uuid.uuid4().hex
+        try:
+            run_config = _start_run(config, thread_id, active_checkpointer)
+            result = _extract_result(app.invoke(initial_state, config=run_config))
+            return {
+                "index": index,
+                "thread_id": thread_id,
+                "status": "success",
+                "result": result,
+            }
+        except Exception as exc:  # noqa: BLE001 - want each run to surface errors as data.
+            logger.exception("agent run %s failed", index)
+            return {
+                "index": index,
+                "thread_id": thread_id,
+                "status": "failed",
+                "result": None,
+                "error": str(exc),
+            }
+        finally:
+            # Each state runs once on its own thread; keep no checkpoints.
+            _discard_thread(active_checkpointer, thread_id)
+
+    items = enumerate(states)
+    # Only this many states are in flight or waiting to be yielded at once, so
+    # `states` may be a lazy iterable of any length. Ordered runs keep every
+    # worker busy behind a slow head by buffering results that finish early.
+    max_outstanding = concurrency * _ORDERED_BUFFER_FACTOR if ordered else concurrency
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        in_flight: set[Future] = set()
+        buffered: dict[int, dict[str, Any]] = {}
+        next_index = 0
+
+        def _fill() -> None:
+            while (
+                len(in_flight) < concurrency
+                and len(in_flight) + len(buffered) < max_outstanding
+            ):
+                item = next(items, None)
+                if item is None:
+                    return
+                in_flight.add(executor.submit(_run_one, *item))
+
+        _fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            in_flight.difference_update(done)
+            if ordered:
+                for future in done:
+                    item = future.result()
+                    buffered[item["index"]] = item
+                ready = []
+                while next_index in buffered:
+                    ready.append(buffered.pop(next_index))
+                    next_index += 1
+            else:
+                ready = [future.result() for future in done]
+            _fill()
+            yield from ready
@@ -3,10 +3,13 @@ from __future__ import annotations
 import argparse
 import json
 import uuid
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from app.config import load_config
-from app.graph import run_agent
+from app.graph import run_agent, stream_agent
+
+if TYPE_CHECKING:
+    from app.config import AppConfig
 
 
 def _parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
@@ -22,11 +25,21 @@ def _parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
         default="{}",
         help="JSON payload passed to the MCP tool.",
     )
+    parser.add_argument(
+        "--mcp-calls",
+        default=None,
+        help='JSON list of {"tool": ..., "args": {...}} MCP calls run concurrently.',
+    )
     parser.add_argument(
         "--thread-id",
         default=None,
         help="Thread id for langgraph checkpointing.",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write one JSON line per node as soon as it finishes.",
+    )
     return parser.parse_args(argv)
 
 
@@ -40,6 +53,30 @@ def _parse_json(value: str) -> dict[str, Any]:
     return data
 
 
+def _parse_calls(value: str) -> list[dict[str, Any]]:
+    try:
+        data = json.loads(value)
+    except json.JSONDecodeError as exc:
+        raise ValueError("Invalid JSON for --mcp-calls") from exc
+    if not isinstance(data, list):
+        raise ValueError("--mcp-calls must be a JSON list")
+    return data
+
+
+def _stream(
+    initial_state: dict[str, Any],
+    *,
+    config: AppConfig,
+    thread_id: str,
+) -> dict[str, Any]:
+    result: dict[str, Any] = {}
+    for event in stream_agent(initial_state, config=config, thread_id=thread_id):
+        print(json.dumps(event, separators=(",", ":"), default=str), flush=True)
+        if event["node"] == "final" and isinstance(event["output"], dict):
+            result = event["output"]
+    return result
+
+
 def main(argv: Optional[list[str]] = None) -> dict[str, Any]:
     args = _parse_args(argv)
     config = load_config()
@@ -48,7 +85,11 @@ def main(argv: Optional[list[str]] = None) -> dict[str, Any]:
         "mem0_query": args.mem0_query,
         "mcp_tool_args": _parse_json(args.mcp_args),
     }
+    if args.mcp_calls is not None:
+        initial_state["mcp_tool_calls"] = _parse_calls(args.mcp_calls)
     thread_id = args.thread_id or uuid.uuid4().hex
+    if args.stream:
+        return _stream(initial_state, config=config, thread_id=thread_id)
     result = run_agent(
         initial_state,
         config=config,
@@ -1,14 +1,43 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import logging
-from typing import Optional
+import threading
+import time
+from typing import Any, Callable, Optional
 
-from openai import OpenAI
+import httpx
+from openai import (
+    AsyncOpenAI,
+    BadRequestError,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    OpenAI,
+    UnprocessableEntityError,
+)
 
+from app.cache import MemoryCache, SqliteCache, TieredCache, make_cache_key
 from app.config import LLMConfig
 
 
 logger = logging.getLogger(__name__)
+_DEFAULT_MAX_CONNECTIONS = 100
+_DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 5.0
+_CLIENTS: dict[tuple[Any, ...], OpenAI] = {}
+# Async clients hold connections bound to the event loop that opened them.
+_ASYNC_CLIENTS: dict[tuple[asyncio.AbstractEventLoop, tuple[Any, ...]], AsyncOpenAI] = {}
+_CLIENTS_LOCK = threading.Lock()
+_DEFAULT_CACHE_MAX_ENTRIES = 1024
+_RESPONSE_CACHES: dict[tuple[Any, ...], TieredCache] = {}
+_RESPONSE_CACHES_LOCK = threading.Lock()
+# OpenAI only reports usage on streams when asked; some compatible endpoints
+# reject the option, and are remembered here so they are not retried.
+_STREAM_OPTIONS = {"include_usage": True}
+_STREAM_OPTIONS_UNSUPPORTED: set[Optional[str]] = set()
+_STREAM_OPTIONS_ERRORS = (BadRequestError, UnprocessableEntityError)
+
+TokenCallback = Callable[[str], None]
 
 
 def _build_messages(prompt: str, system_prompt: Optional[str]) -> list[dict[str, str]]:
@@ -19,42 +48,357 @@ def _build_messages(prompt: str, system_prompt: Optional[str]) -> list[dict[str,
     return messages
 
 
+def _build_client_kwargs(config: LLMConfig) -> dict[str, object]:
+    client_kwargs: dict[str, object] = {"api_key": config.api_key}
+    if config.endpoint:
+        client_kwargs["base_url"] = config.endpoint
+    if config.timeout is not None:
+        client_kwargs["timeout"] = config.timeout
+    return client_kwargs
+
+
+def _build_limits(config: LLMConfig) -> Optional[httpx.Limits]:
+    if config.max_connections is None and config.keepalive_expiry is None:
+        return None
+    max_connections = config.max_connections or _DEFAULT_MAX_CONNECTIONS
+    keepalive_expiry = config.keepalive_expiry
+    if keepalive_expiry is None:
+        keepalive_expiry = _DEFAULT_KEEPALIVE_EXPIRY_SECONDS
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+
+def _client_key(config: LLMConfig) -> tuple[Any, ...]:
+    return (
+        config.endpoint,
+        config.api_key,
+        config.timeout,
+        config.max_connections,
+        config.keepalive_expiry,
+    )
+
+
+def _get_client(config: LLMConfig) -> OpenAI:
+    key = _client_key(config)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client_kwargs = _build_client_kwargs(config)
+            limits = _build_limits(config)
+            if limits is not None:
+                client_kwargs["http_client"] = DefaultHttpxClient(limits=limits)
+            client = OpenAI(**client_kwargs)
+            _CLIENTS[key] = client
+        return client
+
+
+def _get_async_client(config: LLMConfig) -> AsyncOpenAI:
+    loop = asyncio.get_running_loop()
+    key = (loop, _client_key(config))
+    with _CLIENTS_LOCK:
+        client = _ASYNC_CLIENTS.get(key)
+        if client is not None:
+            return client
+        # Clients of closed loops can no longer be used or closed; forget them
+        # so repeated `asyncio.run` calls do not pile up clients.
+        for stale in [stale for stale in _ASYNC_CLIENTS if stale[0].is_closed()]:
+            del _ASYNC_CLIENTS[stale]
+        client_kwargs = _build_client_kwargs(config)
+        limits = _build_limits(config)
+        if limits is not None:
+            client_kwargs["http_client"] = DefaultAsyncHttpxClient(limits=limits)
+        client = AsyncOpenAI(**client_kwargs)
+        _ASYNC_CLIENTS[key] = client
+        return client
+
+
+def close_llm_clients() -> None:
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+        async_clients = [(loop, client) for (loop, _), client in _ASYNC_CLIENTS.items()]
+        _CLIENTS.clear()
+        _ASYNC_CLIENTS.clear()
+        _STREAM_OPTIONS_UNSUPPORTED.clear()
+    for client in clients:
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:  # noqa: BLE001 - shutdown must not fail on one client.
+                logger.exception("LLM client close failed")
+    for loop, client in async_clients:
+        # Connections can only be closed on their own loop; once that loop is
+        # gone the sockets are released with the process.
+        if loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(client.close())
+        except Exception:  # noqa: BLE001 - shutdown must not fail on one client.
+            logger.exception("LLM async client close failed")
+
+
+async def aclose_llm_clients() -> None:
+    loop = asyncio.get_running_loop()
+    with _CLIENTS_LOCK:
+        owned = [key for key in _ASYNC_CLIENTS if key[0] is loop]
+        clients = [_ASYNC_CLIENTS.pop(key) for key in owned]
+    for client in clients:
+        await client.close()
+
+
+atexit.register(close_llm_clients)
+
+
+def _get_response_cache(config: LLMConfig) -> Optional[TieredCache]:
+    if not config.cache_enabled:
+        return None
+    key = (config.cache_path, config.cache_ttl, config.cache_max_entries)
+    with _RESPONSE_CACHES_LOCK:
+        cache = _RESPONSE_CACHES.get(key)
+        if cache is None:
+            max_entries = config.cache_max_entries or _DEFAULT_CACHE_MAX_ENTRIES
+            disk = None
+            if config.cache_path:
+                disk = SqliteCache(
+                    config.cache_path,
+                    table="llm_responses",
+                    max_entries=max_entries,
+                    ttl_seconds=config.cache_ttl,
+                )
+            cache = TieredCache(
+                MemoryCache(max_entries=max_entries, ttl_seconds=config.cache_ttl),
+                disk,
+            )
+            _RESPONSE_CACHES[key] = cache
+        return cache
+
+
+def close_llm_response_caches() -> None:
+    with _RESPONSE_CACHES_LOCK:
+        caches = list(_RESPONSE_CACHES.values())
+        _RESPONSE_CACHES.clear()
+    for cache in caches:
+        cache.close()
+
+
+atexit.register(close_llm_response_caches)
+
+
+def _response_cache_key(create_kwargs: dict[str, object]) -> str:
+    return make_cache_key(
+        create_kwargs["model"],
+        create_kwargs["messages"],
+        create_kwargs.get("temperature"),
+    )
+
+
+def _cache_info(cache: TieredCache, *, hit: bool) -> dict[str, Any]:
+    return {"hit": hit, **cache.stats()}
+
+
+def _build_create_kwargs(
+    prompt: str,
+    config: LLMConfig,
+    system_prompt: Optional[str],
+) -> dict[str, object]:
+    create_kwargs: dict[str, object] = {
+        "model": config.model,
+        "messages": _build_messages(prompt, system_prompt),
+    }
+    if config.temperature is not None:
+        create_kwargs["temperature"] = config.temperature
+    return create_kwargs
+
+
+def _create_stream(client: OpenAI, config: LLMConfig, create_kwargs: dict[str, object]) -> Any:
+    if config.endpoint not in _STREAM_OPTIONS_UNSUPPORTED:
+        try:
+            return client.chat.completions.create(
+                **create_kwargs, stream=True, stream_options=_STREAM_OPTIONS
+            )
+        except _STREAM_OPTIONS_ERRORS:
+            logger.info("LLM endpoint rejected stream_options; streaming without usage")
+            _STREAM_OPTIONS_UNSUPPORTED.add(config.endpoint)
+    return client.chat.completions.create(**create_kwargs, stream=True)
+
+
+async def _acreate_stream(
+    client: AsyncOpenAI,
+    config: LLMConfig,
+    create_kwargs: dict[str, object],
+) -> Any:
+    if config.endpoint not in _STREAM_OPTIONS_UNSUPPORTED:
+        try:
+            return await client.chat.completions.create(
+                **create_kwargs, stream=True, stream_options=_STREAM_OPTIONS
+            )
+        except _STREAM_OPTIONS_ERRORS:
+            logger.info("LLM endpoint rejected stream_options; streaming without usage")
+            _STREAM_OPTIONS_UNSUPPORTED.add(config.endpoint)
+    return await client.chat.completions.create(**create_kwargs, stream=True)
+
+
+class _StreamAccumulator:
+    """Collects streamed deltas and the timings needed for latency metrics."""
+
+    def __init__(self, on_token: Optional[TokenCallback]) -> None:
+        self._on_token = on_token
+        self._started = time.perf_counter()
+        self._first_token_at: Optional[float] = None
+        self._parts: list[str] = []
+        self._usage_tokens: Optional[int] = None
+
+    def add(self, chunk: Any) -> None:
+        usage = getattr(chunk, "usage", None)
+        if getattr(usage, "completion_tokens", None) is not None:
+            self._usage_tokens = usage.completion_tokens
+        if not chunk.choices:
+            return
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            return
+        if self._first_token_at is None:
+            self._first_token_at = time.perf_counter()
+        self._parts.append(delta)
+        if self._on_token is not None:
+            self._on_token(delta)
+
+    @property
+    def output_text(self) -> Optional[str]:
+        return "".join(self._parts) if self._parts else None
+
+    def metrics(self) -> dict[str, Any]:
+        finished = time.perf_counter()
+        # Without usage data each content delta is counted as one token.
+        tokens = self._usage_tokens if self._usage_tokens is not None else len(self._parts)
+        ttft_ms = None
+        tokens_per_second = None
+        if self._first_token_at is not None:
+            ttft_ms = round((self._first_token_at - self._started) * 1000, 1)
+            generation_seconds = finished - self._first_token_at
+            if tokens and generation_seconds > 0:
+                tokens_per_second = round(tokens / generation_seconds, 1)
+        return {
+            "ttft_ms": ttft_ms,
+            "total_ms": round((finished - self._started) * 1000, 1),
+            "completion_tokens": tokens,
+            "tokens_per_second": tokens_per_second,
+        }
+
+
+def _success_result(
+    config: LLMConfig,
+    output_text: Optional[str],
+    cache: Optional[dict[str, Any]] = None,
+    metrics: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    result: dict[str, Any] = {
+        "status": "success",
+        "model": config.model,
+        "output_text": output_text,
+    }
+    if cache is not None:
+        result["cache"] = cache
+    if metrics is not None:
+        result["metrics"] = metrics
+    return result
+
+
+def _failed_result(config: LLMConfig, exc: Exception) -> dict[str, Any]:
+    return {
+        "status": "failed",
+        "model": config.model,
+        "output_text": None,
+        "error": str(exc),
+    }
+
+
 def run_llm_node(
     prompt: str,
     *,
     config: LLMConfig,
     system_prompt: Optional[str] = None,
-) -> dict[str, Optional[str]]:
+    on_token: Optional[TokenCallback] = None,
+) -> dict[str, Any]:
     logger.info("LLM node started")
     try:
-        client_kwargs: dict[str, object] = {"api_key": config.api_key}
-        if config.endpoint:
-            client_kwargs["base_url"] = config.endpoint
-        if config.timeout is not None:
-            client_kwargs["timeout"] = config.timeout
+        create_kwargs = _build_create_kwargs(prompt, config, system_prompt)
+        cache = _get_response_cache(config)
+        if cache is not None:
+            cache_key = _response_cache_key(create_kwargs)
+            cached_text = cache.get(cache_key)
+            if cached_text is not None:
+                logger.info("LLM node served from cache")
+                if on_token is not None:
+                    on_token(cached_text)
+                return _success_result(config, cached_text, _cache_info(cache, hit=True))
+
+        client = _get_client(config)
+        metrics = None
+        if config.stream:
+            accumulator = _StreamAccumulator(on_token)
+            stream = _create_stream(client, config, create_kwargs)
+            for chunk in stream:
+                accumulator.add(chunk)
+            output_text = accumulator.output_text
+            metrics = accumulator.metrics()
+        else:
+            response = client.chat.completions.create(**create_kwargs)
+            output_text = response.choices[0].message.content
+        logger.info("LLM node succeeded")
+        if cache is None:
+            return _success_result(config, output_text, metrics=metrics)
+        cache.set(cache_key, output_text)
+        return _success_result(
+            config, output_text, _cache_info(cache, hit=False), metrics
+        )
+    except Exception as exc:  # noqa: BLE001 - want node to surface errors as data.
+        logger.exception("LLM node failed")
+        return _failed_result(config, exc)
 
-        client = OpenAI(**client_kwargs)
 
-        create_kwargs: dict[str, object] = {
-            "model": config.model,
-            "messages": _build_messages(prompt, system_prompt),
-        }
-        if config.temperature is not None:
-            create_kwargs["temperature"] = config.temperature
+async def arun_llm_node(
+    prompt: str,
+    *,
+    config: LLMConfig,
+    system_prompt: Optional[str] = None,
+    on_token: Optional[TokenCallback] = None,
+) -> dict[str, Any]:
+    logger.info("LLM node started")
+    try:
+        create_kwargs = _build_create_kwargs(prompt, config, system_prompt)
+        cache = _get_response_cache(config)
+        if cache is not None:
+            cache_key = _response_cache_key(create_kwargs)
+            cached_text = cache.get(cache_key)
+            if cached_text is not None:
+                logger.info("LLM node served from cache")
+                if on_token is not None:
+                    on_token(cached_text)
+                return _success_result(config, cached_text, _cache_info(cache, hit=True))
 
-        response = client.chat.completions.create(**create_kwargs)
-        output_text = response.choices[0].message.content
+        client = _get_async_client(config)
+        metrics = None
+        if config.stream:
+            accumulator = _StreamAccumulator(on_token)
+            stream = await _acreate_stream(client, config, create_kwargs)
+            async for chunk in stream:
+                accumulator.add(chunk)
+            output_text = accumulator.output_text
+            metrics = accumulator.metrics()
+        else:
+            response = await client.chat.completions.create(**create_kwargs)
+            output_text = response.choices[0].message.content
         logger.info("LLM node succeeded")
-        return {
-            "status": "success",
-            "model": config.model,
-            "output_text": output_text,
-        }
+        if cache is None:
+            return _success_result(config, output_text, metrics=metrics)
+        cache.set(cache_key, output_text)
+        return _success_result(
+            config, output_text, _cache_info(cache, hit=False), metrics
+        )
     except Exception as exc:  # noqa: BLE001 - want node to surface errors as data.
         logger.exception("LLM node failed")
-        return {
-            "status": "failed",
-            "model": config.model,
-            "output_text": None,
-            "error": str(exc),
-        }
+        return _failed_result(config, exc)
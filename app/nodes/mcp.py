@@ -1,16 +1,43 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
+import itertools
+import json
 import logging
-from typing import Any, Optional
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Hashable, Iterator, Optional
 
 import requests
 
+from app.blobs import BlobStore
+from app.cache import MemoryCache, SqliteCache, TieredCache, make_cache_key
 from app.config import MCPConfig
+from app.nodes.mcp_pool import MessageHandler, SessionOptions, get_session_pool
 
 
 logger = logging.getLogger(__name__)
 _JSONRPC_TIMEOUT_SECONDS = 10
+_JSONRPC_TRANSPORTS = {"jsonrpc", "http-jsonrpc", "rpc"}
+_DEFAULT_MAX_CONCURRENT_CALLS = 8
+_DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS = 30.0
+_DEFAULT_CAPABILITY_TTL_SECONDS = 300.0
+_TOOLS_LIST_CHANGED = "notifications/tools/list_changed"
+_JSONRPC_SERVERS: dict[tuple[str, Optional[str]], "_JsonRpcServer"] = {}
+_JSONRPC_SERVERS_LOCK = threading.Lock()
+_DEFAULT_CACHE_TTL_SECONDS = 300.0
+_DEFAULT_CACHE_MAX_ENTRIES = 1024
+_TOOL_CACHES: dict[tuple[Any, ...], TieredCache] = {}
+_TOOL_CACHES_LOCK = threading.Lock()
+_DEFAULT_BLOB_DIR = os.path.join(tempfile.gettempdir(), "mcp-blobs")
+_SUMMARY_PREVIEW_CHARS = 512
+_BLOB_MEDIA_TYPE = "application/json"
 
 
 def _build_headers(api_key: Optional[str]) -> dict[str, str]:
@@ -20,11 +47,9 @@ def _build_headers(api_key: Optional[str]) -> dict[str, str]:
 
 
 def _run_async(coro):
-    try:
-        asyncio.get_running_loop()
-    except RuntimeError:
-        return asyncio.run(coro)
-    raise RuntimeError("run_mcp_node cannot be called from a running event loop")
+    # Reuse the pool's long-lived loop thread instead of a fresh loop per
+    # call; this also works when the caller is itself inside a running loop.
+    return get_session_pool().run(coro)
 
 
 def _load_stdio_client():
@@ -64,28 +89,241 @@ def _load_http_client():
     return ClientSession, http_client
 
 
-def _jsonrpc_request(
-    session: requests.Session,
-    server_url: str,
+@dataclass
+class _JsonRpcServer:
+    """Reused HTTP session plus the negotiated capabilities of one server."""
+
+    session: requests.Session
+    # next() on itertools.count is atomic, so ids need no extra locking.
+    request_ids: Iterator[int] = field(default_factory=lambda: itertools.count(1))
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    protocol_version: Optional[str] = None
+    tools: Optional[frozenset[str]] = None
+    # Set when the server rejects tools/list; calls then go out unvalidated.
+    tools_unavailable: bool = False
+    expires_at: float = 0.0
+
+    def invalidate(self, *, tools_only: bool = False) -> None:
+        self.tools = None
+        self.tools_unavailable = False
+        if not tools_only:
+            self.protocol_version = None
+            self.session.headers.pop("MCP-Protocol-Version", None)
+
+
+def _get_jsonrpc_server(config: MCPConfig) -> _JsonRpcServer:
+    key = (config.server_url, config.api_key)
+    with _JSONRPC_SERVERS_LOCK:
+        server = _JSONRPC_SERVERS.get(key)
+        if server is None:
+            session = requests.Session()
+            session.headers.update({"Content-Type": "application/json"})
+            session.headers.update(_build_headers(config.api_key))
+            server = _JsonRpcServer(session=session)
+            _JSONRPC_SERVERS[key] = server
+        return server
+
+
+def invalidate_mcp_capabilities() -> None:
+    """Force the next jsonrpc call to renegotiate and refetch the tool list."""
+    with _JSONRPC_SERVERS_LOCK:
+        servers = list(_JSONRPC_SERVERS.values())
+    for server in servers:
+        with server.lock:
+            server.invalidate()
+
+
+def close_mcp_jsonrpc_sessions() -> None:
+    with _JSONRPC_SERVERS_LOCK:
+        servers = list(_JSONRPC_SERVERS.values())
+        _JSONRPC_SERVERS.clear()
+    for server in servers:
+        server.session.close()
+
+
+atexit.register(close_mcp_jsonrpc_sessions)
+
+
+def _get_tool_cache(config: MCPConfig, tool_name: str) -> Optional[TieredCache]:
+    if not config.cache_tools or tool_name not in config.cache_tools:
+        return None
+    ttl = config.cache_ttl
+    if ttl is None:
+        ttl = _DEFAULT_CACHE_TTL_SECONDS
+    max_entries = config.cache_max_entries or _DEFAULT_CACHE_MAX_ENTRIES
+    key = (config.cache_path, ttl, max_entries)
+    with _TOOL_CACHES_LOCK:
+        cache = _TOOL_CACHES.get(key)
+        if cache is None:
+            disk = None
+            if config.cache_path:
+                disk = SqliteCache(
+                    config.cache_path,
+                    table="mcp_tool_results",
+                    max_entries=max_entries,
+                    ttl_seconds=ttl,
+                )
+            cache = TieredCache(MemoryCache(max_entries=max_entries, ttl_seconds=ttl), disk)
+            _TOOL_CACHES[key] = cache
+        return cache
+
+
+def close_mcp_tool_caches() -> None:
+    with _TOOL_CACHES_LOCK:
+        caches = list(_TOOL_CACHES.values())
+        _TOOL_CACHES.clear()
+    for cache in caches:
+        cache.close()
+
+
+atexit.register(close_mcp_tool_caches)
+
+
+def _tool_cache_key(config: MCPConfig, tool_name: str, tool_args: dict[str, Any]) -> str:
+    # make_cache_key serialises with sorted keys, so equal args share an entry.
+    return make_cache_key(
+        (config.transport or "").lower(),
+        config.command,
+        config.args,
+        config.server_url,
+        config.api_key,
+        tool_name,
+        tool_args,
+    )
+
+
+def _jsonable_result(result: Any) -> Any:
+    # Session transports return pydantic models; the caches hold plain JSON.
+    model_dump = getattr(result, "model_dump", None)
+    if callable(model_dump):
+        return model_dump(mode="json", by_alias=True, exclude_none=True)
+    return result
+
+
+def _cacheable_result(result: Any) -> bool:
+    return not (isinstance(result, dict) and result.get("isError"))
+
+
+def _cache_info(cache: TieredCache, *, hit: bool) -> dict[str, Any]:
+    return {"hit": hit, **cache.stats()}
+
+
+def _jsonrpc_payload(
+    server: _JsonRpcServer,
     method: str,
     params: Optional[dict[str, Any]],
-    request_id: int,
 ) -> dict[str, Any]:
     payload: dict[str, Any] = {
         "jsonrpc": "2.0",
         "method": method,
-        "id": request_id,
+        "id": next(server.request_ids),
     }
     if params is not None:
         payload["params"] = params
-    response = session.post(server_url, json=payload, timeout=_JSONRPC_TIMEOUT_SECONDS)
-    response.raise_for_status()
-    data = response.json()
-    if not isinstance(data, dict):
-        raise ValueError("MCP JSON-RPC response is not an object")
-    if "error" in data:
-        raise RuntimeError(f"MCP JSON-RPC error: {data['error']}")
-    return data
+    return payload
+
+
+def _jsonrpc_post(server: _JsonRpcServer, server_url: str, payload: Any) -> list[dict[str, Any]]:
+    """Send one request or a batch array and return the replies it produced."""
+    try:
+        response = server.session.post(server_url, json=payload, timeout=_JSONRPC_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        data = response.json()
+    except Exception:
+        # The server may have restarted and forgotten the negotiated session.
+        server.invalidate()
+        raise
+    # Servers may batch notifications alongside the reply.
+    messages = data if isinstance(data, list) else [data]
+    replies = []
+    for message in messages:
+        if not isinstance(message, dict):
+            raise ValueError("MCP JSON-RPC response is not an object")
+        if message.get("method") == _TOOLS_LIST_CHANGED:
+            logger.info("mcp tool list changed; dropping cached catalogue")
+            server.invalidate(tools_only=True)
+        elif "method" not in message:
+            replies.append(message)
+    return replies
+
+
+def _jsonrpc_reply_result(reply: dict[str, Any]) -> Any:
+    if "error" in reply:
+        raise RuntimeError(f"MCP JSON-RPC error: {reply['error']}")
+    return reply.get("result")
+
+
+def _jsonrpc_request(
+    server: _JsonRpcServer,
+    server_url: str,
+    method: str,
+    params: Optional[dict[str, Any]],
+) -> dict[str, Any]:
+    payload = _jsonrpc_payload(server, method, params)
+    for reply in _jsonrpc_post(server, server_url, payload):
+        if reply.get("id", payload["id"]) == payload["id"]:
+            _jsonrpc_reply_result(reply)
+            return reply
+    raise ValueError("MCP JSON-RPC response does not answer the request")
+
+
+def _capability_ttl(config: MCPConfig) -> float:
+    if config.capability_ttl is None:
+        return _DEFAULT_CAPABILITY_TTL_SECONDS
+    return config.capability_ttl
+
+
+def _list_tool_names(server: _JsonRpcServer, server_url: str) -> frozenset[str]:
+    names: set[str] = set()
+    params: Optional[dict[str, Any]] = None
+    while True:
+        result = _jsonrpc_request(server, server_url, "tools/list", params).get("result") or {}
+        names.update(tool["name"] for tool in result.get("tools") or [] if "name" in tool)
+        cursor = result.get("nextCursor")
+        if not cursor:
+            return frozenset(names)
+        params = {"cursor": cursor}
+
+
+def _jsonrpc_tool_names(
+    server: _JsonRpcServer,
+    config: MCPConfig,
+    *,
+    refresh: bool = False,
+) -> Optional[frozenset[str]]:
+    """Return the cached tool catalogue, or None when the server has none."""
+    with server.lock:
+        expired = time.monotonic() >= server.expires_at
+        if server.protocol_version is None or expired:
+            result = _jsonrpc_request(
+                server,
+                config.server_url,
+                "initialize",
+                {
+                    "protocolVersion": "0.1.0",
+                    "clientInfo": {"name": "langgraph-demo", "version": "1.0.0"},
+                },
+            ).get("result") or {}
+            server.protocol_version = result.get("protocolVersion", "0.1.0")
+            server.session.headers["MCP-Protocol-Version"] = server.protocol_version
+            server.tools = None
+            server.tools_unavailable = False
+        if server.tools_unavailable and not expired:
+            return None
+        if server.tools is None or refresh or expired:
+            try:
+                server.tools = _list_tool_names(server, config.server_url)
+                server.tools_unavailable = False
+            except RuntimeError as exc:
+                logger.warning("mcp tools/list rejected; skipping tool validation: %s", exc)
+                server.tools = None
+                server.tools_unavailable = True
+            server.expires_at = time.monotonic() + _capability_ttl(config)
+        return server.tools
+
+
+def _offers_tool(tools: Optional[frozenset[str]], tool_name: str) -> bool:
+    return tools is None or tool_name in tools
 
 
 def _call_mcp_tool_jsonrpc(
@@ -96,36 +334,100 @@ def _call_mcp_tool_jsonrpc(
     if not config.server_url:
         raise ValueError("MCP_SERVER_URL is required for jsonrpc transport")
 
-    session = requests.Session()
-    session.headers.update({"Content-Type": "application/json"})
-    session.headers.update(_build_headers(config.api_key))
-
-    _jsonrpc_request(
-        session,
-        config.server_url,
-        "initialize",
-        {
-            "protocolVersion": "0.1.0",
-            "clientInfo": {"name": "langgraph-demo", "version": "1.0.0"},
-        },
-        request_id=1,
-    )
-    _jsonrpc_request(session, config.server_url, "tools/list", None, request_id=2)
+    server = _get_jsonrpc_server(config)
+    if not _offers_tool(_jsonrpc_tool_names(server, config), tool_name):
+        # The catalogue may predate the tool; look once more before failing.
+        if not _offers_tool(_jsonrpc_tool_names(server, config, refresh=True), tool_name):
+            raise ValueError(f"MCP server does not offer tool {tool_name!r}")
     result = _jsonrpc_request(
-        session,
+        server,
         config.server_url,
         "tools/call",
         {"name": tool_name, "arguments": tool_args},
-        request_id=3,
     )
     return result.get("result")
 
 
-async def _call_mcp_tool_async(
-    tool_name: str,
-    tool_args: dict[str, Any],
+def _batch_rejected(replies: list[dict[str, Any]]) -> bool:
+    # Servers without batch support answer the whole array with one error.
+    return len(replies) == 1 and replies[0].get("id") is None and "error" in replies[0]
+
+
+def _call_mcp_tools_jsonrpc(
+    calls: list[tuple[Any, str, dict[str, Any]]],
     config: MCPConfig,
-) -> Any:
+) -> list[dict[str, Any]]:
+    if not config.server_url:
+        raise ValueError("MCP_SERVER_URL is required for jsonrpc transport")
+
+    server = _get_jsonrpc_server(config)
+    tools = _jsonrpc_tool_names(server, config)
+    if any(not _offers_tool(tools, name) for _call_id, name, _args in calls):
+        tools = _jsonrpc_tool_names(server, config, refresh=True)
+
+    outcomes: list[Optional[dict[str, Any]]] = [None] * len(calls)
+    payloads: dict[int, dict[str, Any]] = {}
+    for index, (call_id, name, args) in enumerate(calls):
+        if not _offers_tool(tools, name):
+            error = ValueError(f"MCP server does not offer tool {name!r}")
+            outcomes[index] = _call_outcome(call_id, name, 0.0, exc=error)
+        else:
+            payloads[index] = _jsonrpc_payload(
+                server, "tools/call", {"name": name, "arguments": args}
+            )
+
+    if payloads:
+        started = time.perf_counter()
+        try:
+            replies = _jsonrpc_post(server, config.server_url, list(payloads.values()))
+        except Exception as exc:  # noqa: BLE001 - every sent call failed with it.
+            logger.warning("mcp JSON-RPC batch request failed: %s", exc)
+            for index in payloads:
+                call_id, name, _args = calls[index]
+                outcomes[index] = _call_outcome(call_id, name, _elapsed_ms(started), exc=exc)
+            return outcomes
+        if _batch_rejected(replies):
+            logger.info("mcp server rejected a JSON-RPC batch; sending calls one by one")
+            return _call_mcp_tools_individually(calls, config)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        by_id = {reply.get("id"): reply for reply in replies}
+        for index, payload in payloads.items():
+            call_id, name, _args = calls[index]
+            reply = by_id.get(payload["id"])
+            try:
+                if reply is None:
+                    raise ValueError("MCP JSON-RPC batch response does not answer this call")
+                result = _jsonrpc_reply_result(reply)
+            except Exception as exc:  # noqa: BLE001 - reported per call.
+                outcomes[index] = _call_outcome(call_id, name, elapsed_ms, exc=exc)
+            else:
+                outcomes[index] = _call_outcome(call_id, name, elapsed_ms, result=result)
+    return outcomes
+
+
+def _call_mcp_tools_individually(
+    calls: list[tuple[Any, str, dict[str, Any]]],
+    config: MCPConfig,
+) -> list[dict[str, Any]]:
+    def _timed(call: tuple[Any, str, dict[str, Any]]) -> dict[str, Any]:
+        call_id, name, args = call
+        started = time.perf_counter()
+        try:
+            result = _call_mcp_tool_jsonrpc(name, args, config)
+        except Exception as exc:  # noqa: BLE001 - reported per call.
+            return _call_outcome(call_id, name, _elapsed_ms(started), exc=exc)
+        return _call_outcome(call_id, name, _elapsed_ms(started), result=result)
+
+    workers = min(len(calls), _pool_options(config).max_concurrent_calls)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_timed, calls))
+
+
+@asynccontextmanager
+async def _open_session(
+    config: MCPConfig,
+    message_handler: Optional[MessageHandler] = None,
+) -> AsyncIterator[Any]:
     transport = (config.transport or "").lower()
     if transport == "stdio":
         if not config.command:
@@ -133,9 +435,10 @@ async def _call_mcp_tool_async(
         client_session, params_cls, stdio_client = _load_stdio_client()
         params = params_cls(command=config.command, args=config.args or [])
         async with stdio_client(params) as (read, write):
-            async with client_session(read, write) as session:
+            async with client_session(read, write, message_handler=message_handler) as session:
                 await session.initialize()
-                return await session.call_tool(tool_name, tool_args)
+                yield session
+        return
 
     if transport in {"http", "sse"}:
         if not config.server_url:
@@ -146,29 +449,349 @@ async def _call_mcp_tool_async(
         else:
             client_session, client_factory = _load_http_client()
         async with client_factory(config.server_url, headers=headers) as (read, write):
-            async with client_session(read, write) as session:
+            async with client_session(read, write, message_handler=message_handler) as session:
                 await session.initialize()
-                return await session.call_tool(tool_name, tool_args)
+                yield session
+        return
 
     raise ValueError(f"Unsupported MCP transport: {config.transport!r}")
 
 
-def _call_mcp_tool(
+def _pool_enabled(config: MCPConfig) -> bool:
+    return config.session_pool is not False
+
+
+def _pool_key(config: MCPConfig) -> Hashable:
+    return (
+        (config.transport or "").lower(),
+        config.command,
+        tuple(config.args or []),
+        config.server_url,
+        config.api_key,
+    )
+
+
+def _pool_options(config: MCPConfig) -> SessionOptions:
+    interval = config.health_check_interval
+    if interval is None:
+        interval = _DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS
+    return SessionOptions(
+        max_concurrent_calls=config.max_concurrent_calls or _DEFAULT_MAX_CONCURRENT_CALLS,
+        health_check_interval=interval,
+        capability_ttl=_capability_ttl(config),
+    )
+
+
+def _call_pooled_tool(
     tool_name: str,
     tool_args: dict[str, Any],
     config: MCPConfig,
 ) -> Any:
+    return get_session_pool().call(
+        _pool_key(config),
+        lambda handler: _open_session(config, handler),
+        tool_name,
+        tool_args,
+        _pool_options(config),
+    )
+
+
+async def _call_mcp_tool_async(
+    tool_name: str,
+    tool_args: dict[str, Any],
+    config: MCPConfig,
+) -> Any:
+    if _pool_enabled(config):
+        return await get_session_pool().acall(
+            _pool_key(config),
+            lambda handler: _open_session(config, handler),
+            tool_name,
+            tool_args,
+            _pool_options(config),
+        )
+    async with _open_session(config) as session:
+        return await session.call_tool(tool_name, tool_args)
+
+
+def _resolve_transport(config: MCPConfig) -> str:
     transport = (config.transport or "").lower()
     if transport == "stdio" and not config.command and config.server_url:
         logger.warning(
             "mcp transport stdio missing MCP_COMMAND; falling back to jsonrpc with MCP_SERVER_URL"
         )
         transport = "jsonrpc"
-    if transport in {"jsonrpc", "http-jsonrpc", "rpc"}:
+    return transport
+
+
+def _call_mcp_tool(
+    tool_name: str,
+    tool_args: dict[str, Any],
+    config: MCPConfig,
+) -> Any:
+    if _resolve_transport(config) in _JSONRPC_TRANSPORTS:
         return _call_mcp_tool_jsonrpc(tool_name, tool_args, config)
+    if _pool_enabled(config):
+        return _call_pooled_tool(tool_name, tool_args, config)
     return _run_async(_call_mcp_tool_async(tool_name, tool_args, config))
 
 
+async def _acall_mcp_tools(
+    calls: list[tuple[Any, str, dict[str, Any]]],
+    config: MCPConfig,
+) -> list[dict[str, Any]]:
+    async def _timed(call_id: Any, name: str, invoke: Awaitable[Any]) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            result = await invoke
+        except Exception as exc:  # noqa: BLE001 - reported per call.
+            return _call_outcome(call_id, name, _elapsed_ms(started), exc=exc)
+        return _call_outcome(call_id, name, _elapsed_ms(started), result=result)
+
+    if _pool_enabled(config):
+        # The pool multiplexes these over one session and applies its cap.
+        return list(
+            await asyncio.gather(
+                *(
+                    _timed(call_id, name, _call_mcp_tool_async(name, args, config))
+                    for call_id, name, args in calls
+                )
+            )
+        )
+
+    semaphore = asyncio.Semaphore(_pool_options(config).max_concurrent_calls)
+    async with _open_session(config) as session:
+
+        async def _invoke(name: str, args: dict[str, Any]) -> Any:
+            async with semaphore:
+                return await session.call_tool(name, args)
+
+        return list(
+            await asyncio.gather(
+                *(_timed(call_id, name, _invoke(name, args)) for call_id, name, args in calls)
+            )
+        )
+
+
+def _lookup_cached_calls(
+    calls: list[tuple[Any, str, dict[str, Any]]],
+    config: MCPConfig,
+) -> tuple[list[Optional[dict[str, Any]]], list[int]]:
+    """Answer cacheable calls from the cache; return the indexes still to send."""
+    outcomes: list[Optional[dict[str, Any]]] = [None] * len(calls)
+    pending = []
+    for index, (call_id, name, args) in enumerate(calls):
+        cache = _get_tool_cache(config, name)
+        if cache is not None:
+            started = time.perf_counter()
+            cached = cache.get(_tool_cache_key(config, name, args))
+            if cached is not None:
+                outcome = _call_outcome(call_id, name, _elapsed_ms(started), result=cached)
+                outcome["cache"] = _cache_info(cache, hit=True)
+                outcomes[index] = outcome
+                continue
+        pending.append(index)
+    return outcomes, pending
+
+
+def _store_call_outcomes(
+    calls: list[tuple[Any, str, dict[str, Any]]],
+    pending: list[int],
+    sent: list[dict[str, Any]],
+    outcomes: list[Optional[dict[str, Any]]],
+    config: MCPConfig,
+) -> list[dict[str, Any]]:
+    for index, outcome in zip(pending, sent):
+        _call_id, name, args = calls[index]
+        cache = _get_tool_cache(config, name)
+        if cache is not None and outcome["status"] == "success":
+            result = _jsonable_result(outcome["tool_result"])
+            if _cacheable_result(result):
+                cache.set(_tool_cache_key(config, name, args), result)
+            outcome["tool_result"] = result
+            outcome["cache"] = _cache_info(cache, hit=False)
+        outcomes[index] = outcome
+    return outcomes
+
+
+def _call_mcp_batch(
+    calls: list[tuple[Any, str, dict[str, Any]]],
+    config: MCPConfig,
+) -> list[dict[str, Any]]:
+    outcomes, pending = _lookup_cached_calls(calls, config)
+    if not pending:
+        return outcomes
+    to_send = [calls[index] for index in pending]
+    if _resolve_transport(config) in _JSONRPC_TRANSPORTS:
+        sent = _call_mcp_tools_jsonrpc(to_send, config)
+    else:
+        sent = _run_async(_acall_mcp_tools(to_send, config))
+    return _store_call_outcomes(calls, pending, sent, outcomes, config)
+
+
+async def _acall_mcp_batch(
+    calls: list[tuple[Any, str, dict[str, Any]]],
+    config: MCPConfig,
+) -> list[dict[str, Any]]:
+    outcomes, pending = _lookup_cached_calls(calls, config)
+    if not pending:
+        return outcomes
+    to_send = [calls[index] for index in pending]
+    if _resolve_transport(config) in _JSONRPC_TRANSPORTS:
+        sent = await asyncio.to_thread(_call_mcp_tools_jsonrpc, to_send, config)
+    else:
+        sent = await _acall_mcp_tools(to_send, config)
+    return _store_call_outcomes(calls, pending, sent, outcomes, config)
+
+
+async def _acall_mcp_tool(
+    tool_name: str,
+    tool_args: dict[str, Any],
+    config: MCPConfig,
+) -> Any:
+    if _resolve_transport(config) in _JSONRPC_TRANSPORTS:
+        return await asyncio.to_thread(_call_mcp_tool_jsonrpc, tool_name, tool_args, config)
+    return await _call_mcp_tool_async(tool_name, tool_args, config)
+
+
+def _blob_store(config: MCPConfig) -> BlobStore:
+    return BlobStore(config.blob_dir or _DEFAULT_BLOB_DIR)
+
+
+def _summarize_result(result: Any) -> dict[str, Any]:
+    if isinstance(result, dict) and isinstance(result.get("content"), list):
+        content = [item for item in result["content"] if isinstance(item, dict)]
+        summary: dict[str, Any] = {
+            "content_items": len(result["content"]),
+            "content_types": sorted({str(item.get("type")) for item in content}),
+        }
+        texts = [item["text"] for item in content if isinstance(item.get("text"), str)]
+        if texts:
+            summary["preview"] = texts[0][:_SUMMARY_PREVIEW_CHARS]
+        return summary
+    return {"preview": json.dumps(result, default=str)[:_SUMMARY_PREVIEW_CHARS]}
+
+
+def _bound_result(result: Any, config: MCPConfig) -> Any:
+    """Spill results above `MCP_INLINE_LIMIT` bytes to the blob store.
+
+    Graph state keeps only a reference plus a summary, so checkpoints do not
+    serialise the full payload; `load_mcp_result` fetches it back.
+    """
+    if config.inline_limit is None:
+        return result
+    result = _jsonable_result(result)
+    payload = json.dumps(result, separators=(",", ":"), default=str).encode("utf-8")
+    if len(payload) <= config.inline_limit:
+        return result
+    digest = _blob_store(config).put(payload)
+    logger.info("mcp result of %d bytes stored as blob %s", len(payload), digest)
+    return {
+        "blob": {"digest": digest, "size": len(payload), "media_type": _BLOB_MEDIA_TYPE},
+        "summary": _summarize_result(result),
+    }
+
+
+def _is_blob_reference(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and set(value) == {"blob", "summary"}
+        and isinstance(value["blob"], dict)
+        and "digest" in value["blob"]
+    )
+
+
+def load_mcp_result(tool_result: Any, *, config: MCPConfig) -> Any:
+    """Return the full tool result, reading it from the blob store if spilled."""
+    if not _is_blob_reference(tool_result):
+        return tool_result
+    return json.loads(_blob_store(config).get(tool_result["blob"]["digest"]))
+
+
+def _success_result(
+    name: str,
+    result: Any,
+    config: MCPConfig,
+    cache: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    data = {
+        "status": "success",
+        "tool_name": name,
+        "tool_result": _bound_result(result, config),
+    }
+    if cache is not None:
+        data["cache"] = cache
+    return data
+
+
+def _failed_result(name: Optional[str], exc: Exception) -> dict[str, Any]:
+    return {
+        "status": "failed",
+        "tool_name": name,
+        "tool_result": None,
+        "error": str(exc),
+    }
+
+
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+def _call_outcome(
+    call_id: Any,
+    name: str,
+    elapsed_ms: float,
+    *,
+    result: Any = None,
+    exc: Optional[Exception] = None,
+) -> dict[str, Any]:
+    outcome = {
+        "id": call_id,
+        "tool_name": name,
+        "status": "success" if exc is None else "failed",
+        "tool_result": result,
+        "elapsed_ms": round(elapsed_ms, 3),
+    }
+    if exc is not None:
+        outcome["error"] = str(exc)
+    return outcome
+
+
+def _normalize_calls(calls: Any) -> list[tuple[Any, str, dict[str, Any]]]:
+    if not isinstance(calls, list) or not calls:
+        raise ValueError("mcp tool calls must be a non-empty list")
+    normalized = []
+    for index, call in enumerate(calls):
+        if not isinstance(call, dict) or not isinstance(call.get("tool"), str):
+            raise ValueError(f"mcp tool call {index} must be an object with a 'tool' name")
+        args = call.get("args") or {}
+        if not isinstance(args, dict):
+            raise ValueError(f"mcp tool call {index} 'args' must be an object")
+        normalized.append((call.get("id", index), call["tool"], args))
+    return normalized
+
+
+def _batch_result(outcomes: list[dict[str, Any]], config: MCPConfig) -> dict[str, Any]:
+    for outcome in outcomes:
+        if outcome["status"] == "success":
+            outcome["tool_result"] = _bound_result(outcome["tool_result"], config)
+    failed = sum(outcome["status"] != "success" for outcome in outcomes)
+    result: dict[str, Any] = {
+        "status": "failed" if failed else "success",
+        "calls": outcomes,
+    }
+    if failed:
+        result["error"] = f"{failed} of {len(outcomes)} mcp tool calls failed"
+    return result
+
+
+def _failed_batch_result(exc: Exception) -> dict[str, Any]:
+    return {
+        "status": "failed",
+        "calls": [],
+        "error": str(exc),
+    }
+
+
 def run_mcp_node(
     tool_args: Optional[dict[str, Any]],
     *,
@@ -180,18 +803,90 @@ def run_mcp_node(
     try:
         if not name:
             raise ValueError("tool_name is required")
-        result = _call_mcp_tool(name, tool_args or {}, config)
+        tool_args = tool_args or {}
+        cache = _get_tool_cache(config, name)
+        if cache is not None:
+            cache_key = _tool_cache_key(config, name, tool_args)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info("mcp node cache hit")
+                return _success_result(name, cached, config, _cache_info(cache, hit=True))
+        result = _call_mcp_tool(name, tool_args, config)
         logger.info("mcp node succeeded")
-        return {
-            "status": "success",
-            "tool_name": name,
-            "tool_result": result,
-        }
+        if cache is None:
+            return _success_result(name, result, config)
+        result = _jsonable_result(result)
+        if _cacheable_result(result):
+            cache.set(cache_key, result)
+        return _success_result(name, result, config, _cache_info(cache, hit=False))
     except Exception as exc:  # noqa: BLE001 - want node to surface errors as data.
         logger.exception("mcp node failed")
-        return {
-            "status": "failed",
-            "tool_name": name,
-            "tool_result": None,
-            "error": str(exc),
-        }
+        return _failed_result(name, exc)
+
+
+async def arun_mcp_node(
+    tool_args: Optional[dict[str, Any]],
+    *,
+    config: MCPConfig,
+    tool_name: Optional[str] = None,
+) -> dict[str, Any]:
+    logger.info("mcp node started")
+    name = tool_name or config.tool_name
+    try:
+        if not name:
+            raise ValueError("tool_name is required")
+        tool_args = tool_args or {}
+        cache = _get_tool_cache(config, name)
+        if cache is not None:
+            cache_key = _tool_cache_key(config, name, tool_args)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info("mcp node cache hit")
+                return _success_result(name, cached, config, _cache_info(cache, hit=True))
+        result = await _acall_mcp_tool(name, tool_args, config)
+        logger.info("mcp node succeeded")
+        if cache is None:
+            return _success_result(name, result, config)
+        result = _jsonable_result(result)
+        if _cacheable_result(result):
+            cache.set(cache_key, result)
+        return _success_result(name, result, config, _cache_info(cache, hit=False))
+    except Exception as exc:  # noqa: BLE001 - want node to surface errors as data.
+        logger.exception("mcp node failed")
+        return _failed_result(name, exc)
+
+
+def run_mcp_batch(
+    calls: list[dict[str, Any]],
+    *,
+    config: MCPConfig,
+) -> dict[str, Any]:
+    """Run `[{"tool": ..., "args": {...}, "id": ...}]` concurrently.
+
+    jsonrpc sends every call in one batch array; the session transports issue
+    them concurrently over one shared session. `calls` in the result lines up
+    with the input and carries each call's status and timing.
+    """
+    logger.info("mcp batch node started")
+    try:
+        outcomes = _call_mcp_batch(_normalize_calls(calls), config)
+    except Exception as exc:  # noqa: BLE001 - want node to surface errors as data.
+        logger.exception("mcp batch node failed")
+        return _failed_batch_result(exc)
+    logger.info("mcp batch node finished")
+    return _batch_result(outcomes, config)
+
+
+async def arun_mcp_batch(
+    calls: list[dict[str, Any]],
+    *,
+    config: MCPConfig,
+) -> dict[str, Any]:
+    logger.info("mcp batch node started")
+    try:
+        outcomes = await _acall_mcp_batch(_normalize_calls(calls), config)
+    except Exception as exc:  # noqa: BLE001 - want node to surface errors as data.
+        logger.exception("mcp batch node failed")
+        return _failed_batch_result(exc)
+    logger.info("mcp batch node finished")
+    return _batch_result(outcomes, config)
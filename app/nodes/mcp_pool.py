@@ -0,0 +1,283 @@
+"""Long-lived MCP client sessions shared across MCP node runs."""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, AsyncContextManager, Awaitable, Callable, Coroutine, Hashable, Optional
+
+
+logger = logging.getLogger(__name__)
+_PING_TIMEOUT_SECONDS = 5.0
+_CLOSE_TIMEOUT_SECONDS = 10.0
+_TOOLS_LIST_CHANGED = "notifications/tools/list_changed"
+
+MessageHandler = Callable[[Any], Awaitable[None]]
+# Opens a session that passes incoming server messages to the handler.
+SessionOpener = Callable[[MessageHandler], AsyncContextManager[Any]]
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+@dataclass(frozen=True)
+class SessionOptions:
+    max_concurrent_calls: int
+    health_check_interval: float
+    capability_ttl: float
+
+
+class _PooledSession:
+    """One open MCP session kept alive by a keeper task on the pool loop.
+
+    The transport and `ClientSession` contexts are entered and exited by the
+    keeper task itself, since anyio requires both to happen in the same task.
+    """
+
+    def __init__(self, opener: SessionOpener, max_concurrent_calls: int) -> None:
+        self._opener = opener
+        self._closing = asyncio.Event()
+        self._keeper: Optional[asyncio.Task] = None
+        self.semaphore = asyncio.Semaphore(max_concurrent_calls)
+        self.session: Any = None
+        self.checked_at = 0.0
+        self._tools: Optional[frozenset[str]] = None
+        self._tools_expire_at = 0.0
+
+    @property
+    def alive(self) -> bool:
+        return self._keeper is not None and not self._keeper.done()
+
+    async def start(self) -> None:
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._keeper = asyncio.create_task(self._keep(ready))
+        await asyncio.wait({ready, self._keeper}, return_when=asyncio.FIRST_COMPLETED)
+        if not ready.done():
+            # The keeper finished without opening: surface its error.
+            self._keeper.result()
+            raise RuntimeError("mcp session closed during startup")
+        self.session = ready.result()
+        self.checked_at = time.monotonic()
+
+    async def _keep(self, ready: asyncio.Future) -> None:
+        try:
+            async with self._opener(self._handle_message) as session:
+                ready.set_result(session)
+                await self._closing.wait()
+        except Exception as exc:  # noqa: BLE001 - reported to the caller or logged.
+            if not ready.done():
+                ready.set_exception(exc)
+            else:
+                logger.warning("mcp session closed unexpectedly: %s", exc)
+
+    async def _handle_message(self, message: Any) -> None:
+        # Server notifications arrive wrapped; the concrete one sits in `root`.
+        notification = getattr(message, "root", message)
+        if getattr(notification, "method", None) == _TOOLS_LIST_CHANGED:
+            self._tools_expire_at = 0.0
+
+    async def healthy(self, health_check_interval: float) -> bool:
+        if not self.alive:
+            return False
+        if time.monotonic() - self.checked_at < health_check_interval:
+            return True
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=_PING_TIMEOUT_SECONDS)
+        except Exception as exc:  # noqa: BLE001 - any ping failure means restart.
+            logger.warning("mcp session failed health check: %s", exc)
+            return False
+        self.checked_at = time.monotonic()
+        return True
+
+    async def tool_names(self, ttl: float, *, refresh: bool = False) -> Optional[frozenset[str]]:
+        """Return the cached tool catalogue, or None when the server has none."""
+        if refresh or time.monotonic() >= self._tools_expire_at:
+            try:
+                result = await self.session.list_tools()
+            except Exception as exc:  # noqa: BLE001 - validation is best effort.
+                logger.warning("mcp tools/list failed; skipping tool validation: %s", exc)
+                self._tools = None
+            else:
+                self._tools = frozenset(tool.name for tool in result.tools)
+            self._tools_expire_at = time.monotonic() + ttl
+        return self._tools
+
+    async def validate_tool(self, tool_name: str, ttl: float) -> None:
+        tools = await self.tool_names(ttl)
+        if tools is None or tool_name in tools:
+            return
+        # The catalogue may predate the tool; look once more before failing.
+        tools = await self.tool_names(ttl, refresh=True)
+        if tools is not None and tool_name not in tools:
+            raise ValueError(f"MCP server does not offer tool {tool_name!r}")
+
+    async def close(self) -> None:
+        self._closing.set()
+        if self._keeper is None:
+            return
+        try:
+            await asyncio.wait_for(self._keeper, timeout=_CLOSE_TIMEOUT_SECONDS)
+        except Exception as exc:  # noqa: BLE001 - closing is best effort.
+            logger.warning("mcp session did not close cleanly: %s", exc)
+
+
+class MCPSessionPool:
+    """Runs pooled MCP sessions on a dedicated event-loop thread.
+
+    Sessions are keyed by the caller (one per server) and multiplex calls;
+    each caps its in-flight calls with a semaphore, is pinged when it has been
+    idle for `health_check_interval` seconds and is reopened when it has died.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._sessions: dict[Hashable, _PooledSession] = {}
+        self._open_locks: dict[Hashable, asyncio.Lock] = {}
+
+    def call(
+        self,
+        key: Hashable,
+        opener: SessionOpener,
+        tool_name: str,
+        tool_args: dict[str, Any],
+        options: SessionOptions,
+    ) -> Any:
+        return self._submit(key, opener, tool_name, tool_args, options).result()
+
+    async def acall(
+        self,
+        key: Hashable,
+        opener: SessionOpener,
+        tool_name: str,
+        tool_args: dict[str, Any],
+        options: SessionOptions,
+    ) -> Any:
+        if _running_loop() is self._loop:
+            return await self._call(key, opener, tool_name, tool_args, options)
+        return await asyncio.wrap_future(
+            self._submit(key, opener, tool_name, tool_args, options)
+        )
+
+    def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Run `coro` on the pool loop and block until it finishes.
+
+        Safe from threads that are already running an event loop, which
+        `asyncio.run` is not; only the pool loop itself may not block on it.
+        """
+        loop = self._ensure_loop()
+        if _running_loop() is loop:
+            coro.close()
+            raise RuntimeError("cannot block on the mcp session pool loop from inside it")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._close_sessions(), loop)
+        try:
+            future.result(timeout=_CLOSE_TIMEOUT_SECONDS)
+        except Exception as exc:  # noqa: BLE001 - shutdown is best effort.
+            logger.warning("failed to close mcp sessions: %s", exc)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=_CLOSE_TIMEOUT_SECONDS)
+        if not thread.is_alive():
+            loop.close()
+
+    def _submit(
+        self,
+        key: Hashable,
+        opener: SessionOpener,
+        tool_name: str,
+        tool_args: dict[str, Any],
+        options: SessionOptions,
+    ) -> Future:
+        return asyncio.run_coroutine_threadsafe(
+            self._call(key, opener, tool_name, tool_args, options),
+            self._ensure_loop(),
+        )
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="mcp-session-pool",
+                    daemon=True,
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    async def _call(
+        self,
+        key: Hashable,
+        opener: SessionOpener,
+        tool_name: str,
+        tool_args: dict[str, Any],
+        options: SessionOptions,
+    ) -> Any:
+        pooled = await self._acquire(key, opener, options)
+        async with pooled.semaphore:
+            await pooled.validate_tool(tool_name, options.capability_ttl)
+            try:
+                result = await pooled.session.call_tool(tool_name, tool_args)
+            except Exception:
+                # Ping before the next call reuses a session that just failed.
+                pooled.checked_at = 0.0
+                raise
+        pooled.checked_at = time.monotonic()
+        return result
+
+    async def _acquire(
+        self,
+        key: Hashable,
+        opener: SessionOpener,
+        options: SessionOptions,
+    ) -> _PooledSession:
+        lock = self._open_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            pooled = self._sessions.get(key)
+            if pooled is not None and not await pooled.healthy(options.health_check_interval):
+                logger.info("restarting mcp session")
+                del self._sessions[key]
+                await pooled.close()
+                pooled = None
+            if pooled is None:
+                pooled = _PooledSession(opener, options.max_concurrent_calls)
+                await pooled.start()
+                self._sessions[key] = pooled
+            return pooled
+
+    async def _close_sessions(self) -> None:
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        self._open_locks.clear()
+        await asyncio.gather(*(pooled.close() for pooled in sessions), return_exceptions=True)
+
+
+_POOL = MCPSessionPool()
+
+
+def get_session_pool() -> MCPSessionPool:
+    return _POOL
+
+
+def close_mcp_sessions() -> None:
+    _POOL.close()
+
+
+atexit.register(close_mcp_sessions)
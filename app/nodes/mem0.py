@@ -1,14 +1,465 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
 from typing import Any, Optional
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from app.cache import MemoryCache, make_cache_key
 from app.config import Mem0Config
 
 
 logger = logging.getLogger(__name__)
+_DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+_DEFAULT_READ_TIMEOUT_SECONDS = 30.0
+_DEFAULT_POOL_SIZE = 10
+_DEFAULT_MAX_RETRIES = 3
+_DEFAULT_RETRY_BACKOFF_SECONDS = 0.5
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# A 500/502/504 on an add may come after the server stored the memory, so adds
+# only retry statuses that mean the request was turned away unprocessed.
+_ADD_RETRY_STATUSES = frozenset({429, 503})
+_SESSIONS: dict[tuple[Any, ...], requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+_ASYNC_CLIENTS: dict[tuple[asyncio.AbstractEventLoop, tuple[Any, ...]], httpx.AsyncClient] = {}
+# One started async generator per loop; `shutdown_asyncgens` (run by
+# `asyncio.run`) finalizes it, which closes that loop's clients.
+_LOOP_FINALIZERS: dict[asyncio.AbstractEventLoop, AsyncGenerator[None, None]] = {}
+# sequential: search sees this run's write; concurrent: add and search overlap;
+# background: the add is queued and the node only waits for the search.
+_WRITE_MODES = ("sequential", "concurrent", "background")
+_ORDERING = {
+    "sequential": "read_after_write",
+    "concurrent": "concurrent",
+    "background": "fire_and_forget",
+}
+_DEFAULT_WRITE_QUEUE_SIZE = 1000
+_DEFAULT_BATCH_WINDOW_SECONDS = 0.05
+_DEFAULT_BATCH_MAX_ITEMS = 20
+_DEFAULT_SEARCH_CACHE_TTL_SECONDS = 60.0
+_DEFAULT_SEARCH_CACHE_MAX_ENTRIES = 1024
+_SEARCH_CACHES: dict[tuple[Any, ...], MemoryCache] = {}
+# Bumped on every add so cached searches for that user stop matching.
+_USER_GENERATIONS: dict[tuple[Optional[str], Optional[str]], int] = {}
+_SEARCH_CACHE_LOCK = threading.Lock()
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_WRITER: Optional["_BackgroundWriter"] = None
+_WORKERS_LOCK = threading.Lock()
+
+
+def _timeouts(config: Mem0Config) -> tuple[float, float]:
+    connect = config.connect_timeout
+    read = config.read_timeout
+    return (
+        _DEFAULT_CONNECT_TIMEOUT_SECONDS if connect is None else connect,
+        _DEFAULT_READ_TIMEOUT_SECONDS if read is None else read,
+    )
+
+
+def _pool_size(config: Mem0Config) -> int:
+    return config.pool_size or _DEFAULT_POOL_SIZE
+
+
+def _max_retries(config: Mem0Config) -> int:
+    return _DEFAULT_MAX_RETRIES if config.max_retries is None else config.max_retries
+
+
+def _retry_backoff(config: Mem0Config) -> float:
+    if config.retry_backoff is None:
+        return _DEFAULT_RETRY_BACKOFF_SECONDS
+    return config.retry_backoff
+
+
+def _build_retry(config: Mem0Config, statuses: frozenset[int] = _RETRY_STATUSES) -> Retry:
+    return Retry(
+        total=_max_retries(config),
+        # A read error may follow a write the server already applied; retrying
+        # it would store the memory twice, so only connect errors and statuses retry.
+        read=0,
+        backoff_factor=_retry_backoff(config),
+        status_forcelist=statuses,
+        # mem0 writes and searches are both POSTs, which urllib3 skips by default.
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def _session_key(config: Mem0Config) -> tuple[Any, ...]:
+    return (
+        config.server_url,
+        _pool_size(config),
+        _max_retries(config),
+        _retry_backoff(config),
+    )
+
+
+def _get_session(config: Mem0Config) -> requests.Session:
+    key = _session_key(config)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=_pool_size(config),
+                max_retries=_build_retry(config),
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            # requests picks the longest matching prefix, so adds get their own policy.
+            session.mount(
+                _build_url(config.server_url, "/memories/"),
+                HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=_pool_size(config),
+                    max_retries=_build_retry(config, _ADD_RETRY_STATUSES),
+                ),
+            )
+            _SESSIONS[key] = session
+        return session
+
+
+def _async_client_key(config: Mem0Config) -> tuple[Any, ...]:
+    return (config.server_url, _timeouts(config), _pool_size(config))
+
+
+async def _close_on_loop_shutdown() -> AsyncGenerator[None, None]:
+    try:
+        yield
+    finally:
+        await aclose_mem0_clients()
+
+
+async def _aget_client(config: Mem0Config) -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    key = (loop, _async_client_key(config))
+    finalizer = None
+    with _SESSIONS_LOCK:
+        client = _ASYNC_CLIENTS.get(key)
+        if client is None:
+            # Clients of closed loops can no longer be used or closed; forget
+            # them so repeated `asyncio.run` calls do not pile up clients.
+            for stale in [stale for stale in _ASYNC_CLIENTS if stale[0].is_closed()]:
+                del _ASYNC_CLIENTS[stale]
+            for stale in [stale for stale in _LOOP_FINALIZERS if stale.is_closed()]:
+                del _LOOP_FINALIZERS[stale]
+            connect_timeout, read_timeout = _timeouts(config)
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(max_connections=_pool_size(config)),
+            )
+            _ASYNC_CLIENTS[key] = client
+            if loop not in _LOOP_FINALIZERS:
+                finalizer = _close_on_loop_shutdown()
+                _LOOP_FINALIZERS[loop] = finalizer
+    if finalizer is not None:
+        await finalizer.__anext__()
+    return client
+
+
+async def aclose_mem0_clients() -> None:
+    """Close the pooled async clients owned by the running loop."""
+    loop = asyncio.get_running_loop()
+    with _SESSIONS_LOCK:
+        owned = [key for key in _ASYNC_CLIENTS if key[0] is loop]
+        clients = [_ASYNC_CLIENTS.pop(key) for key in owned]
+    for client in clients:
+        await client.aclose()
+
+
+def close_mem0_sessions() -> None:
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.values())
+        async_clients = [(loop, client) for (loop, _), client in _ASYNC_CLIENTS.items()]
+        _SESSIONS.clear()
+        _ASYNC_CLIENTS.clear()
+        _LOOP_FINALIZERS.clear()
+    for session in sessions:
+        session.close()
+    for loop, client in async_clients:
+        # Connections can only be closed on their own loop; once that loop is
+        # gone the sockets are released with the process.
+        if loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(client.aclose())
+        except Exception:  # noqa: BLE001 - shutdown must not fail on one client.
+            logger.exception("mem0 async client close failed")
+
+
+atexit.register(close_mem0_sessions)
+
+
+def _resolve_write_mode(config: Mem0Config) -> str:
+    mode = (config.write_mode or "sequential").lower()
+    if mode not in _WRITE_MODES:
+        raise ValueError(f"MEM0_WRITE_MODE must be one of {', '.join(_WRITE_MODES)}")
+    return mode
+
+
+@dataclass
+class _PendingAdd:
+    session: requests.Session
+    server_url: Optional[str]
+    url: str
+    headers: dict[str, str]
+    timeout: tuple[float, float]
+    user_id: Optional[str]
+    message: dict[str, str]
+
+    @property
+    def batch_key(self) -> tuple[Any, ...]:
+        return (self.url, self.headers.get("Authorization"), self.user_id)
+
+
+class _BackgroundWriter:
+    """Daemon thread that batches queued mem0 adds per user.
+
+    After the first item arrives the writer keeps collecting for
+    `batch_window` seconds (or until `batch_max_items`), then sends one
+    `/memories/` request per user with all collected messages.
+    """
+
+    def __init__(self, max_queue_size: int, batch_window: float, batch_max_items: int) -> None:
+        self._queue: queue.Queue[Optional[_PendingAdd]] = queue.Queue(max_queue_size)
+        self._batch_window = batch_window
+        self._batch_max_items = batch_max_items
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "queued": 0,
+            "rejected": 0,
+            "sent_items": 0,
+            "requests": 0,
+            "failed_requests": 0,
+            "last_flush_ms": None,
+            "max_flush_ms": None,
+        }
+        self._thread = threading.Thread(target=self._run, name="mem0-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: _PendingAdd) -> bool:
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._record(rejected=1)
+            return False
+        self._record(queued=1)
+        return True
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def metrics(self) -> dict[str, Any]:
+        with self._metrics_lock:
+            return {"queue_depth": self._queue.qsize(), **self._metrics}
+
+    def _record(self, **counts: int) -> None:
+        with self._metrics_lock:
+            for name, value in counts.items():
+                self._metrics[name] += value
+
+    def _collect(self, first: _PendingAdd) -> tuple[list[_PendingAdd], bool]:
+        items = [first]
+        deadline = time.monotonic() + self._batch_window
+        while len(items) < self._batch_max_items:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.task_done()
+                return items, True
+            items.append(item)
+        return items, False
+
+    def _send(self, items: list[_PendingAdd]) -> None:
+        groups: dict[tuple[Any, ...], list[_PendingAdd]] = {}
+        for item in items:
+            groups.setdefault(item.batch_key, []).append(item)
+        started = time.perf_counter()
+        for group in groups.values():
+            head = group[0]
+            try:
+                _post_json(
+                    head.session,
+                    head.url,
+                    {"messages": [item.message for item in group], "user_id": head.user_id},
+                    headers=head.headers,
+                    timeout=head.timeout,
+                )
+                invalidate_mem0_user(head.server_url, head.user_id)
+                self._record(requests=1, sent_items=len(group))
+            except Exception:  # noqa: BLE001 - a failed write must not stop the writer.
+                logger.exception("mem0 background write failed for %d item(s)", len(group))
+                self._record(requests=1, failed_requests=1)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        with self._metrics_lock:
+            self._metrics["last_flush_ms"] = elapsed_ms
+            previous_max = self._metrics["max_flush_ms"]
+            self._metrics["max_flush_ms"] = max(previous_max or 0.0, elapsed_ms)
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                self._queue.task_done()
+                return
+            items, stop = self._collect(first)
+            try:
+                self._send(items)
+            finally:
+                for _item in items:
+                    self._queue.task_done()
+            if stop:
+                return
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _WORKERS_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=_DEFAULT_POOL_SIZE, thread_name_prefix="mem0-add"
+            )
+        return _EXECUTOR
+
+
+def _get_writer(config: Mem0Config) -> _BackgroundWriter:
+    global _WRITER
+    with _WORKERS_LOCK:
+        if _WRITER is None:
+            _WRITER = _BackgroundWriter(
+                config.write_queue_size or _DEFAULT_WRITE_QUEUE_SIZE,
+                _DEFAULT_BATCH_WINDOW_SECONDS if config.batch_window is None else config.batch_window,
+                config.batch_max_items or _DEFAULT_BATCH_MAX_ITEMS,
+            )
+        return _WRITER
+
+
+def flush_mem0_writes() -> None:
+    """Block until every queued background write has been sent."""
+    with _WORKERS_LOCK:
+        writer = _WRITER
+    if writer is not None:
+        writer.flush()
+
+
+def mem0_write_metrics() -> dict[str, Any]:
+    """Queue depth, request counts and flush latency of the background writer."""
+    with _WORKERS_LOCK:
+        writer = _WRITER
+    if writer is None:
+        return {}
+    return writer.metrics()
+
+
+def close_mem0_workers() -> None:
+    global _EXECUTOR, _WRITER
+    with _WORKERS_LOCK:
+        executor, writer = _EXECUTOR, _WRITER
+        _EXECUTOR, _WRITER = None, None
+    if writer is not None:
+        writer.close()
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+atexit.register(close_mem0_workers)
+
+
+def _get_search_cache(config: Mem0Config) -> Optional[MemoryCache]:
+    if not config.search_cache_enabled:
+        return None
+    ttl = config.search_cache_ttl
+    if ttl is None:
+        ttl = _DEFAULT_SEARCH_CACHE_TTL_SECONDS
+    max_entries = config.search_cache_max_entries or _DEFAULT_SEARCH_CACHE_MAX_ENTRIES
+    with _SEARCH_CACHE_LOCK:
+        cache = _SEARCH_CACHES.get((ttl, max_entries))
+        if cache is None:
+            cache = MemoryCache(max_entries=max_entries, ttl_seconds=ttl)
+            _SEARCH_CACHES[(ttl, max_entries)] = cache
+        return cache
+
+
+def invalidate_mem0_user(server_url: Optional[str], user_id: Optional[str]) -> None:
+    """Make cached searches for this user miss from now on."""
+    with _SEARCH_CACHE_LOCK:
+        key = (server_url, user_id)
+        _USER_GENERATIONS[key] = _USER_GENERATIONS.get(key, 0) + 1
+
+
+def _search_cache_key(config: Mem0Config, query: str) -> str:
+    with _SEARCH_CACHE_LOCK:
+        generation = _USER_GENERATIONS.get((config.server_url, config.user_id), 0)
+    return make_cache_key(config.server_url, config.user_id, generation, query)
+
+
+def _search_cache_info(cache: MemoryCache, *, hit: bool) -> dict[str, Any]:
+    return {"hit": hit, "hits": cache.hits, "misses": cache.misses}
+
+
+def clear_mem0_search_caches() -> None:
+    with _SEARCH_CACHE_LOCK:
+        _SEARCH_CACHES.clear()
+        _USER_GENERATIONS.clear()
+
+
+def _retry_delay(response: Optional[httpx.Response], attempt: int, config: Mem0Config) -> float:
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after is not None:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+    return _retry_backoff(config) * (2 ** attempt)
+
+
+async def _apost(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    json: dict[str, Any],
+    headers: dict[str, str],
+    config: Mem0Config,
+    statuses: frozenset[int] = _RETRY_STATUSES,
+) -> httpx.Response:
+    """POST with the same retry policy the sync session gets from urllib3."""
+    max_retries = _max_retries(config)
+    attempt = 0
+    while True:
+        try:
+            response = await client.post(url, json=json, headers=headers)
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            if attempt >= max_retries:
+                raise
+            delay = _retry_delay(None, attempt, config)
+        else:
+            if response.status_code not in statuses or attempt >= max_retries:
+                return response
+            delay = _retry_delay(response, attempt, config)
+        await asyncio.sleep(delay)
+        attempt += 1
 
 
 def _build_headers(api_key: Optional[str]) -> dict[str, str]:
@@ -23,6 +474,86 @@ def _build_url(server_url: Optional[str], path: str) -> str:
     return f"{base.rstrip('/')}{path}"
 
 
+def _build_add_payload(content: str, config: Mem0Config) -> dict[str, Any]:
+    return {
+        "messages": [{"role": "user", "content": content}],
+        "user_id": config.user_id,
+    }
+
+
+def _build_search_payload(query: str, config: Mem0Config) -> dict[str, Any]:
+    return {
+        "query": query,
+        "user_id": config.user_id,
+    }
+
+
+def _extract_memory_id(add_data: Any) -> Optional[Any]:
+    return add_data.get("id") if isinstance(add_data, dict) else None
+
+
+def _success_result(
+    memory_id: Optional[Any],
+    search_data: Any,
+    ordering: str,
+    search_cache: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    result = {
+        "status": "success",
+        "memory_id": memory_id,
+        "query_result": search_data,
+        "ordering": ordering,
+    }
+    if search_cache is not None:
+        result["search_cache"] = search_cache
+    return result
+
+
+def _failed_result(exc: Exception) -> dict[str, Any]:
+    return {
+        "status": "failed",
+        "memory_id": None,
+        "query_result": None,
+        "error": str(exc),
+    }
+
+
+def _post_json(
+    session: requests.Session,
+    url: str,
+    payload: dict[str, Any],
+    *,
+    headers: dict[str, str],
+    timeout: tuple[float, float],
+) -> Any:
+    response = session.post(url, json=payload, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def _queue_add(
+    session: requests.Session,
+    content: str,
+    config: Mem0Config,
+    headers: dict[str, str],
+    timeout: tuple[float, float],
+) -> bool:
+    queued = _get_writer(config).submit(
+        _PendingAdd(
+            session=session,
+            server_url=config.server_url,
+            url=_build_url(config.server_url, "/memories/"),
+            headers=headers,
+            timeout=timeout,
+            user_id=config.user_id,
+            message={"role": "user", "content": content},
+        )
+    )
+    if not queued:
+        logger.warning("mem0 write queue is full, writing inline")
+    return queued
+
+
 def run_mem0_node(
     content: str,
     query: str,
@@ -31,44 +562,149 @@ def run_mem0_node(
 ) -> dict[str, Any]:
     logger.info("mem0 node started")
     try:
+        mode = _resolve_write_mode(config)
         headers = _build_headers(config.api_key)
+        session = _get_session(config)
+        timeout = _timeouts(config)
 
-        add_payload = {
-            "messages": [{"role": "user", "content": content}],
-            "user_id": config.user_id,
-        }
-        add_response = requests.post(
-            _build_url(config.server_url, "/memories/"),
-            json=add_payload,
-            headers=headers,
-        )
-        add_response.raise_for_status()
-        add_data = add_response.json()
-        memory_id = add_data.get("id") if isinstance(add_data, dict) else None
+        search_cache = _get_search_cache(config)
+        cache_hit = False
 
-        search_payload = {
-            "query": query,
-            "user_id": config.user_id,
-        }
-        search_response = requests.post(
-            _build_url(config.server_url, "/search/"),
-            json=search_payload,
-            headers=headers,
-        )
-        search_response.raise_for_status()
-        search_data = search_response.json()
+        def _add() -> Any:
+            add_data = _post_json(
+                session,
+                _build_url(config.server_url, "/memories/"),
+                _build_add_payload(content, config),
+                headers=headers,
+                timeout=timeout,
+            )
+            invalidate_mem0_user(config.server_url, config.user_id)
+            return add_data
+
+        def _search() -> Any:
+            nonlocal cache_hit
+            # The key is taken when the search starts, so a write that lands
+            # afterwards invalidates whatever this search stores.
+            cache_key = _search_cache_key(config, query) if search_cache is not None else None
+            if search_cache is not None:
+                cached = search_cache.get(cache_key)
+                if cached is not None:
+                    cache_hit = True
+                    return cached
+            search_data = _post_json(
+                session,
+                _build_url(config.server_url, "/search/"),
+                _build_search_payload(query, config),
+                headers=headers,
+                timeout=timeout,
+            )
+            if search_cache is not None:
+                search_cache.set(cache_key, search_data)
+            return search_data
+
+        if mode == "background" and _queue_add(session, content, config, headers, timeout):
+            memory_id = None
+            search_data = _search()
+        elif mode == "concurrent":
+            add_future = _get_executor().submit(_add)
+            search_data = _search()
+            memory_id = _extract_memory_id(add_future.result())
+        else:
+            mode = "sequential"
+            memory_id = _extract_memory_id(_add())
+            search_data = _search()
 
         logger.info("mem0 node succeeded")
-        return {
-            "status": "success",
-            "memory_id": memory_id,
-            "query_result": search_data,
-        }
+        cache_info = None
+        if search_cache is not None:
+            cache_info = _search_cache_info(search_cache, hit=cache_hit)
+        return _success_result(memory_id, search_data, _ORDERING[mode], cache_info)
     except Exception as exc:  # noqa: BLE001 - want node to surface errors as data.
         logger.exception("mem0 node failed")
-        return {
-            "status": "failed",
-            "memory_id": None,
-            "query_result": None,
-            "error": str(exc),
-        }
+        return _failed_result(exc)
+
+
+async def _apost_json(
+    client: httpx.AsyncClient,
+    url: str,
+    payload: dict[str, Any],
+    *,
+    headers: dict[str, str],
+    config: Mem0Config,
+    statuses: frozenset[int] = _RETRY_STATUSES,
+) -> Any:
+    response = await _apost(
+        client, url, json=payload, headers=headers, config=config, statuses=statuses
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def arun_mem0_node(
+    content: str,
+    query: str,
+    *,
+    config: Mem0Config,
+) -> dict[str, Any]:
+    logger.info("mem0 node started")
+    try:
+        mode = _resolve_write_mode(config)
+        headers = _build_headers(config.api_key)
+        search_cache = _get_search_cache(config)
+        cache_hit = False
+        client = await _aget_client(config)
+
+        async def _add() -> Any:
+            add_data = await _apost_json(
+                client,
+                _build_url(config.server_url, "/memories/"),
+                _build_add_payload(content, config),
+                headers=headers,
+                config=config,
+                statuses=_ADD_RETRY_STATUSES,
+            )
+            invalidate_mem0_user(config.server_url, config.user_id)
+            return add_data
+
+        async def _search() -> Any:
+            nonlocal cache_hit
+            cache_key = _search_cache_key(config, query) if search_cache is not None else None
+            if search_cache is not None:
+                cached = search_cache.get(cache_key)
+                if cached is not None:
+                    cache_hit = True
+                    return cached
+            search_data = await _apost_json(
+                client,
+                _build_url(config.server_url, "/search/"),
+                _build_search_payload(query, config),
+                headers=headers,
+                config=config,
+            )
+            if search_cache is not None:
+                search_cache.set(cache_key, search_data)
+            return search_data
+
+        # Background writes outlive this loop, so they go through the pooled
+        # sync session on the writer thread.
+        if mode == "background" and _queue_add(
+            _get_session(config), content, config, headers, _timeouts(config)
+        ):
+            memory_id = None
+            search_data = await _search()
+        elif mode == "concurrent":
+            add_data, search_data = await asyncio.gather(_add(), _search())
+            memory_id = _extract_memory_id(add_data)
+        else:
+            mode = "sequential"
+            memory_id = _extract_memory_id(await _add())
+            search_data = await _search()
+
+        logger.info("mem0 node succeeded")
+        cache_info = None
+        if search_cache is not None:
+            cache_info = _search_cache_info(search_cache, hit=cache_hit)
+        return _success_result(memory_id, search_data, _ORDERING[mode], cache_info)
+    except Exception as exc:  # noqa: BLE001 - want node to surface errors as data.
+        logger.exception("mem0 node failed")
+        return _failed_result(exc)
@@ -1,20 +1,185 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+import hashlib
+import json
 import logging
-from typing import Any, Optional
+import threading
+import time
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Optional, TypeVar
 
-from pymilvus import Collection, CollectionSchema, DataType, FieldSchema, connections, utility
+import grpc
+import numpy as np
+from pymilvus import (
+    AsyncMilvusClient,
+    Collection,
+    CollectionSchema,
+    DataType,
+    FieldSchema,
+    connections,
+    utility,
+)
+from pymilvus.exceptions import (
+    ConnectError,
+    ConnectionNotExistException,
+    MilvusException,
+    MilvusUnavailableException,
+)
 
+from app.cache import MemoryCache
 from app.config import MilvusConfig
+from app.nodes.milvus_local import LocalVectorIndex, get_local_index
 
 
 logger = logging.getLogger(__name__)
 _CONNECT_TIMEOUT_SECONDS = 10
-_DEFAULT_INDEX_PARAMS = {
-    "index_type": "IVF_FLAT",
-    "metric_type": "L2",
-    "params": {"nlist": 128},
+_DEFAULT_INDEX_TYPE = "IVF_FLAT"
+_DEFAULT_METRIC_TYPE = "L2"
+# Build params used when MILVUS_INDEX_PARAMS does not set them.
+_DEFAULT_BUILD_PARAMS: dict[str, dict[str, Any]] = {
+    "FLAT": {},
+    "IVF_FLAT": {"nlist": 128},
+    "IVF_SQ8": {"nlist": 128},
+    "IVF_PQ": {"nlist": 128, "nbits": 8},
+    "HNSW": {"M": 16, "efConstruction": 200},
+    "DISKANN": {},
+    "AUTOINDEX": {},
 }
+# Index families and the search knob each of them reads.
+_SEARCH_PARAM_KEYS = {
+    "IVF_FLAT": "nprobe",
+    "IVF_SQ8": "nprobe",
+    "IVF_PQ": "nprobe",
+    "HNSW": "ef",
+    "DISKANN": "search_list",
+}
+# Keys of an index description that are not build params.
+_INDEX_DESCRIPTION_KEYS = frozenset(
+    {
+        "index_type",
+        "metric_type",
+        "params",
+        "field_name",
+        "index_name",
+        "total_rows",
+        "indexed_rows",
+        "pending_index_rows",
+        "state",
+    }
+)
+_DEFAULT_NPROBE = 10
+_DEFAULT_EF = 64
+_DEFAULT_SEARCH_LIST = 100
+_PRIMARY_FIELD = "id"
+_VECTOR_FIELD = "embedding"
+_HASH_FIELD = "content_hash"
+_CONTENT_HASH_CACHE_MAX_ENTRIES = 10000
+# Keeps `content_hash in [...]` filter expressions to a reasonable size.
+_HASH_LOOKUP_BATCH = 1000
+_DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS = 30.0
+_CONSISTENCY_LEVELS = ("Strong", "Bounded", "Session", "Eventually")
+# Session consistency gives read-after-write on the writing connection
+# without sealing a segment per insert.
+_DEFAULT_CONSISTENCY_LEVEL = "Session"
+# Stay well below the default 64 MiB gRPC message limit of the Milvus proxy.
+_DEFAULT_MAX_BATCH_BYTES = 16 * 1024 * 1024
+_FLOAT_VECTOR_ITEM_BYTES = 4
+_BACKENDS = ("milvus", "local")
+# Errors that say the channel itself may be broken rather than the request.
+_CONNECTION_ERRORS = (
+    grpc.RpcError,
+    ConnectError,
+    ConnectionNotExistException,
+    MilvusUnavailableException,
+    ConnectionError,
+    TimeoutError,
+)
+_SESSIONS: dict[tuple[Any, ...], "_MilvusSession"] = {}
+_SESSIONS_LOCK = threading.Lock()
+# Per event loop, since async clients and asyncio locks cannot be shared across loops.
+_ASYNC_SESSIONS: dict[
+    tuple[asyncio.AbstractEventLoop, tuple[Any, ...]], "_AsyncMilvusSession"
+] = {}
+# One started async generator per loop; `shutdown_asyncgens` (run by
+# `asyncio.run`) finalizes it, which closes that loop's clients.
+_LOOP_FINALIZERS: dict[asyncio.AbstractEventLoop, AsyncGenerator[None, None]] = {}
+_HASHLESS_COLLECTIONS: set[tuple[Any, ...]] = set()
+_T = TypeVar("_T")
+
+
+@dataclass
+class _MilvusSession:
+    """One pymilvus connection alias plus the collection state already set up on it."""
+
+    alias: str
+    checked_at: float
+    collections: dict[str, Collection] = field(default_factory=dict)
+    indexes: dict[str, tuple[dict[str, Any], Optional[str]]] = field(default_factory=dict)
+    loaded: set[str] = field(default_factory=set)
+    # content hash -> primary key of rows this process has written or looked up.
+    content_hashes: MemoryCache = field(
+        default_factory=lambda: MemoryCache(max_entries=_CONTENT_HASH_CACHE_MAX_ENTRIES)
+    )
+    # Serialise the dedupe lookup and insert per collection.
+    write_locks: dict[str, threading.Lock] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+@dataclass
+class _AsyncMilvusSession:
+    """One AsyncMilvusClient on one event loop plus the collection state set up through it."""
+
+    client: AsyncMilvusClient
+    checked_at: float
+    # collection name -> schema field names, for collections known to exist.
+    field_names: dict[str, list[str]] = field(default_factory=dict)
+    indexes: dict[str, tuple[dict[str, Any], Optional[str]]] = field(default_factory=dict)
+    loaded: set[str] = field(default_factory=set)
+    write_locks: dict[str, asyncio.Lock] = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+def _as_list(values: Any) -> list[Any]:
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+def _hit_field(hit: Any, name: str) -> Any:
+    entity = hit.get("entity") if isinstance(hit, dict) else getattr(hit, "entity", None)
+    if isinstance(entity, dict):
+        return entity.get(name)
+    return getattr(entity, name, None)
+
+
+def _columnar_search_result(
+    result: Any,
+    output_fields: Optional[list[str]] = None,
+) -> Optional[dict[str, Any]]:
+    """Bulk-convert a pymilvus SearchResult (a list of Hits) to per-query arrays.
+
+    Returns None when the result does not look like one, so callers can fall
+    back to the generic walker.
+    """
+    if not isinstance(result, (list, tuple)) or not result:
+        return None
+    ids: list[list[Any]] = []
+    distances: list[list[Any]] = []
+    for hits in result:
+        hit_ids = getattr(hits, "ids", None)
+        hit_distances = getattr(hits, "distances", None)
+        if hit_ids is None or hit_distances is None:
+            return None
+        ids.append(_as_list(hit_ids))
+        distances.append(_as_list(hit_distances))
+    payload: dict[str, Any] = {"ids": ids, "distances": distances}
+    if output_fields:
+        payload["fields"] = {
+            name: [[_hit_field(hit, name) for hit in hits] for hits in result]
+            for name in output_fields
+        }
+    return payload
 
 
 def _serialize_search_result(result: Any) -> Any:
@@ -47,30 +212,615 @@ def _serialize_search_result(result: Any) -> Any:
     return str(result)
 
 
-def _ensure_collection(name: Optional[str], *, dim: int) -> Collection:
+def _build_schema(*, dim: int, dedupe: bool) -> CollectionSchema:
+    fields = [
+        FieldSchema(name=_PRIMARY_FIELD, dtype=DataType.INT64, is_primary=True, auto_id=True),
+        FieldSchema(name=_VECTOR_FIELD, dtype=DataType.FLOAT_VECTOR, dim=dim),
+    ]
+    if dedupe:
+        # Nullable so the collection still accepts writes once dedupe is turned
+        # off; nullable fields need Milvus 2.5+, hence only added when used.
+        fields.append(
+            FieldSchema(name=_HASH_FIELD, dtype=DataType.VARCHAR, max_length=64, nullable=True)
+        )
+    return CollectionSchema(fields, description="agent vectors")
+
+
+def _require_collection_name(name: Optional[str]) -> str:
     if not name:
         raise ValueError("MILVUS_COLLECTION is required")
-    if utility.has_collection(name):
-        return Collection(name)
-    fields = [
-        FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
-        FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=dim),
+    return name
+
+
+def _require_address(config: MilvusConfig) -> None:
+    if not config.host or config.port is None:
+        raise ValueError("MILVUS_HOST and MILVUS_PORT are required")
+
+
+def _resolve_consistency_level(config: MilvusConfig) -> str:
+    level = config.consistency_level or _DEFAULT_CONSISTENCY_LEVEL
+    for known in _CONSISTENCY_LEVELS:
+        if level.lower() == known.lower():
+            return known
+    raise ValueError(
+        f"MILVUS_CONSISTENCY_LEVEL must be one of {', '.join(_CONSISTENCY_LEVELS)}"
+    )
+
+
+def _session_key(config: MilvusConfig) -> tuple[Any, ...]:
+    return (config.host, config.port, config.db_name, config.username)
+
+
+def _session_alias(key: tuple[Any, ...]) -> str:
+    return "agent-milvus-" + hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:12]
+
+
+def _connect(config: MilvusConfig, alias: str) -> None:
+    connections.connect(
+        alias=alias,
+        host=config.host,
+        port=config.port,
+        user=config.username,
+        password=config.password,
+        db_name=config.db_name,
+        timeout=_CONNECT_TIMEOUT_SECONDS,
+    )
+
+
+def _disconnect(alias: str) -> None:
+    try:
+        connections.disconnect(alias)
+    except Exception:  # noqa: BLE001 - the channel may already be gone.
+        logger.debug("milvus disconnect failed for %s", alias, exc_info=True)
+
+
+def _is_healthy(session: _MilvusSession) -> bool:
+    try:
+        utility.get_server_version(using=session.alias)
+    except Exception:  # noqa: BLE001 - any RPC error means the channel is unusable.
+        logger.warning("milvus health check failed, reconnecting")
+        return False
+    return True
+
+
+def _health_check_interval(config: MilvusConfig) -> float:
+    interval = config.health_check_interval
+    if interval is None:
+        return _DEFAULT_HEALTH_CHECK_INTERVAL_SECONDS
+    return interval
+
+
+def _get_session(config: MilvusConfig) -> _MilvusSession:
+    key = _session_key(config)
+    interval = _health_check_interval(config)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        now = time.monotonic()
+        if session is not None and now - session.checked_at >= interval:
+            if _is_healthy(session):
+                session.checked_at = now
+            else:
+                _disconnect(session.alias)
+                del _SESSIONS[key]
+                session = None
+        if session is None:
+            alias = _session_alias(key)
+            _connect(config, alias)
+            session = _MilvusSession(alias=alias, checked_at=now)
+            _SESSIONS[key] = session
+        return session
+
+
+def _handle_session_error(config: MilvusConfig, exc: Exception) -> None:
+    """Decide what a failed call means for the shared session.
+
+    Other callers may be using the same connection, so it is never torn down
+    here: connection errors only force a health check before the next reuse,
+    and server errors forget the collection setup that may now be stale.
+    """
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(_session_key(config))
+    if session is None:
+        return
+    if isinstance(exc, _CONNECTION_ERRORS):
+        session.checked_at = 0.0
+    elif isinstance(exc, MilvusException) and config.collection:
+        with session.lock:
+            session.collections.pop(config.collection, None)
+            session.indexes.pop(config.collection, None)
+            session.loaded.discard(config.collection)
+
+
+def close_milvus_sessions() -> None:
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.values())
+        async_sessions = [(loop, session) for (loop, _), session in _ASYNC_SESSIONS.items()]
+        _SESSIONS.clear()
+        _ASYNC_SESSIONS.clear()
+        _LOOP_FINALIZERS.clear()
+        _HASHLESS_COLLECTIONS.clear()
+    for session in sessions:
+        _disconnect(session.alias)
+    for loop, async_session in async_sessions:
+        # Clients can only be closed on their own loop; once that loop is
+        # gone the channel is released with the process.
+        if loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(async_session.client.close())
+        except Exception:  # noqa: BLE001 - shutdown must not fail on one client.
+            logger.exception("milvus async client close failed")
+
+
+atexit.register(close_milvus_sessions)
+
+
+def _ensure_collection(
+    session: _MilvusSession,
+    name: Optional[str],
+    *,
+    dim: int,
+    consistency_level: str,
+    dedupe: bool,
+) -> Collection:
+    name = _require_collection_name(name)
+    with session.lock:
+        collection = session.collections.get(name)
+        if collection is not None:
+            return collection
+        if utility.has_collection(name, using=session.alias):
+            collection = Collection(name, using=session.alias)
+        else:
+            collection = Collection(
+                name,
+                _build_schema(dim=dim, dedupe=dedupe),
+                using=session.alias,
+                consistency_level=consistency_level,
+            )
+        session.collections[name] = collection
+        return collection
+
+
+def _resolve_index_params(config: MilvusConfig) -> dict[str, Any]:
+    index_type = (config.index_type or _DEFAULT_INDEX_TYPE).upper()
+    if index_type not in _DEFAULT_BUILD_PARAMS:
+        raise ValueError(
+            f"MILVUS_INDEX_TYPE must be one of {', '.join(_DEFAULT_BUILD_PARAMS)}"
+        )
+    params = {**_DEFAULT_BUILD_PARAMS[index_type], **(config.index_params or {})}
+    if index_type == "IVF_PQ" and "m" not in params:
+        raise ValueError("MILVUS_INDEX_PARAMS must set m for IVF_PQ")
+    return {
+        "index_type": index_type,
+        "metric_type": (config.metric_type or _DEFAULT_METRIC_TYPE).upper(),
+        "params": params,
+    }
+
+
+def _build_search_params(
+    index_params: dict[str, Any],
+    config: MilvusConfig,
+    *,
+    top_k: int,
+) -> dict[str, Any]:
+    key = _SEARCH_PARAM_KEYS.get(index_params["index_type"])
+    params: dict[str, Any] = {}
+    if key == "nprobe":
+        params["nprobe"] = config.search_nprobe or _DEFAULT_NPROBE
+    elif key == "ef":
+        # HNSW rejects ef values below the requested top_k.
+        params["ef"] = max(config.search_ef or _DEFAULT_EF, top_k)
+    elif key == "search_list":
+        params["search_list"] = max(config.search_list or _DEFAULT_SEARCH_LIST, top_k)
+    return {"metric_type": index_params["metric_type"], "params": params}
+
+
+def _normalise_index_param(value: Any) -> Any:
+    """Milvus may report build params as strings ("128"); parse them back."""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _parse_index_params(params: dict[str, Any]) -> dict[str, Any]:
+    build_params = params.get("params")
+    if build_params is None:
+        # Some servers (and `describe_index`) flatten the build params next to index_type.
+        build_params = {
+            key: value
+            for key, value in params.items()
+            if key not in _INDEX_DESCRIPTION_KEYS
+        }
+    elif isinstance(build_params, str):
+        build_params = json.loads(build_params)
+    return {
+        "index_type": str(params.get("index_type", "")).upper(),
+        "metric_type": str(params.get("metric_type", "")).upper(),
+        "params": {
+            key: _normalise_index_param(value) for key, value in build_params.items()
+        },
+    }
+
+
+def _existing_index_params(collection: Collection, *, field_name: str) -> Optional[dict[str, Any]]:
+    for index in getattr(collection, "indexes", None) or []:
+        if getattr(index, "field_name", None) != field_name:
+            continue
+        params = getattr(index, "params", None)
+        if not isinstance(params, dict):
+            return None
+        return _parse_index_params(params)
+    return None
+
+
+def _describe_index_mismatch(existing: dict[str, Any], expected: dict[str, Any]) -> Optional[str]:
+    differences = [
+        f"{key}={existing[key]!r} (config {expected[key]!r})"
+        for key in ("index_type", "metric_type")
+        if existing[key] != expected[key]
     ]
-    schema = CollectionSchema(fields, description="agent vectors")
-    return Collection(name, schema)
+    differences.extend(
+        f"params.{key}={existing['params'].get(key)!r} (config {value!r})"
+        for key, value in expected["params"].items()
+        if existing["params"].get(key) != _normalise_index_param(value)
+    )
+    if not differences:
+        return None
+    return "existing index differs from config: " + ", ".join(differences)
 
 
-def _ensure_index(collection: Collection, *, field_name: str) -> None:
+def _ensure_index(
+    collection: Collection,
+    *,
+    field_name: str,
+    index_params: dict[str, Any],
+) -> tuple[dict[str, Any], Optional[str]]:
+    """Return the index spec searches should use and a mismatch warning, if any."""
     has_index = None
     has_index_method = getattr(collection, "has_index", None)
     if callable(has_index_method):
         has_index = has_index_method()
     if has_index is True:
-        return
+        existing = _existing_index_params(collection, field_name=field_name)
+        if existing is None:
+            return index_params, None
+        return existing, _describe_index_mismatch(existing, index_params)
     create_index = getattr(collection, "create_index", None)
-    if not callable(create_index):
-        return
-    create_index(field_name, _DEFAULT_INDEX_PARAMS)
+    if callable(create_index):
+        create_index(field_name, index_params)
+    return index_params, None
+
+
+def _extract_write_ids(insert_result: Any) -> list[Any]:
+    if isinstance(insert_result, dict):
+        keys = insert_result.get("ids")
+    else:
+        keys = getattr(insert_result, "primary_keys", None)
+    return list(keys) if isinstance(keys, (list, tuple)) else []
+
+
+def _extract_write_id(insert_result: Any) -> Optional[Any]:
+    keys = _extract_write_ids(insert_result)
+    return keys[0] if keys else None
+
+
+def _success_result(
+    write_id: Optional[Any],
+    search_result: Any,
+    index_warning: Optional[str] = None,
+    output_fields: Optional[list[str]] = None,
+) -> dict[str, Any]:
+    query_result = _columnar_search_result(search_result, output_fields)
+    if query_result is None:
+        query_result = _serialize_search_result(search_result)
+    result = {
+        "status": "success",
+        "write_id": write_id,
+        "query_result": query_result,
+    }
+    if index_warning:
+        result["index_warning"] = index_warning
+    return result
+
+
+def _failed_result(exc: Exception) -> dict[str, Any]:
+    return {
+        "status": "failed",
+        "write_id": None,
+        "query_result": None,
+        "error": str(exc),
+    }
+
+
+def _as_vector_rows(vectors: Any) -> list[list[float]]:
+    """Accept a 2-D NumPy array or a sequence of equally sized vectors."""
+    ndim = getattr(vectors, "ndim", None)
+    if ndim is not None and ndim != 2:
+        raise ValueError("vectors must be a 2-D array")
+    rows = vectors.tolist() if hasattr(vectors, "tolist") else [
+        row.tolist() if hasattr(row, "tolist") else list(row) for row in vectors
+    ]
+    if not rows:
+        raise ValueError("vectors must not be empty")
+    dim = len(rows[0])
+    if dim == 0 or any(len(row) != dim for row in rows):
+        raise ValueError("vectors must all have the same non-zero dimension")
+    return rows
+
+
+def _chunk_rows(
+    rows: list[_T],
+    *,
+    dim: int,
+    max_batch_bytes: int,
+) -> Iterator[list[_T]]:
+    row_bytes = dim * _FLOAT_VECTOR_ITEM_BYTES
+    rows_per_chunk = max(1, max_batch_bytes // row_bytes)
+    for start in range(0, len(rows), rows_per_chunk):
+        yield rows[start:start + rows_per_chunk]
+
+
+def _insert_kwargs(config: MilvusConfig) -> dict[str, object]:
+    if config.partition:
+        return {"partition_name": config.partition}
+    return {}
+
+
+def _search_kwargs(config: MilvusConfig) -> dict[str, object]:
+    if config.partition:
+        return {"partition_names": [config.partition]}
+    return {}
+
+
+def _uses_local_backend(config: MilvusConfig) -> bool:
+    backend = (config.backend or "milvus").lower()
+    if backend not in _BACKENDS:
+        raise ValueError(f"MILVUS_BACKEND must be one of {', '.join(_BACKENDS)}")
+    return backend == "local"
+
+
+def _open_local_index(
+    config: MilvusConfig,
+    *,
+    top_k: int,
+) -> tuple[LocalVectorIndex, Optional[int]]:
+    """Return the in-process index for the collection and the nprobe to search with."""
+    name = _require_collection_name(config.collection)
+    index_params = _resolve_index_params(config)
+    nlist = None
+    if index_params["index_type"].startswith("IVF"):
+        nlist = index_params["params"].get("nlist")
+    index = get_local_index(
+        name,
+        metric_type=index_params["metric_type"],
+        nlist=nlist,
+        directory=config.local_path,
+    )
+    search_params = _build_search_params(index_params, config, top_k=top_k)
+    return index, search_params["params"].get("nprobe")
+
+
+def _dedupe_enabled(config: MilvusConfig, name: str, field_names: Iterable[str]) -> bool:
+    if config.dedupe is False:
+        return False
+    if _HASH_FIELD in field_names:
+        return True
+    # Collections created before the hash field existed are written as before.
+    key = (*_session_key(config), name)
+    if key not in _HASHLESS_COLLECTIONS:
+        _HASHLESS_COLLECTIONS.add(key)
+        logger.warning(
+            "milvus collection %s has no %s field; MILVUS_DEDUPE is ignored", name, _HASH_FIELD
+        )
+    return False
+
+
+def _schema_field_names(collection: Collection) -> list[str]:
+    fields = getattr(getattr(collection, "schema", None), "fields", None) or []
+    return [getattr(schema_field, "name", None) for schema_field in fields]
+
+
+def _collection_write_lock(session: _MilvusSession, name: str) -> threading.Lock:
+    with session.lock:
+        return session.write_locks.setdefault(name, threading.Lock())
+
+
+def _content_hash(vector: list[float], metadata: Optional[dict[str, Any]] = None) -> str:
+    digest = hashlib.sha256(np.asarray(vector, dtype=np.float32).tobytes())
+    if metadata:
+        digest.update(json.dumps(metadata, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _content_hash_cache_key(collection: Collection, config: MilvusConfig, content_hash: str) -> str:
+    return f"{collection.name}\0{config.partition or ''}\0{content_hash}"
+
+
+def _lookup_content_hashes(
+    session: _MilvusSession,
+    collection: Collection,
+    content_hashes: list[str],
+    *,
+    config: MilvusConfig,
+    consistency_level: str,
+) -> dict[str, Any]:
+    found: dict[str, Any] = {}
+    missing: list[str] = []
+    for content_hash in dict.fromkeys(content_hashes):
+        cached_id = session.content_hashes.get(
+            _content_hash_cache_key(collection, config, content_hash)
+        )
+        if cached_id is None:
+            missing.append(content_hash)
+        else:
+            found[content_hash] = cached_id
+    query_kwargs: dict[str, object] = {}
+    if config.partition:
+        query_kwargs["partition_names"] = [config.partition]
+    for start in range(0, len(missing), _HASH_LOOKUP_BATCH):
+        rows = collection.query(
+            expr=f"{_HASH_FIELD} in {json.dumps(missing[start:start + _HASH_LOOKUP_BATCH])}",
+            output_fields=[_HASH_FIELD],
+            consistency_level=consistency_level,
+            **query_kwargs,
+        )
+        for row in rows:
+            content_hash = row.get(_HASH_FIELD)
+            if content_hash and content_hash not in found:
+                found[content_hash] = row.get(_PRIMARY_FIELD)
+    for content_hash in missing:
+        if found.get(content_hash) is not None:
+            session.content_hashes.set(
+                _content_hash_cache_key(collection, config, content_hash),
+                found[content_hash],
+            )
+    return found
+
+
+def _insert_rows(
+    session: _MilvusSession,
+    collection: Collection,
+    rows: list[list[float]],
+    *,
+    config: MilvusConfig,
+    consistency_level: str,
+    metadata: Optional[dict[str, Any]] = None,
+    max_batch_bytes: int = _DEFAULT_MAX_BATCH_BYTES,
+) -> dict[str, Any]:
+    """Insert rows in byte-bounded chunks, skipping content already stored.
+
+    `write_ids` is aligned with `rows`; duplicates resolve to the existing id.
+    """
+    dim = len(rows[0])
+    if not _dedupe_enabled(config, collection.name, _schema_field_names(collection)):
+        write_ids: list[Any] = []
+        batches = 0
+        for chunk in _chunk_rows(rows, dim=dim, max_batch_bytes=max_batch_bytes):
+            insert_result = collection.insert(
+                [{_VECTOR_FIELD: row} for row in chunk],
+                **_insert_kwargs(config),
+            )
+            write_ids.extend(_extract_write_ids(insert_result))
+            batches += 1
+        return {"inserted": len(rows), "batches": batches, "write_ids": write_ids}
+
+    content_hashes = [_content_hash(row, metadata) for row in rows]
+    # Without the lock two writers could both miss the lookup and insert the
+    # same content; other processes can still race, so dedupe stays best effort.
+    with _collection_write_lock(session, collection.name):
+        known = _lookup_content_hashes(
+            session,
+            collection,
+            content_hashes,
+            config=config,
+            consistency_level=consistency_level,
+        )
+        pending: dict[str, list[float]] = {}
+        for row, content_hash in zip(rows, content_hashes):
+            if content_hash not in known and content_hash not in pending:
+                pending[content_hash] = row
+        batches = 0
+        for chunk in _chunk_rows(list(pending.items()), dim=dim, max_batch_bytes=max_batch_bytes):
+            insert_result = collection.insert(
+                [{_VECTOR_FIELD: row, _HASH_FIELD: content_hash} for content_hash, row in chunk],
+                **_insert_kwargs(config),
+            )
+            for (content_hash, _row), write_id in zip(chunk, _extract_write_ids(insert_result)):
+                known[content_hash] = write_id
+                session.content_hashes.set(
+                    _content_hash_cache_key(collection, config, content_hash), write_id
+                )
+            batches += 1
+    return {
+        "inserted": len(pending),
+        "batches": batches,
+        "write_ids": [known.get(content_hash) for content_hash in content_hashes],
+        "deduplicated": len(rows) - len(pending),
+    }
+
+
+def _run_local_node(
+    vector: list[float],
+    *,
+    config: MilvusConfig,
+    query_vector: Optional[list[float]],
+    top_k: int,
+) -> dict[str, Any]:
+    index, nprobe = _open_local_index(config, top_k=top_k)
+    write_ids = index.insert([vector])
+    ids, distances = index.search([query_vector or vector], top_k=top_k, nprobe=nprobe)
+    logger.info("milvus node succeeded")
+    return _success_result(write_ids[0], {"ids": ids, "distances": distances})
+
+
+def _open_collection(
+    config: MilvusConfig,
+    *,
+    dim: int,
+) -> tuple[_MilvusSession, Collection, str, dict[str, Any]]:
+    # Validate everything config-derived before touching the network.
+    _require_address(config)
+    consistency_level = _resolve_consistency_level(config)
+    index_params = _resolve_index_params(config)
+    session = _get_session(config)
+    collection = _ensure_collection(
+        session,
+        config.collection,
+        dim=dim,
+        consistency_level=consistency_level,
+        dedupe=config.dedupe is not False,
+    )
+    return session, collection, consistency_level, index_params
+
+
+def _ensure_searchable(
+    session: _MilvusSession,
+    collection: Collection,
+    index_params: dict[str, Any],
+) -> tuple[dict[str, Any], Optional[str]]:
+    with session.lock:
+        indexed = session.indexes.get(collection.name)
+        if indexed is None:
+            indexed = _ensure_index(
+                collection,
+                field_name=_VECTOR_FIELD,
+                index_params=index_params,
+            )
+            if indexed[1]:
+                logger.warning("milvus collection %s: %s", collection.name, indexed[1])
+            session.indexes[collection.name] = indexed
+        if collection.name not in session.loaded:
+            collection.load()
+            session.loaded.add(collection.name)
+        return indexed
+
+
+def _search_result_arrays(
+    search_result: Any,
+    output_fields: Optional[list[str]] = None,
+) -> dict[str, Any]:
+    arrays = _columnar_search_result(search_result, output_fields)
+    if arrays is not None:
+        return arrays
+    arrays = {
+        "ids": [[hit.id for hit in hits] for hits in search_result],
+        "distances": [[hit.distance for hit in hits] for hits in search_result],
+    }
+    if output_fields:
+        arrays["fields"] = {
+            name: [[_hit_field(hit, name) for hit in hits] for hits in search_result]
+            for name in output_fields
+        }
+    return arrays
+
+
+def _output_fields_kwargs(output_fields: Optional[list[str]]) -> dict[str, object]:
+    if output_fields:
+        return {"output_fields": list(output_fields)}
+    return {}
 
 
 def run_milvus_node(
@@ -79,61 +829,434 @@ def run_milvus_node(
     config: MilvusConfig,
     query_vector: Optional[list[float]] = None,
     top_k: int = 3,
+    output_fields: Optional[list[str]] = None,
+    metadata: Optional[dict[str, Any]] = None,
 ) -> dict[str, Any]:
     logger.info("milvus node started")
     try:
-        if not config.host or config.port is None:
-            raise ValueError("MILVUS_HOST and MILVUS_PORT are required")
-        connections.connect(
-            alias="default",
-            host=config.host,
-            port=config.port,
-            user=config.username,
-            password=config.password,
-            db_name=config.db_name,
-            timeout=_CONNECT_TIMEOUT_SECONDS,
-        )
-        collection = _ensure_collection(config.collection, dim=len(vector))
-
-        insert_kwargs: dict[str, object] = {}
-        if config.partition:
-            insert_kwargs["partition_name"] = config.partition
-
-        insert_result = collection.insert([{"embedding": vector}], **insert_kwargs)
-        collection.flush()
-        _ensure_index(collection, field_name="embedding")
-        collection.load()
-
-        search_vector = query_vector or vector
-        search_kwargs: dict[str, object] = {}
-        if config.partition:
-            search_kwargs["partition_names"] = [config.partition]
+        if _uses_local_backend(config):
+            return _run_local_node(
+                vector, config=config, query_vector=query_vector, top_k=top_k
+            )
+        session, collection, consistency_level, index_params = _open_collection(
+            config, dim=len(vector)
+        )
+
+        written = _insert_rows(
+            session,
+            collection,
+            [vector],
+            config=config,
+            consistency_level=consistency_level,
+            metadata=metadata,
+        )
+        if config.flush_on_write and written["inserted"]:
+            collection.flush()
+        index_params, index_warning = _ensure_searchable(session, collection, index_params)
 
         search_result = collection.search(
-            data=[search_vector],
-            anns_field="embedding",
-            param={"metric_type": "L2", "params": {"nprobe": 10}},
+            data=[query_vector or vector],
+            anns_field=_VECTOR_FIELD,
+            param=_build_search_params(index_params, config, top_k=top_k),
             limit=top_k,
-            **search_kwargs,
+            consistency_level=consistency_level,
+            **_search_kwargs(config),
+            **_output_fields_kwargs(output_fields),
         )
 
-        write_id = None
-        if hasattr(insert_result, "primary_keys"):
-            keys = insert_result.primary_keys
-            if isinstance(keys, (list, tuple)) and keys:
-                write_id = keys[0]
-
         logger.info("milvus node succeeded")
-        return {
-            "status": "success",
-            "write_id": write_id,
-            "query_result": _serialize_search_result(search_result),
-        }
+        result = _success_result(
+            written["write_ids"][0] if written["write_ids"] else None,
+            search_result,
+            index_warning,
+            output_fields,
+        )
+        if "deduplicated" in written:
+            result["deduplicated"] = written["deduplicated"] > 0
+        return result
     except Exception as exc:  # noqa: BLE001 - want node to surface errors as data.
         logger.exception("milvus node failed")
+        _handle_session_error(config, exc)
+        return _failed_result(exc)
+
+
+def run_milvus_batch_insert(
+    vectors: Any,
+    *,
+    config: MilvusConfig,
+    max_batch_bytes: int = _DEFAULT_MAX_BATCH_BYTES,
+) -> dict[str, Any]:
+    logger.info("milvus batch insert started")
+    try:
+        rows = _as_vector_rows(vectors)
+        if _uses_local_backend(config):
+            index, _nprobe = _open_local_index(config, top_k=1)
+            write_ids = index.insert(rows)
+            logger.info("milvus batch insert succeeded")
+            return {
+                "status": "success",
+                "inserted": len(rows),
+                "batches": 1,
+                "write_ids": write_ids,
+            }
+        session, collection, consistency_level, _index = _open_collection(
+            config, dim=len(rows[0])
+        )
+        written = _insert_rows(
+            session,
+            collection,
+            rows,
+            config=config,
+            consistency_level=consistency_level,
+            max_batch_bytes=max_batch_bytes,
+        )
+        if config.flush_on_write and written["inserted"]:
+            collection.flush()
+        logger.info("milvus batch insert succeeded")
+        return {"status": "success", **written}
+    except Exception as exc:  # noqa: BLE001 - want node to surface errors as data.
+        logger.exception("milvus batch insert failed")
+        _handle_session_error(config, exc)
         return {
             "status": "failed",
-            "write_id": None,
-            "query_result": None,
+            "inserted": 0,
+            "batches": 0,
+            "write_ids": [],
             "error": str(exc),
         }
+
+
+def run_milvus_batch_search(
+    query_vectors: Any,
+    *,
+    config: MilvusConfig,
+    top_k: int = 3,
+    max_batch_bytes: int = _DEFAULT_MAX_BATCH_BYTES,
+    output_fields: Optional[list[str]] = None,
+) -> dict[str, Any]:
+    logger.info("milvus batch search started")
+    try:
+        rows = _as_vector_rows(query_vectors)
+        if _uses_local_backend(config):
+            index, nprobe = _open_local_index(config, top_k=top_k)
+            ids, distances = index.search(rows, top_k=top_k, nprobe=nprobe)
+            logger.info("milvus batch search succeeded")
+            return {"status": "success", "ids": ids, "distances": distances}
+        session, collection, consistency_level, index_params = _open_collection(
+            config, dim=len(rows[0])
+        )
+        index_params, index_warning = _ensure_searchable(session, collection, index_params)
+        search_params = _build_search_params(index_params, config, top_k=top_k)
+        ids: list[list[Any]] = []
+        distances: list[list[Any]] = []
+        fields: dict[str, list[list[Any]]] = {name: [] for name in output_fields or []}
+        # Normally one call; only very large query sets are split.
+        for chunk in _chunk_rows(rows, dim=len(rows[0]), max_batch_bytes=max_batch_bytes):
+            search_result = collection.search(
+                data=chunk,
+                anns_field=_VECTOR_FIELD,
+                param=search_params,
+                limit=top_k,
+                consistency_level=consistency_level,
+                **_search_kwargs(config),
+                **_output_fields_kwargs(output_fields),
+            )
+            arrays = _search_result_arrays(search_result, output_fields)
+            ids.extend(arrays["ids"])
+            distances.extend(arrays["distances"])
+            for name, values in arrays.get("fields", {}).items():
+                fields[name].extend(values)
+        logger.info("milvus batch search succeeded")
+        result: dict[str, Any] = {"status": "success", "ids": ids, "distances": distances}
+        if fields:
+            result["fields"] = fields
+        if index_warning:
+            result["index_warning"] = index_warning
+        return result
+    except Exception as exc:  # noqa: BLE001 - want node to surface errors as data.
+        logger.exception("milvus batch search failed")
+        _handle_session_error(config, exc)
+        return {"status": "failed", "ids": None, "distances": None, "error": str(exc)}
+
+
+def _connect_async(config: MilvusConfig) -> AsyncMilvusClient:
+    return AsyncMilvusClient(
+        uri=f"http://{config.host}:{config.port}",
+        user=config.username or "",
+        password=config.password or "",
+        db_name=config.db_name or "",
+        timeout=_CONNECT_TIMEOUT_SECONDS,
+    )
+
+
+async def _ais_healthy(session: _AsyncMilvusSession) -> bool:
+    try:
+        await session.client.get_server_version()
+    except Exception:  # noqa: BLE001 - any RPC error means the channel is unusable.
+        logger.warning("milvus async health check failed, reconnecting")
+        return False
+    return True
+
+
+async def _close_on_loop_shutdown() -> AsyncGenerator[None, None]:
+    try:
+        yield
+    finally:
+        await aclose_milvus_clients()
+
+
+async def _aget_session(config: MilvusConfig) -> _AsyncMilvusSession:
+    loop = asyncio.get_running_loop()
+    key = (loop, _session_key(config))
+    with _SESSIONS_LOCK:
+        session = _ASYNC_SESSIONS.get(key)
+    now = time.monotonic()
+    if session is not None and now - session.checked_at >= _health_check_interval(config):
+        # Mark it checked first so concurrent callers on this loop do not all probe.
+        session.checked_at = now
+        if not await _ais_healthy(session):
+            with _SESSIONS_LOCK:
+                if _ASYNC_SESSIONS.get(key) is session:
+                    del _ASYNC_SESSIONS[key]
+            await _aclose_client(session.client)
+        with _SESSIONS_LOCK:
+            session = _ASYNC_SESSIONS.get(key)
+    finalizer = None
+    if session is None:
+        with _SESSIONS_LOCK:
+            # Sessions of closed loops can no longer be used or closed; forget
+            # them so repeated `asyncio.run` calls do not pile up clients.
+            for stale in [stale for stale in _ASYNC_SESSIONS if stale[0].is_closed()]:
+                del _ASYNC_SESSIONS[stale]
+            for stale in [stale for stale in _LOOP_FINALIZERS if stale.is_closed()]:
+                del _LOOP_FINALIZERS[stale]
+            session = _AsyncMilvusSession(client=_connect_async(config), checked_at=now)
+            _ASYNC_SESSIONS[key] = session
+            if loop not in _LOOP_FINALIZERS:
+                finalizer = _close_on_loop_shutdown()
+                _LOOP_FINALIZERS[loop] = finalizer
+    if finalizer is not None:
+        await finalizer.__anext__()
+    return session
+
+
+async def _aclose_client(client: AsyncMilvusClient) -> None:
+    try:
+        await client.close()
+    except Exception:  # noqa: BLE001 - the channel may already be gone.
+        logger.debug("milvus async client close failed", exc_info=True)
+
+
+async def aclose_milvus_clients() -> None:
+    """Close the pooled async clients owned by the running loop."""
+    loop = asyncio.get_running_loop()
+    with _SESSIONS_LOCK:
+        owned = [key for key in _ASYNC_SESSIONS if key[0] is loop]
+        sessions = [_ASYNC_SESSIONS.pop(key) for key in owned]
+    for session in sessions:
+        await _aclose_client(session.client)
+
+
+def _handle_async_session_error(config: MilvusConfig, exc: Exception) -> None:
+    """Same policy as `_handle_session_error`, for the running loop's session."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    with _SESSIONS_LOCK:
+        session = _ASYNC_SESSIONS.get((loop, _session_key(config)))
+    if session is None:
+        return
+    if isinstance(exc, _CONNECTION_ERRORS):
+        session.checked_at = 0.0
+    elif isinstance(exc, MilvusException) and config.collection:
+        session.field_names.pop(config.collection, None)
+        session.indexes.pop(config.collection, None)
+        session.loaded.discard(config.collection)
+
+
+async def _aensure_collection(
+    session: _AsyncMilvusSession,
+    name: Optional[str],
+    *,
+    dim: int,
+    consistency_level: str,
+    dedupe: bool,
+) -> tuple[str, list[str]]:
+    """Return the collection name and its schema field names."""
+    name = _require_collection_name(name)
+    field_names = session.field_names.get(name)
+    if field_names is not None:
+        return name, field_names
+    async with session.lock:
+        field_names = session.field_names.get(name)
+        if field_names is not None:
+            return name, field_names
+        client = session.client
+        if not await client.has_collection(name):
+            await client.create_collection(
+                name,
+                schema=_build_schema(dim=dim, dedupe=dedupe),
+                consistency_level=consistency_level,
+            )
+        description = await client.describe_collection(name)
+        field_names = [
+            schema_field.get("name") for schema_field in description.get("fields") or []
+        ]
+        session.field_names[name] = field_names
+    return name, field_names
+
+
+async def _aensure_index(
+    client: AsyncMilvusClient,
+    name: str,
+    *,
+    field_name: str,
+    index_params: dict[str, Any],
+) -> tuple[dict[str, Any], Optional[str]]:
+    """Async counterpart of `_ensure_index`."""
+    index_names = await client.list_indexes(name, field_name=field_name)
+    if index_names:
+        description = await client.describe_index(name, index_names[0])
+        if not isinstance(description, dict) or not description.get("index_type"):
+            return index_params, None
+        existing = _parse_index_params(description)
+        return existing, _describe_index_mismatch(existing, index_params)
+    prepared = client.prepare_index_params()
+    prepared.add_index(field_name=field_name, **index_params)
+    await client.create_index(name, prepared)
+    return index_params, None
+
+
+async def _aensure_searchable(
+    session: _AsyncMilvusSession,
+    name: str,
+    index_params: dict[str, Any],
+) -> tuple[dict[str, Any], Optional[str]]:
+    indexed = session.indexes.get(name)
+    if indexed is not None and name in session.loaded:
+        return indexed
+    async with session.lock:
+        indexed = session.indexes.get(name)
+        if indexed is None:
+            indexed = await _aensure_index(
+                session.client,
+                name,
+                field_name=_VECTOR_FIELD,
+                index_params=index_params,
+            )
+            if indexed[1]:
+                logger.warning("milvus collection %s: %s", name, indexed[1])
+            session.indexes[name] = indexed
+        if name not in session.loaded:
+            await session.client.load_collection(name)
+            session.loaded.add(name)
+        return indexed
+
+
+async def _ainsert_row(
+    session: _AsyncMilvusSession,
+    name: str,
+    vector: list[float],
+    *,
+    field_names: list[str],
+    config: MilvusConfig,
+    consistency_level: str,
+    metadata: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """Insert one row unless a row with the same content hash already exists."""
+    client = session.client
+    partition_name = config.partition or ""
+    if not _dedupe_enabled(config, name, field_names):
+        insert_result = await client.insert(
+            name, [{_VECTOR_FIELD: vector}], partition_name=partition_name
+        )
+        return {"inserted": 1, "write_id": _extract_write_id(insert_result)}
+    content_hash = _content_hash(vector, metadata)
+    async with session.write_locks.setdefault(name, asyncio.Lock()):
+        rows = await client.query(
+            name,
+            filter=f"{_HASH_FIELD} in {json.dumps([content_hash])}",
+            output_fields=[_HASH_FIELD],
+            partition_names=[config.partition] if config.partition else None,
+            consistency_level=consistency_level,
+        )
+        if rows:
+            return {
+                "inserted": 0,
+                "write_id": rows[0].get(_PRIMARY_FIELD),
+                "deduplicated": True,
+            }
+        insert_result = await client.insert(
+            name,
+            [{_VECTOR_FIELD: vector, _HASH_FIELD: content_hash}],
+            partition_name=partition_name,
+        )
+    return {
+        "inserted": 1,
+        "write_id": _extract_write_id(insert_result),
+        "deduplicated": False,
+    }
+
+
+async def arun_milvus_node(
+    vector: list[float],
+    *,
+    config: MilvusConfig,
+    query_vector: Optional[list[float]] = None,
+    top_k: int = 3,
+    output_fields: Optional[list[str]] = None,
+    metadata: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    logger.info("milvus node started")
+    try:
+        if _uses_local_backend(config):
+            return _run_local_node(
+                vector, config=config, query_vector=query_vector, top_k=top_k
+            )
+        _require_address(config)
+        consistency_level = _resolve_consistency_level(config)
+        index_params = _resolve_index_params(config)
+        session = await _aget_session(config)
+        name, field_names = await _aensure_collection(
+            session,
+            config.collection,
+            dim=len(vector),
+            consistency_level=consistency_level,
+            dedupe=config.dedupe is not False,
+        )
+        written = await _ainsert_row(
+            session,
+            name,
+            vector,
+            field_names=field_names,
+            config=config,
+            consistency_level=consistency_level,
+            metadata=metadata,
+        )
+        if config.flush_on_write and written["inserted"]:
+            await session.client.flush(name)
+        index_params, index_warning = await _aensure_searchable(session, name, index_params)
+
+        search_result = await session.client.search(
+            name,
+            data=[query_vector or vector],
+            anns_field=_VECTOR_FIELD,
+            search_params=_build_search_params(index_params, config, top_k=top_k),
+            limit=top_k,
+            partition_names=[config.partition] if config.partition else None,
+            consistency_level=consistency_level,
+            **_output_fields_kwargs(output_fields),
+        )
+
+        logger.info("milvus node succeeded")
+        result = _success_result(
+            written["write_id"], search_result, index_warning, output_fields
+        )
+        if "deduplicated" in written:
+            result["deduplicated"] = written["deduplicated"]
+        return result
+    except Exception as exc:  # noqa: BLE001 - want node to surface errors as data.
+        logger.exception("milvus node failed")
+        _handle_async_session_error(config, exc)
+        return _failed_result(exc)
@@ -0,0 +1,279 @@
+"""In-process vector index used by the Milvus node when MILVUS_BACKEND=local."""
+from __future__ import annotations
+
+import atexit
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+
+_METRICS = ("L2", "IP", "COSINE")
+_KMEANS_ITERATIONS = 10
+# Retrain IVF centroids once the store has grown this much since training.
+_RETRAIN_GROWTH_FACTOR = 2
+_MIN_CAPACITY = 64
+# Rows inserted before the store is rewritten to disk; `flush()` writes the rest.
+_PERSIST_BATCH_ROWS = 1024
+_INDEXES: dict[tuple[Optional[str], str], "LocalVectorIndex"] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _save_array(path: Path, array: np.ndarray) -> None:
+    # Write to a sibling file first so readers never see a half-written array.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".npy.tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            np.save(handle, array)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def _append(buffer: Optional[np.ndarray], size: int, rows: np.ndarray) -> np.ndarray:
+    """Write `rows` after the first `size` entries, doubling the buffer when full."""
+    needed = size + rows.shape[0]
+    if buffer is None or buffer.shape[0] < needed or not buffer.flags.writeable:
+        grown = np.empty((max(needed, 2 * size, _MIN_CAPACITY), *rows.shape[1:]), rows.dtype)
+        if size:
+            grown[:size] = buffer[:size]
+        buffer = grown
+    buffer[size:needed] = rows
+    return buffer
+
+
+class LocalVectorIndex:
+    """NumPy vector store with brute-force or IVF search.
+
+    Distances follow Milvus: squared euclidean distance for L2 (smaller is
+    closer), raw similarity for IP and COSINE (larger is closer).
+    """
+
+    def __init__(
+        self,
+        *,
+        metric_type: str = "L2",
+        nlist: Optional[int] = None,
+        path: Optional[str] = None,
+    ) -> None:
+        metric_type = metric_type.upper()
+        if metric_type not in _METRICS:
+            raise ValueError(f"local backend metric must be one of {', '.join(_METRICS)}")
+        self.metric_type = metric_type
+        self.nlist = nlist
+        self._path = Path(path) if path else None
+        self._lock = threading.Lock()
+        # Rows live in the first `_size` entries of buffers with spare capacity.
+        self._vector_buffer: Optional[np.ndarray] = None
+        self._id_buffer = np.empty(0, dtype=np.int64)
+        self._assignment_buffer = np.empty(0, dtype=np.int64)
+        self._size = 0
+        self._next_id = 0
+        self._unsaved = 0
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_size = 0
+        if self._path is not None and self._vectors_path.exists():
+            # Memory-map so opening a large store does not read it eagerly.
+            self._vector_buffer = np.load(self._vectors_path, mmap_mode="r")
+            self._id_buffer = np.load(self._ids_path)
+            self._size = int(self._id_buffer.shape[0])
+            self._next_id = int(self._id_buffer.max()) + 1 if self._size else 0
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self._path.with_suffix(".npy")
+
+    @property
+    def _ids_path(self) -> Path:
+        return self._path.with_suffix(".ids.npy")
+
+    @property
+    def _vectors(self) -> Optional[np.ndarray]:
+        if self._vector_buffer is None:
+            return None
+        return self._vector_buffer[:self._size]
+
+    @property
+    def _ids(self) -> np.ndarray:
+        return self._id_buffer[:self._size]
+
+    @property
+    def _assignments(self) -> np.ndarray:
+        return self._assignment_buffer[:self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, vectors: Any) -> list[int]:
+        rows = np.asarray(vectors, dtype=np.float32)
+        if rows.ndim != 2 or rows.shape[0] == 0:
+            raise ValueError("vectors must be a non-empty 2-D array")
+        with self._lock:
+            if self._vectors is not None and self._vectors.shape[1] != rows.shape[1]:
+                raise ValueError(
+                    f"vector dimension {rows.shape[1]} does not match "
+                    f"index dimension {self._vectors.shape[1]}"
+                )
+            new_ids = np.arange(self._next_id, self._next_id + rows.shape[0], dtype=np.int64)
+            self._vector_buffer = _append(self._vector_buffer, self._size, rows)
+            self._id_buffer = _append(self._id_buffer, self._size, new_ids)
+            if self._centroids is not None:
+                self._assignment_buffer = _append(
+                    self._assignment_buffer, self._size, self._nearest_centroids(rows, 1)[:, 0]
+                )
+            self._size += rows.shape[0]
+            self._next_id += rows.shape[0]
+            self._unsaved += rows.shape[0]
+            if self._unsaved >= _PERSIST_BATCH_ROWS:
+                self._persist()
+            return new_ids.tolist()
+
+    def flush(self) -> None:
+        """Write rows inserted since the last save to disk."""
+        with self._lock:
+            self._persist()
+
+    def _persist(self) -> None:
+        if self._path is None or not self._unsaved:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        _save_array(self._vectors_path, self._vectors)
+        _save_array(self._ids_path, self._ids)
+        self._unsaved = 0
+
+    def search(
+        self,
+        queries: Any,
+        *,
+        top_k: int,
+        nprobe: Optional[int] = None,
+    ) -> tuple[list[list[int]], list[list[float]]]:
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim != 2:
+            raise ValueError("queries must be a 2-D array")
+        with self._lock:
+            if self._vectors is None or not len(self):
+                return [[] for _ in range(queries.shape[0])], [[] for _ in range(queries.shape[0])]
+            vectors = np.asarray(self._vectors)
+            if self.nlist and nprobe:
+                self._maybe_train(vectors)
+            ids: list[list[int]] = []
+            distances: list[list[float]] = []
+            for query in queries:
+                candidates = self._candidates(query, nprobe)
+                scores = self._score(vectors[candidates], query[np.newaxis, :])[0]
+                hit_ids, hit_distances = self._top_k(candidates, scores, top_k)
+                ids.append(hit_ids)
+                distances.append(hit_distances)
+            return ids, distances
+
+    def _candidates(self, query: np.ndarray, nprobe: Optional[int]) -> np.ndarray:
+        if self._centroids is None or not nprobe:
+            return np.arange(len(self))
+        probes = self._nearest_centroids(query[np.newaxis, :], nprobe)[0]
+        return np.flatnonzero(np.isin(self._assignments, probes))
+
+    def _top_k(
+        self,
+        candidates: np.ndarray,
+        scores: np.ndarray,
+        top_k: int,
+    ) -> tuple[list[int], list[float]]:
+        if candidates.size == 0:
+            return [], []
+        # Order so that the best match comes first for every metric.
+        keys = scores if self.metric_type == "L2" else -scores
+        limit = min(top_k, candidates.size)
+        best = np.argpartition(keys, limit - 1)[:limit]
+        best = best[np.argsort(keys[best])]
+        return self._ids[candidates[best]].tolist(), scores[best].astype(float).tolist()
+
+    def _score(self, vectors: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        if self.metric_type == "L2":
+            return self._score_l2(queries, vectors)
+        if self.metric_type == "COSINE":
+            vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        return queries @ vectors.T
+
+    def _nearest_centroids(self, rows: np.ndarray, count: int) -> np.ndarray:
+        distances = self._score_l2(rows, self._centroids)
+        count = min(count, self._centroids.shape[0])
+        return np.argsort(distances, axis=1)[:, :count]
+
+    @staticmethod
+    def _score_l2(rows: np.ndarray, others: np.ndarray) -> np.ndarray:
+        distances = (
+            (rows ** 2).sum(axis=1)[:, np.newaxis]
+            - 2 * rows @ others.T
+            + (others ** 2).sum(axis=1)[np.newaxis, :]
+        )
+        # The expansion can dip just below zero through rounding.
+        return np.maximum(distances, 0)
+
+    def _maybe_train(self, vectors: np.ndarray) -> None:
+        size = vectors.shape[0]
+        if size < self.nlist:
+            # Too few vectors to populate every list; search stays exhaustive.
+            self._centroids = None
+            return
+        if self._centroids is not None and size < self._trained_size * _RETRAIN_GROWTH_FACTOR:
+            return
+        rng = np.random.default_rng(0)
+        centroids = vectors[rng.choice(size, self.nlist, replace=False)].copy()
+        for _ in range(_KMEANS_ITERATIONS):
+            assignments = np.argmin(self._score_l2(vectors, centroids), axis=1)
+            for list_id in range(self.nlist):
+                members = vectors[assignments == list_id]
+                if members.size:
+                    centroids[list_id] = members.mean(axis=0)
+        self._centroids = centroids
+        self._assignment_buffer = np.argmin(self._score_l2(vectors, centroids), axis=1)
+        self._trained_size = size
+
+
+def get_local_index(
+    collection: str,
+    *,
+    metric_type: str,
+    nlist: Optional[int],
+    directory: Optional[str],
+) -> LocalVectorIndex:
+    key = (directory, collection)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            path = str(Path(directory) / collection) if directory else None
+            index = LocalVectorIndex(metric_type=metric_type, nlist=nlist, path=path)
+            _INDEXES[key] = index
+        elif (index.metric_type, index.nlist) != (metric_type.upper(), nlist):
+            # Both would share one store on disk, so a second index cannot coexist.
+            raise ValueError(
+                f"local index {collection!r} is open with metric {index.metric_type} "
+                f"and nlist {index.nlist}, not {metric_type.upper()} and {nlist}"
+            )
+        return index
+
+
+def flush_local_indexes() -> None:
+    with _INDEXES_LOCK:
+        indexes = list(_INDEXES.values())
+    for index in indexes:
+        index.flush()
+
+
+def clear_local_indexes() -> None:
+    with _INDEXES_LOCK:
+        indexes = list(_INDEXES.values())
+        _INDEXES.clear()
+    for index in indexes:
+        index.flush()
+
+
+atexit.register(flush_local_indexes)
@@ -11,6 +11,7 @@ from app.config import LangfuseConfig
 
 logger = logging.getLogger(__name__)
 _LANGFUSE_TRACE: ContextVar[Optional[object]] = ContextVar("langfuse_trace", default=None)
+LANGFUSE_TRACE_CONFIG_KEY = "langfuse_trace"
 
 
 def _merge_metadata(env: Optional[str], metadata: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
@@ -164,6 +165,15 @@ def extract_thread_id(config: Optional[dict[str, Any]]) -> str:
     return "default"
 
 
+def extract_langfuse_trace(config: Optional[dict[str, Any]]) -> Optional[object]:
+    if not config:
+        return None
+    configurable = config.get("configurable")
+    if isinstance(configurable, dict):
+        return configurable.get(LANGFUSE_TRACE_CONFIG_KEY)
+    return None
+
+
 def ensure_langfuse_trace(
     *,
     config: LangfuseConfig,
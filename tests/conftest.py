@@ -1,7 +1,34 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
+
+# Process-wide caches that must not leak between tests. Modules are only reset
+# when already imported so collection does not pull in optional dependencies.
+_PROCESS_STATE_RESETTERS = (
+    ("app.graph", "clear_graph_cache"),
+    ("app.nodes.llm", "close_llm_clients"),
+    ("app.nodes.llm", "close_llm_response_caches"),
+    ("app.nodes.mem0", "close_mem0_workers"),
+    ("app.nodes.mem0", "close_mem0_sessions"),
+    ("app.nodes.mem0", "clear_mem0_search_caches"),
+    ("app.nodes.mcp", "close_mcp_jsonrpc_sessions"),
+    ("app.nodes.mcp", "close_mcp_tool_caches"),
+    ("app.nodes.mcp_pool", "close_mcp_sessions"),
+    ("app.nodes.milvus", "close_milvus_sessions"),
+    ("app.nodes.milvus_local", "clear_local_indexes"),
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_state():
+    for module_name, func_name in _PROCESS_STATE_RESETTERS:
+        reset = getattr(sys.modules.get(module_name), func_name, None)
+        if callable(reset):
+            reset()
+    yield
@@ -0,0 +1,27 @@
+import hashlib
+
+import pytest
+
+from app.blobs import BlobStore
+
+
+def test_blob_store_round_trips_by_digest(tmp_path):
+    store = BlobStore(str(tmp_path))
+
+    digest = store.put(b"payload")
+
+    assert digest == hashlib.sha256(b"payload").hexdigest()
+    assert (tmp_path / digest[:2] / digest[2:]).read_bytes() == b"payload"
+    assert store.put(b"payload") == digest
+    assert store.get(digest) == b"payload"
+
+
+def test_blob_store_rejects_bad_digests_and_corrupt_blobs(tmp_path):
+    store = BlobStore(str(tmp_path))
+    digest = store.put(b"payload")
+    (tmp_path / digest[:2] / digest[2:]).write_bytes(b"tampered")
+
+    with pytest.raises(ValueError, match="corrupt"):
+        store.get(digest)
+    with pytest.raises(ValueError, match="Invalid blob digest"):
+        store.get("../../etc/passwd")
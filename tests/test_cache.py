@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from app.cache import MemoryCache, SqliteCache, TieredCache, make_cache_key
+
+
+def test_make_cache_key_is_order_insensitive_for_dicts():
+    assert make_cache_key({"a": 1, "b": 2}) == make_cache_key({"b": 2, "a": 1})
+    assert make_cache_key("model", [1]) != make_cache_key("model", [2])
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats() == {"hits": 3, "misses": 1, "entries": 2}
+
+
+def test_memory_cache_ttl_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: now[0])
+    cache = MemoryCache(ttl_seconds=10)
+    cache.set("a", "value")
+
+    now[0] = 105.0
+    assert cache.get("a") == "value"
+    now[0] = 111.0
+    assert cache.get("a") is None
+
+
+def test_memory_cache_ignores_none():
+    cache = MemoryCache()
+    cache.set("a", None)
+
+    assert len(cache) == 0
+
+
+def test_sqlite_cache_persists_and_evicts(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SqliteCache(path, max_entries=2)
+    cache.set("a", {"text": "one"})
+    time.sleep(0.01)
+    cache.set("b", {"text": "two"})
+    time.sleep(0.01)
+    cache.set("c", {"text": "three"})
+    cache.close()
+
+    reopened = SqliteCache(path, max_entries=2)
+    assert reopened.get("a") is None
+    assert reopened.get("b") == {"text": "two"}
+    assert reopened.get("c") == {"text": "three"}
+    assert len(reopened) == 2
+    reopened.close()
+
+
+def test_sqlite_cache_ttl_expires(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.time.time", lambda: now[0])
+    cache = SqliteCache(str(tmp_path / "cache.sqlite"), ttl_seconds=5)
+    cache.set("a", "value")
+
+    now[0] = 1006.0
+    assert cache.get("a") is None
+    cache.close()
+
+
+def test_sqlite_cache_rejects_invalid_table(tmp_path):
+    with pytest.raises(ValueError):
+        SqliteCache(str(tmp_path / "cache.sqlite"), table="bad; DROP")
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    disk = SqliteCache(str(tmp_path / "cache.sqlite"))
+    disk.set("a", "value")
+    cache = TieredCache(MemoryCache(), disk)
+
+    assert cache.get("a") == "value"
+    assert cache.memory.get("a") == "value"
+    assert cache.get("missing") is None
+    assert cache.stats() == {"hits": 1, "misses": 1}
+    cache.close()
+
+
+def test_tiered_cache_promotion_keeps_remaining_disk_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.time.time", lambda: now[0])
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: now[0])
+    disk = SqliteCache(str(tmp_path / "cache.sqlite"), ttl_seconds=10)
+    disk.set("a", "value")
+    cache = TieredCache(MemoryCache(ttl_seconds=60), disk)
+
+    now[0] = 1008.0
+    assert cache.get("a") == "value"
+    now[0] = 1009.0
+    assert cache.memory.get("a") == "value"
+    now[0] = 1011.0
+    assert cache.memory.get("a") is None
+    assert cache.get("a") is None
+    cache.close()
@@ -21,6 +21,8 @@ def test_load_config_reads_env(monkeypatch):
     monkeypatch.setenv("LLM_MODEL", "gpt-test")
     monkeypatch.setenv("LLM_TIMEOUT", "45")
     monkeypatch.setenv("LLM_TEMPERATURE", "0.2")
+    monkeypatch.setenv("LLM_MAX_CONNECTIONS", "16")
+    monkeypatch.setenv("LLM_KEEPALIVE_EXPIRY", "30")
 
     monkeypatch.setenv("LANGFUSE_PUBLIC_KEY", "lf_pub")
     monkeypatch.setenv("LANGFUSE_SECRET_KEY", "lf_sec")
@@ -56,6 +58,8 @@ def test_load_config_reads_env(monkeypatch):
     assert config.llm.model == "gpt-test"
     assert config.llm.timeout == 45
     assert config.llm.temperature == 0.2
+    assert config.llm.max_connections == 16
+    assert config.llm.keepalive_expiry == 30.0
 
     assert config.langfuse.public_key == "lf_pub"
     assert config.langfuse.secret_key == "lf_sec"
@@ -86,3 +90,189 @@ def test_parse_args_handles_none():
     from app import config as config_module
 
     assert config_module._parse_args(None) == []
+
+
+def test_load_config_graph_topology(monkeypatch):
+    monkeypatch.setenv("GRAPH_TOPOLOGY", "parallel")
+
+    config = load_config()
+
+    assert config.graph.topology == "parallel"
+
+
+def test_load_config_llm_cache(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE", "true")
+    monkeypatch.setenv("LLM_CACHE_PATH", "/tmp/llm-cache.sqlite")
+    monkeypatch.setenv("LLM_CACHE_TTL", "600")
+    monkeypatch.setenv("LLM_CACHE_MAX_ENTRIES", "500")
+
+    config = load_config()
+
+    assert config.llm.cache_enabled is True
+    assert config.llm.cache_path == "/tmp/llm-cache.sqlite"
+    assert config.llm.cache_ttl == 600.0
+    assert config.llm.cache_max_entries == 500
+
+
+def test_get_env_invalid_bool(monkeypatch):
+    from app import config as config_module
+
+    monkeypatch.setenv("BAD_BOOL", "maybe")
+
+    with pytest.raises(ValueError):
+        config_module._get_env("BAD_BOOL", cast=config_module._parse_bool)
+
+
+def test_load_config_llm_stream(monkeypatch):
+    monkeypatch.setenv("LLM_STREAM", "1")
+
+    config = load_config()
+
+    assert config.llm.stream is True
+
+
+def test_load_config_milvus_health_check_interval(monkeypatch):
+    monkeypatch.setenv("MILVUS_HEALTH_CHECK_INTERVAL", "15")
+
+    config = load_config()
+
+    assert config.milvus.health_check_interval == 15.0
+
+
+def test_load_config_milvus_consistency(monkeypatch):
+    monkeypatch.setenv("MILVUS_CONSISTENCY_LEVEL", "Bounded")
+    monkeypatch.setenv("MILVUS_FLUSH_ON_WRITE", "yes")
+
+    config = load_config()
+
+    assert config.milvus.consistency_level == "Bounded"
+    assert config.milvus.flush_on_write is True
+
+
+def test_load_config_milvus_index(monkeypatch):
+    monkeypatch.setenv("MILVUS_INDEX_TYPE", "HNSW")
+    monkeypatch.setenv("MILVUS_METRIC_TYPE", "COSINE")
+    monkeypatch.setenv("MILVUS_INDEX_PARAMS", '{"M": 32, "efConstruction": 256}')
+    monkeypatch.setenv("MILVUS_SEARCH_NPROBE", "16")
+    monkeypatch.setenv("MILVUS_SEARCH_EF", "128")
+    monkeypatch.setenv("MILVUS_SEARCH_LIST", "200")
+
+    config = load_config()
+
+    assert config.milvus.index_type == "HNSW"
+    assert config.milvus.metric_type == "COSINE"
+    assert config.milvus.index_params == {"M": 32, "efConstruction": 256}
+    assert config.milvus.search_nprobe == 16
+    assert config.milvus.search_ef == 128
+    assert config.milvus.search_list == 200
+
+
+def test_load_config_rejects_non_object_index_params(monkeypatch):
+    monkeypatch.setenv("MILVUS_INDEX_PARAMS", "[1, 2]")
+
+    with pytest.raises(ValueError):
+        load_config()
+
+
+def test_load_config_milvus_backend(monkeypatch):
+    monkeypatch.setenv("MILVUS_BACKEND", "local")
+    monkeypatch.setenv("MILVUS_LOCAL_PATH", "/tmp/vectors")
+
+    config = load_config()
+
+    assert config.milvus.backend == "local"
+    assert config.milvus.local_path == "/tmp/vectors"
+
+
+def test_load_config_milvus_dedupe(monkeypatch):
+    monkeypatch.setenv("MILVUS_DEDUPE", "false")
+
+    config = load_config()
+
+    assert config.milvus.dedupe is False
+
+
+def test_load_config_mem0_http(monkeypatch):
+    monkeypatch.setenv("MEM0_CONNECT_TIMEOUT", "2")
+    monkeypatch.setenv("MEM0_READ_TIMEOUT", "20")
+    monkeypatch.setenv("MEM0_POOL_SIZE", "8")
+    monkeypatch.setenv("MEM0_MAX_RETRIES", "5")
+    monkeypatch.setenv("MEM0_RETRY_BACKOFF", "0.2")
+
+    config = load_config()
+
+    assert config.mem0.connect_timeout == 2.0
+    assert config.mem0.read_timeout == 20.0
+    assert config.mem0.pool_size == 8
+    assert config.mem0.max_retries == 5
+    assert config.mem0.retry_backoff == 0.2
+
+
+def test_load_config_mem0_write_mode(monkeypatch):
+    monkeypatch.setenv("MEM0_WRITE_MODE", "background")
+    monkeypatch.setenv("MEM0_WRITE_QUEUE_SIZE", "50")
+
+    config = load_config()
+
+    assert config.mem0.write_mode == "background"
+    assert config.mem0.write_queue_size == 50
+
+
+def test_load_config_mem0_batching(monkeypatch):
+    monkeypatch.setenv("MEM0_BATCH_WINDOW", "0.1")
+    monkeypatch.setenv("MEM0_BATCH_MAX_ITEMS", "50")
+
+    config = load_config()
+
+    assert config.mem0.batch_window == 0.1
+    assert config.mem0.batch_max_items == 50
+
+
+def test_load_config_mem0_search_cache(monkeypatch):
+    monkeypatch.setenv("MEM0_SEARCH_CACHE", "true")
+    monkeypatch.setenv("MEM0_SEARCH_CACHE_TTL", "30")
+    monkeypatch.setenv("MEM0_SEARCH_CACHE_MAX_ENTRIES", "256")
+
+    config = load_config()
+
+    assert config.mem0.search_cache_enabled is True
+    assert config.mem0.search_cache_ttl == 30.0
+    assert config.mem0.search_cache_max_entries == 256
+
+
+def test_load_config_mcp_session_pool(monkeypatch):
+    monkeypatch.setenv("MCP_SESSION_POOL", "false")
+    monkeypatch.setenv("MCP_MAX_CONCURRENT_CALLS", "4")
+    monkeypatch.setenv("MCP_HEALTH_CHECK_INTERVAL", "15")
+    monkeypatch.setenv("MCP_CAPABILITY_TTL", "120")
+
+    config = load_config()
+
+    assert config.mcp.session_pool is False
+    assert config.mcp.max_concurrent_calls == 4
+    assert config.mcp.health_check_interval == 15.0
+    assert config.mcp.capability_ttl == 120.0
+
+
+def test_load_config_mcp_tool_cache(monkeypatch):
+    monkeypatch.setenv("MCP_CACHE_TOOLS", "lookup, search ,")
+    monkeypatch.setenv("MCP_CACHE_TTL", "60")
+    monkeypatch.setenv("MCP_CACHE_MAX_ENTRIES", "100")
+    monkeypatch.setenv("MCP_CACHE_PATH", "/tmp/mcp.sqlite")
+
+    config = load_config()
+
+    assert config.mcp.cache_tools == ["lookup", "search"]
+    assert config.mcp.cache_ttl == 60.0
+    assert config.mcp.cache_max_entries == 100
+    assert config.mcp.cache_path == "/tmp/mcp.sqlite"
+
+
+def test_load_config_mcp_blob_spill(monkeypatch):
+    monkeypatch.setenv("MCP_INLINE_LIMIT", "65536")
+    monkeypatch.setenv("MCP_BLOB_DIR", "/tmp/mcp-blobs")
+
+    config = load_config()
+
+    assert config.mcp.inline_limit == 65536
+    assert config.mcp.blob_dir == "/tmp/mcp-blobs"
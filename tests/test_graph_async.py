@@ -0,0 +1,132 @@
+import asyncio
+
+from app.config import (
+    AppConfig,
+    CheckpointConfig,
+    LangfuseConfig,
+    LLMConfig,
+    MCPConfig,
+    Mem0Config,
+    MilvusConfig,
+)
+from app.graph import arun_agent
+
+
+def _config():
+    return AppConfig(
+        milvus=MilvusConfig(
+            host=None,
+            port=None,
+            username=None,
+            password=None,
+            collection="test_collection",
+            partition=None,
+            db_name=None,
+        ),
+        mem0=Mem0Config(
+            server_url=None,
+            api_key=None,
+            user_id="user-1",
+        ),
+        llm=LLMConfig(
+            api_key=None,
+            endpoint=None,
+            model="gpt-test",
+            timeout=None,
+            temperature=None,
+        ),
+        langfuse=LangfuseConfig(
+            public_key=None,
+            secret_key=None,
+            host=None,
+            env=None,
+        ),
+        mcp=MCPConfig(
+            transport=None,
+            server_url=None,
+            tool_name="echo",
+            api_key=None,
+            command=None,
+            args=[],
+        ),
+        checkpoint=CheckpointConfig(
+            backend="memory",
+            path=None,
+        ),
+    )
+
+
+def test_arun_agent_with_sync_overrides():
+    llm_result = {"status": "success", "model": "m1", "output_text": "ok"}
+    mem0_result = {"status": "success", "memory_id": "m1", "query_result": {}}
+    milvus_result = {"status": "success", "write_id": "v1", "query_result": {}}
+    mcp_result = {"status": "success", "tool_name": "echo", "tool_result": {}}
+
+    result = asyncio.run(
+        arun_agent(
+            {"prompt": "hi"},
+            config=_config(),
+            thread_id="t1",
+            node_overrides={
+                "llm": lambda _state: {"llm": llm_result},
+                "mem0": lambda _state: {"mem0": mem0_result},
+                "milvus": lambda _state: {"milvus": milvus_result},
+                "mcp": lambda _state: {"mcp": mcp_result},
+            },
+        )
+    )
+
+    assert result == {
+        "llm": llm_result,
+        "mem0": mem0_result,
+        "milvus": milvus_result,
+        "mcp": mcp_result,
+    }
+
+
+def test_arun_agent_uses_async_node_implementations(monkeypatch):
+    seen = {}
+
+    async def _fake_llm(prompt, *, config, system_prompt=None):
+        seen["llm"] = prompt
+        return {"status": "success", "output_text": "llm-output"}
+
+    async def _fake_mem0(content, query, *, config):
+        seen["mem0"] = content
+        return {"status": "success", "memory_id": "m1", "query_result": {}}
+
+    async def _fake_milvus(vector, *, config, query_vector=None, top_k=3):
+        seen["milvus"] = vector
+        return {"status": "success", "write_id": "v1", "query_result": {}}
+
+    async def _fake_mcp(tool_args, *, config, tool_name=None):
+        seen["mcp"] = tool_args
+        return {"status": "success", "tool_name": "echo", "tool_result": {}}
+
+    def _sync_not_expected(*_args, **_kwargs):
+        raise AssertionError("sync node called from arun_agent")
+
+    monkeypatch.setattr("app.graph.arun_llm_node", _fake_llm)
+    monkeypatch.setattr("app.graph.arun_mem0_node", _fake_mem0)
+    monkeypatch.setattr("app.graph.arun_milvus_node", _fake_milvus)
+    monkeypatch.setattr("app.graph.arun_mcp_node", _fake_mcp)
+    monkeypatch.setattr("app.graph.run_llm_node", _sync_not_expected)
+    monkeypatch.setattr("app.graph.run_mem0_node", _sync_not_expected)
+    monkeypatch.setattr("app.graph.run_milvus_node", _sync_not_expected)
+    monkeypatch.setattr("app.graph.run_mcp_node", _sync_not_expected)
+
+    result = asyncio.run(
+        arun_agent(
+            {"prompt": "hello", "mcp_tool_args": {"text": "hi"}},
+            config=_config(),
+            thread_id="t1",
+        )
+    )
+
+    assert seen == {
+        "llm": "hello",
+        "mem0": "llm-output",
+        "milvus": [0.1, 0.2, 0.3],
+        "mcp": {"text": "hi"},
+    }
+    assert result["llm"]["output_text"] == "llm-output"
@@ -0,0 +1,149 @@
+from app.config import (
+    AppConfig,
+    CheckpointConfig,
+    LangfuseConfig,
+    LLMConfig,
+    MCPConfig,
+    Mem0Config,
+    MilvusConfig,
+)
+from app import graph as graph_module
+from app.graph import run_agent
+
+
+def _config():
+    return AppConfig(
+        milvus=MilvusConfig(
+            host=None,
+            port=None,
+            username=None,
+            password=None,
+            collection="test_collection",
+            partition=None,
+            db_name=None,
+        ),
+        mem0=Mem0Config(
+            server_url=None,
+            api_key=None,
+            user_id="user-1",
+        ),
+        llm=LLMConfig(
+            api_key=None,
+            endpoint=None,
+            model="gpt-test",
+            timeout=None,
+            temperature=None,
+        ),
+        langfuse=LangfuseConfig(
+            public_key=None,
+            secret_key=None,
+            host=None,
+            env=None,
+        ),
+        mcp=MCPConfig(
+            transport=None,
+            server_url=None,
+            tool_name="echo",
+            api_key=None,
+            command=None,
+            args=[],
+        ),
+        checkpoint=CheckpointConfig(
+            backend="memory",
+            path=None,
+        ),
+    )
+
+
+def test_run_agent_reuses_compiled_graph(monkeypatch):
+    builds = []
+    real_build_graph = graph_module.build_graph
+
+    def _counting_build_graph(*args, **kwargs):
+        builds.append(kwargs)
+        return real_build_graph(*args, **kwargs)
+
+    monkeypatch.setattr("app.graph.build_graph", _counting_build_graph)
+    overrides = {
+        "llm": lambda _state: {"llm": {"status": "success"}},
+        "mem0": lambda _state: {"mem0": {"status": "success"}},
+        "milvus": lambda _state: {"milvus": {"status": "success"}},
+        "mcp": lambda _state: {"mcp": {"status": "success"}},
+    }
+
+    run_agent({"prompt": "a"}, config=_config(), thread_id="t1", node_overrides=overrides)
+    run_agent({"prompt": "b"}, config=_config(), thread_id="t2", node_overrides=overrides)
+
+    assert len(builds) == 1
+
+    changed = dict(overrides, llm=lambda _state: {"llm": {}})
+    run_agent({"prompt": "c"}, config=_config(), thread_id="t3", node_overrides=changed)
+
+    assert len(builds) == 2
+
+
+def test_run_agent_shares_checkpointer_between_calls():
+    def _llm(state):
+        previous = state.get("llm") or {"runs": 0}
+        return {"llm": {"runs": previous["runs"] + 1}}
+
+    overrides = {
+        "llm": _llm,
+        "mem0": lambda _state: {"mem0": {"status": "success"}},
+        "milvus": lambda _state: {"milvus": {"status": "success"}},
+        "mcp": lambda _state: {"mcp": {"status": "success"}},
+    }
+
+    first = run_agent({"prompt": "a"}, config=_config(), thread_id="t1", node_overrides=overrides)
+    second = run_agent({"prompt": "b"}, config=_config(), thread_id="t1", node_overrides=overrides)
+    other = run_agent({"prompt": "c"}, config=_config(), thread_id="t2", node_overrides=overrides)
+
+    assert first["llm"] == {"runs": 1}
+    assert second["llm"] == {"runs": 2}
+    assert other["llm"] == {"runs": 1}
+
+
+def test_run_agent_passes_trace_through_run_config(monkeypatch):
+    seen = []
+
+    class DummyApp:
+        def invoke(self, _state, config=None):
+            seen.append(config)
+            return {"result": {"ok": True}}
+
+    monkeypatch.setattr("app.graph.start_langfuse_trace", lambda **_kwargs: "trace-obj")
+    monkeypatch.setattr("app.graph.get_compiled_graph", lambda *_args, **_kwargs: DummyApp())
+
+    result = run_agent({"prompt": "hi"}, config=_config(), thread_id="t1")
+
+    assert result == {"ok": True}
+    assert seen[0]["configurable"]["langfuse_trace"] == "trace-obj"
+    assert seen[0]["configurable"]["thread_id"] == "t1"
+
+
+def test_run_agent_without_thread_id_starts_fresh_and_keeps_no_checkpoints():
+    from langgraph.checkpoint.memory import MemorySaver
+
+    def _llm(state):
+        previous = state.get("llm") or {"runs": 0}
+        return {"llm": {"runs": previous["runs"] + 1}}
+
+    overrides = {
+        "llm": _llm,
+        "mem0": lambda _state: {"mem0": {"status": "success"}},
+        "milvus": lambda _state: {"milvus": {"status": "success"}},
+        "mcp": lambda _state: {"mcp": {"status": "success"}},
+    }
+    saver = MemorySaver()
+    kwargs = {"config": _config(), "node_overrides": overrides, "checkpointer": saver}
+
+    first = run_agent({"prompt": "a"}, **kwargs)
+    second = run_agent({"prompt": "b"}, **kwargs)
+
+    assert first["llm"] == {"runs": 1}
+    assert second["llm"] == {"runs": 1}
+    assert not saver.storage
+
+    run_agent({"prompt": "c"}, thread_id="t1", **kwargs)
+
+    assert list(saver.storage) == ["t1"]
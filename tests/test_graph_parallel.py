@@ -0,0 +1,135 @@
+import threading
+
+import pytest
+
+from app.config import (
+    AppConfig,
+    CheckpointConfig,
+    GraphConfig,
+    LangfuseConfig,
+    LLMConfig,
+    MCPConfig,
+    Mem0Config,
+    MilvusConfig,
+)
+from app.graph import build_graph
+
+
+def _config(topology=None):
+    return AppConfig(
+        milvus=MilvusConfig(
+            host=None,
+            port=None,
+            username=None,
+            password=None,
+            collection="test_collection",
+            partition=None,
+            db_name=None,
+        ),
+        mem0=Mem0Config(
+            server_url=None,
+            api_key=None,
+            user_id="user-1",
+        ),
+        llm=LLMConfig(
+            api_key=None,
+            endpoint=None,
+            model="gpt-test",
+            timeout=None,
+            temperature=None,
+        ),
+        langfuse=LangfuseConfig(
+            public_key=None,
+            secret_key=None,
+            host=None,
+            env=None,
+        ),
+        mcp=MCPConfig(
+            transport=None,
+            server_url=None,
+            tool_name="echo",
+            api_key=None,
+            command=None,
+            args=[],
+        ),
+        checkpoint=CheckpointConfig(
+            backend=None,
+            path=None,
+        ),
+        graph=GraphConfig(topology=topology),
+    )
+
+
+def test_parallel_graph_fans_out_independent_nodes():
+    order = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _make_node(name, *, wait=False):
+        def _node(_state):
+            if wait:
+                barrier.wait()
+            with lock:
+                order.append(name)
+            return {name: {"status": "success"}}
+
+        return _node
+
+    def _mem0_node(state):
+        with lock:
+            order.append("mem0")
+        assert state["llm"] == {"status": "success"}
+        return {"mem0": {"status": "success"}}
+
+    graph = build_graph(
+        _config(topology="parallel"),
+        node_overrides={
+            "llm": _make_node("llm", wait=True),
+            "mem0": _mem0_node,
+            "milvus": _make_node("milvus", wait=True),
+            "mcp": _make_node("mcp", wait=True),
+        },
+    )
+    app = graph.compile()
+
+    state = app.invoke({"prompt": "hi"})
+
+    assert set(order) == {"llm", "mem0", "milvus", "mcp"}
+    assert order.index("mem0") > order.index("llm")
+    assert state["result"] == {
+        "llm": {"status": "success"},
+        "mem0": {"status": "success"},
+        "milvus": {"status": "success"},
+        "mcp": {"status": "success"},
+    }
+
+
+def test_build_graph_topology_argument_overrides_config():
+    order = []
+
+    def _make_node(name):
+        def _node(_state):
+            order.append(name)
+            return {name: {"status": "success"}}
+
+        return _node
+
+    graph = build_graph(
+        _config(topology="parallel"),
+        node_overrides={
+            "llm": _make_node("llm"),
+            "mem0": _make_node("mem0"),
+            "milvus": _make_node("milvus"),
+            "mcp": _make_node("mcp"),
+            "final": _make_node("final"),
+        },
+        topology="sequential",
+    )
+    graph.compile().invoke({"prompt": "hi"})
+
+    assert order == ["llm", "mem0", "milvus", "mcp", "final"]
+
+
+def test_build_graph_rejects_unknown_topology():
+    with pytest.raises(ValueError):
+        build_graph(_config(topology="diamond"))
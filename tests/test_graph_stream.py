@@ -0,0 +1,118 @@
+from app.config import (
+    AppConfig,
+    CheckpointConfig,
+    LangfuseConfig,
+    LLMConfig,
+    MCPConfig,
+    Mem0Config,
+    MilvusConfig,
+)
+from app.graph import stream_agent
+
+
+def _config():
+    return AppConfig(
+        milvus=MilvusConfig(
+            host=None,
+            port=None,
+            username=None,
+            password=None,
+            collection="test_collection",
+            partition=None,
+            db_name=None,
+        ),
+        mem0=Mem0Config(
+            server_url=None,
+            api_key=None,
+            user_id="user-1",
+        ),
+        llm=LLMConfig(
+            api_key=None,
+            endpoint=None,
+            model="gpt-test",
+            timeout=None,
+            temperature=None,
+        ),
+        langfuse=LangfuseConfig(
+            public_key=None,
+            secret_key=None,
+            host=None,
+            env=None,
+        ),
+        mcp=MCPConfig(
+            transport=None,
+            server_url=None,
+            tool_name="echo",
+            api_key=None,
+            command=None,
+            args=[],
+        ),
+        checkpoint=CheckpointConfig(
+            backend=None,
+            path=None,
+        ),
+    )
+
+
+
+
+def test_stream_agent_yields_node_events():
+    llm_result = {"status": "success", "model": "m1", "output_text": "ok"}
+    mem0_result = {"status": "failed", "memory_id": None, "query_result": None}
+
+    events = list(
+        stream_agent(
+            {"prompt": "hi"},
+            config=_config(),
+            thread_id="t1",
+            node_overrides={
+                "llm": lambda _state: {"llm": llm_result},
+                "mem0": lambda _state: {"mem0": mem0_result},
+                "milvus": lambda _state: {"milvus": {"status": "success"}},
+                "mcp": lambda _state: {"mcp": {"status": "success"}},
+            },
+        )
+    )
+
+    assert [event["node"] for event in events] == ["llm", "mem0", "milvus", "mcp", "final"]
+    assert events[0]["output"] == llm_result
+    assert events[1]["status"] == "failed"
+    assert events[-1]["output"]["llm"] == llm_result
+    elapsed = [event["elapsed_ms"] for event in events]
+    assert elapsed == sorted(elapsed)
+
+
+def test_stream_agent_emits_llm_deltas(monkeypatch):
+    from dataclasses import replace
+
+    def _fake_run_llm_node(prompt, *, config, on_token=None):
+        for delta in ("he", "llo"):
+            on_token(delta)
+        return {"status": "success", "model": config.model, "output_text": "hello"}
+
+    monkeypatch.setattr("app.graph.run_llm_node", _fake_run_llm_node)
+
+    config = _config()
+    config = replace(config, llm=replace(config.llm, stream=True))
+    events = list(
+        stream_agent(
+            {"prompt": "hi"},
+            config=config,
+            thread_id="t1",
+            node_overrides={
+                "mem0": lambda _state: {"mem0": {"status": "success"}},
+                "milvus": lambda _state: {"milvus": {"status": "success"}},
+                "mcp": lambda _state: {"mcp": {"status": "success"}},
+            },
+        )
+    )
+
+    deltas = [event for event in events if event["status"] == "streaming"]
+    assert [event["delta"] for event in deltas] == ["he", "llo"]
+    assert all(event["node"] == "llm" for event in deltas)
+    llm_done = next(
+        index
+        for index, event in enumerate(events)
+        if event["node"] == "llm" and event["status"] != "streaming"
+    )
+    assert events.index(deltas[-1]) < llm_done
@@ -1,3 +1,5 @@
+import asyncio
+from dataclasses import replace
 from types import SimpleNamespace
 
 import pytest
@@ -102,3 +104,309 @@ def test_llm_node_failure(monkeypatch):
     assert result["status"] == "failed"
     assert result["model"] == "gpt-test"
     assert "boom" in result["error"]
+
+
+def test_arun_llm_node_success(monkeypatch):
+    from app.nodes.llm import arun_llm_node
+
+    expected = {}
+
+    class FakeAsyncOpenAI:
+        def __init__(self, api_key=None, base_url=None, timeout=None):
+            expected["api_key"] = api_key
+            self.chat = SimpleNamespace(
+                completions=SimpleNamespace(create=self._create)
+            )
+
+        async def _create(self, **kwargs):
+            expected["create_kwargs"] = kwargs
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content="hello"))]
+            )
+
+        async def close(self):
+            expected["closed"] = True
+
+    monkeypatch.setattr("app.nodes.llm.AsyncOpenAI", FakeAsyncOpenAI)
+
+    config = LLMConfig(
+        api_key="llm_key",
+        endpoint=None,
+        model="gpt-test",
+        timeout=None,
+        temperature=None,
+    )
+    result = asyncio.run(arun_llm_node("Say hi", config=config))
+
+    assert expected["api_key"] == "llm_key"
+    assert expected["create_kwargs"]["messages"] == [
+        {"role": "user", "content": "Say hi"}
+    ]
+    assert result == {
+        "status": "success",
+        "model": "gpt-test",
+        "output_text": "hello",
+    }
+
+
+def test_async_clients_are_kept_per_loop_and_dropped_with_it(monkeypatch):
+    from app.nodes import llm as llm_module
+
+    created = []
+
+    class FakeAsyncOpenAI:
+        def __init__(self, **kwargs):
+            created.append(self)
+
+    monkeypatch.setattr("app.nodes.llm.AsyncOpenAI", FakeAsyncOpenAI)
+    config = LLMConfig(api_key="k", endpoint=None, model="m", timeout=None, temperature=None)
+
+    async def _get_twice():
+        return llm_module._get_async_client(config), llm_module._get_async_client(config)
+
+    first, again = asyncio.run(_get_twice())
+    second, _ = asyncio.run(_get_twice())
+
+    assert first is again
+    assert second is not first
+    # The first loop has closed, so its client is no longer held.
+    assert list(llm_module._ASYNC_CLIENTS.values()) == [second]
+
+
+def test_llm_node_reuses_pooled_client(monkeypatch):
+    created = []
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="hello"))]
+    )
+
+    def _fake_openai(*args, **kwargs):
+        created.append(kwargs)
+        return FakeOpenAI({}, response, *args, **kwargs)
+
+    monkeypatch.setattr("app.nodes.llm.OpenAI", _fake_openai)
+
+    config = LLMConfig(
+        api_key="llm_key",
+        endpoint="http://llm.local",
+        model="gpt-test",
+        timeout=30,
+        temperature=None,
+    )
+    run_llm_node("one", config=config)
+    run_llm_node("two", config=config)
+    run_llm_node("three", config=replace(config, timeout=5))
+
+    assert len(created) == 2
+
+
+def test_llm_node_pool_limits_use_custom_http_client(monkeypatch):
+    seen = {}
+
+    class FakeClient:
+        def __init__(self, **kwargs):
+            seen["client_kwargs"] = kwargs
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+        def _create(self, **_kwargs):
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content="hello"))]
+            )
+
+    def _fake_http_client(**kwargs):
+        seen["limits"] = kwargs["limits"]
+        return "http-client"
+
+    monkeypatch.setattr("app.nodes.llm.OpenAI", FakeClient)
+    monkeypatch.setattr("app.nodes.llm.DefaultHttpxClient", _fake_http_client)
+
+    config = LLMConfig(
+        api_key="llm_key",
+        endpoint=None,
+        model="gpt-test",
+        timeout=None,
+        temperature=None,
+        max_connections=8,
+        keepalive_expiry=30.0,
+    )
+    result = run_llm_node("Say hi", config=config)
+
+    assert result["status"] == "success"
+    assert seen["client_kwargs"]["http_client"] == "http-client"
+    assert seen["limits"].max_connections == 8
+    assert seen["limits"].max_keepalive_connections == 8
+    assert seen["limits"].keepalive_expiry == 30.0
+
+
+def test_llm_node_response_cache_skips_network(monkeypatch, tmp_path):
+    calls = []
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="hello"))]
+    )
+
+    def _fake_openai(*args, **kwargs):
+        client = FakeOpenAI({}, response, *args, **kwargs)
+        create = client.chat.completions.create
+
+        def _counting_create(**create_kwargs):
+            calls.append(create_kwargs)
+            return create(**create_kwargs)
+
+        client.chat.completions.create = _counting_create
+        return client
+
+    monkeypatch.setattr("app.nodes.llm.OpenAI", _fake_openai)
+
+    config = LLMConfig(
+        api_key="llm_key",
+        endpoint=None,
+        model="gpt-test",
+        timeout=None,
+        temperature=0.0,
+        cache_enabled=True,
+        cache_path=str(tmp_path / "llm.sqlite"),
+    )
+    first = run_llm_node("Say hi", config=config)
+    second = run_llm_node("Say hi", config=config)
+    run_llm_node("Say bye", config=config)
+
+    assert len(calls) == 2
+    assert first["cache"]["hit"] is False
+    assert second["output_text"] == "hello"
+    assert second["cache"] == {"hit": True, "hits": 1, "misses": 1}
+
+    from app.nodes.llm import close_llm_response_caches
+
+    close_llm_response_caches()
+    third = run_llm_node("Say hi", config=config)
+
+    assert len(calls) == 2
+    assert third["cache"]["hit"] is True
+
+
+def _stream_chunk(content=None, usage=None):
+    choices = [] if content is None else [
+        SimpleNamespace(delta=SimpleNamespace(content=content))
+    ]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+def test_llm_node_streams_tokens_with_metrics(monkeypatch):
+    seen = {}
+    chunks = [
+        _stream_chunk(""),
+        _stream_chunk("hel"),
+        _stream_chunk("lo"),
+        _stream_chunk(usage=SimpleNamespace(completion_tokens=3)),
+    ]
+
+    class FakeStreamingOpenAI:
+        def __init__(self, **_kwargs):
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+        def _create(self, **kwargs):
+            seen["create_kwargs"] = kwargs
+            return iter(chunks)
+
+    monkeypatch.setattr("app.nodes.llm.OpenAI", FakeStreamingOpenAI)
+
+    config = LLMConfig(
+        api_key="llm_key",
+        endpoint=None,
+        model="gpt-test",
+        timeout=None,
+        temperature=None,
+        stream=True,
+    )
+    deltas = []
+    result = run_llm_node("Say hi", config=config, on_token=deltas.append)
+
+    assert seen["create_kwargs"]["stream"] is True
+    assert seen["create_kwargs"]["stream_options"] == {"include_usage": True}
+    assert deltas == ["hel", "lo"]
+    assert result["status"] == "success"
+    assert result["output_text"] == "hello"
+    assert result["metrics"]["completion_tokens"] == 3
+    assert result["metrics"]["ttft_ms"] is not None
+    assert result["metrics"]["total_ms"] >= result["metrics"]["ttft_ms"]
+
+
+def test_llm_node_streams_without_usage_when_endpoint_rejects_it(monkeypatch):
+    import httpx
+    from openai import BadRequestError
+
+    calls = []
+
+    class FakeStreamingOpenAI:
+        def __init__(self, **_kwargs):
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+        def _create(self, **kwargs):
+            calls.append(kwargs)
+            if "stream_options" in kwargs:
+                request = httpx.Request("POST", "http://llm.local/chat/completions")
+                raise BadRequestError(
+                    "stream_options is not supported",
+                    response=httpx.Response(400, request=request),
+                    body=None,
+                )
+            return iter([_stream_chunk("a"), _stream_chunk("b")])
+
+    monkeypatch.setattr("app.nodes.llm.OpenAI", FakeStreamingOpenAI)
+
+    config = LLMConfig(
+        api_key="llm_key",
+        endpoint="http://llm.local",
+        model="gpt-test",
+        timeout=None,
+        temperature=None,
+        stream=True,
+    )
+    first = run_llm_node("Say hi", config=config)
+    second = run_llm_node("Say hi", config=config)
+
+    assert first["output_text"] == "ab"
+    assert first["metrics"]["completion_tokens"] == 2
+    assert second["status"] == "success"
+    # The rejection is remembered, so the second run goes straight to plain streaming.
+    assert ["stream_options" in kwargs for kwargs in calls] == [True, False, False]
+
+
+def test_arun_llm_node_streams_tokens(monkeypatch):
+    from app.nodes.llm import arun_llm_node
+
+    class FakeAsyncStream:
+        def __init__(self, items):
+            self._items = iter(items)
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            try:
+                return next(self._items)
+            except StopIteration:
+                raise StopAsyncIteration
+
+    class FakeAsyncOpenAI:
+        def __init__(self, **_kwargs):
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+        async def _create(self, **_kwargs):
+            return FakeAsyncStream([_stream_chunk("a"), _stream_chunk("b")])
+
+    monkeypatch.setattr("app.nodes.llm.AsyncOpenAI", FakeAsyncOpenAI)
+
+    config = LLMConfig(
+        api_key="llm_key",
+        endpoint=None,
+        model="gpt-test",
+        timeout=None,
+        temperature=None,
+        stream=True,
+    )
+    deltas = []
+    result = asyncio.run(arun_llm_node("Say hi", config=config, on_token=deltas.append))
+
+    assert deltas == ["a", "b"]
+    assert result["output_text"] == "ab"
+    assert result["metrics"]["completion_tokens"] == 2
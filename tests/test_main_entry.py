@@ -82,4 +82,46 @@ def test_main_invokes_run_agent(monkeypatch):
     assert called["state"]["prompt"] == "hello"
     assert called["state"]["mem0_query"] == "what did I say?"
     assert called["state"]["mcp_tool_args"] == {"text": "hi"}
+    assert "mcp_tool_calls" not in called["state"]
     assert result == {"ok": True}
+
+
+def test_main_passes_mcp_tool_calls(monkeypatch):
+    called = {}
+
+    def _fake_run_agent(initial_state, *, config, thread_id=None):
+        called["state"] = initial_state
+        return {"ok": True}
+
+    monkeypatch.setattr("app.main.load_config", _config)
+    monkeypatch.setattr("app.main.run_agent", _fake_run_agent)
+
+    calls = [{"tool": "echo", "args": {"text": "a"}}, {"tool": "search"}]
+    main(["--mcp-calls", json.dumps(calls)])
+
+    assert called["state"]["mcp_tool_calls"] == calls
+
+
+def test_main_stream_writes_one_line_per_node(monkeypatch, capsys):
+    events = [
+        {"node": "llm", "status": "success", "elapsed_ms": 1.0, "output": {"status": "success"}},
+        {"node": "final", "status": "success", "elapsed_ms": 2.0, "output": {"llm": {}}},
+    ]
+
+    def _fake_stream_agent(initial_state, *, config, thread_id=None):
+        assert initial_state["prompt"] == "hello"
+        return iter(events)
+
+    def _run_agent_not_expected(*_args, **_kwargs):
+        raise AssertionError("run_agent should not be called in stream mode")
+
+    monkeypatch.setattr("app.main.load_config", _config)
+    monkeypatch.setattr("app.main.stream_agent", _fake_stream_agent)
+    monkeypatch.setattr("app.main.run_agent", _run_agent_not_expected)
+
+    result = main(["--prompt", "hello", "--stream"])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == events
+    assert lines[0] == json.dumps(events[0], separators=(",", ":"))
+    assert result == {"llm": {}}
@@ -31,6 +31,7 @@ def test_main_module_executes(monkeypatch):
         return {"ok": True}
 
     fake_graph.run_agent = _run_agent
+    fake_graph.stream_agent = lambda *_args, **_kwargs: iter(())
 
     monkeypatch.setitem(sys.modules, "app.config", fake_config)
     monkeypatch.setitem(sys.modules, "app.graph", fake_graph)
@@ -21,11 +21,25 @@ def test_run_async_returns_value():
 
 
 @pytest.mark.anyio
-async def test_run_async_rejects_running_loop():
-    coro = asyncio.sleep(0)
-    with pytest.raises(RuntimeError):
-        mcp_module._run_async(coro)
-    coro.close()
+async def test_run_async_works_inside_running_loop():
+    async def _coro():
+        return "ok"
+
+    assert mcp_module._run_async(_coro()) == "ok"
+
+
+def test_run_async_rejects_blocking_on_pool_loop():
+    from app.nodes.mcp_pool import get_session_pool
+
+    async def _inner():
+        return "never"
+
+    async def _on_pool_loop():
+        with pytest.raises(RuntimeError, match="from inside it"):
+            mcp_module._run_async(_inner())
+        return "checked"
+
+    assert get_session_pool().run(_on_pool_loop()) == "checked"
 
 
 def test_load_clients():
@@ -94,8 +108,8 @@ def test_call_mcp_tool_async_stdio(monkeypatch):
             seen["params"] = {"command": command, "args": args}
 
     class FakeSession:
-        def __init__(self, _read, _write):
-            pass
+        def __init__(self, _read, _write, message_handler=None):
+            seen["message_handler"] = message_handler
 
         async def __aenter__(self):
             return self
@@ -109,6 +123,9 @@ def test_call_mcp_tool_async_stdio(monkeypatch):
         async def call_tool(self, name, args):
             return {"name": name, "args": args}
 
+        async def list_tools(self):
+            return types.SimpleNamespace(tools=[types.SimpleNamespace(name="echo")])
+
     class FakeClient:
         def __init__(self, _params):
             pass
@@ -143,13 +160,15 @@ def test_call_mcp_tool_async_stdio(monkeypatch):
 
     assert seen["params"] == {"command": "python", "args": ["-m", "server"]}
     assert result == {"name": "echo", "args": {"text": "hi"}}
+    # The pooled session listens for tools/list_changed notifications.
+    assert callable(seen["message_handler"])
 
 
 def test_call_mcp_tool_async_http(monkeypatch):
     seen = {}
 
     class FakeSession:
-        def __init__(self, _read, _write):
+        def __init__(self, _read, _write, message_handler=None):
             pass
 
         async def __aenter__(self):
@@ -164,6 +183,9 @@ def test_call_mcp_tool_async_http(monkeypatch):
         async def call_tool(self, name, args):
             return {"name": name, "args": args}
 
+        async def list_tools(self):
+            return types.SimpleNamespace(tools=[types.SimpleNamespace(name="echo")])
+
     class FakeClient:
         def __init__(self, _url, headers=None):
             seen["headers"] = headers
@@ -202,7 +224,7 @@ def test_call_mcp_tool_async_http(monkeypatch):
 
 def test_call_mcp_tool_async_sse(monkeypatch):
     class FakeSession:
-        def __init__(self, _read, _write):
+        def __init__(self, _read, _write, message_handler=None):
             pass
 
         async def __aenter__(self):
@@ -217,6 +239,9 @@ def test_call_mcp_tool_async_sse(monkeypatch):
         async def call_tool(self, name, args):
             return {"name": name, "args": args}
 
+        async def list_tools(self):
+            return types.SimpleNamespace(tools=[types.SimpleNamespace(name="echo")])
+
     class FakeClient:
         def __init__(self, _url, headers=None):
             pass
@@ -304,12 +329,41 @@ def test_call_mcp_tool_uses_run_async(monkeypatch):
         api_key=None,
         command=None,
         args=[],
+        session_pool=False,
     )
 
     assert mcp_module._call_mcp_tool("echo", {"text": "hi"}, config) == "ok"
     assert seen["called"] is True
 
 
+def test_call_mcp_tool_uses_session_pool_by_default(monkeypatch):
+    seen = {}
+
+    class FakePool:
+        def call(self, key, opener, tool_name, tool_args, *_args, **_kwargs):
+            seen["call"] = (key, tool_name, tool_args)
+            return "pooled"
+
+    def _no_run_async(coro):
+        coro.close()
+        raise AssertionError("pooled calls should not use _run_async")
+
+    monkeypatch.setattr(mcp_module, "get_session_pool", lambda: FakePool())
+    monkeypatch.setattr(mcp_module, "_run_async", _no_run_async)
+
+    config = MCPConfig(
+        transport="http",
+        server_url="http://mcp.local",
+        tool_name="echo",
+        api_key=None,
+        command=None,
+        args=[],
+    )
+
+    assert mcp_module._call_mcp_tool("echo", {"text": "hi"}, config) == "pooled"
+    assert seen["call"][1:] == ("echo", {"text": "hi"})
+
+
 def test_run_mcp_node_missing_name():
     config = MCPConfig(
         transport="http",
@@ -1,3 +1,8 @@
+import asyncio
+from types import SimpleNamespace
+
+import requests
+
 from app.config import MCPConfig
 from app.nodes.mcp import run_mcp_node
 
@@ -55,3 +60,518 @@ def test_mcp_node_failure(monkeypatch):
     assert result["tool_name"] == "echo"
     assert result["tool_result"] is None
     assert "mcp down" in result["error"]
+
+
+def test_arun_mcp_node_awaits_session_call(monkeypatch):
+    from app.nodes.mcp import arun_mcp_node
+
+    async def _fake_call(tool_name, tool_args, config):
+        return {"name": tool_name, "args": tool_args}
+
+    monkeypatch.setattr("app.nodes.mcp._call_mcp_tool_async", _fake_call)
+
+    config = MCPConfig(
+        transport="http",
+        server_url="http://mcp.local",
+        tool_name="echo",
+        api_key=None,
+        command=None,
+        args=[],
+    )
+
+    result = asyncio.run(arun_mcp_node({"text": "hi"}, config=config))
+
+    assert result == {
+        "status": "success",
+        "tool_name": "echo",
+        "tool_result": {"name": "echo", "args": {"text": "hi"}},
+    }
+
+
+class FakePooledSession:
+    def __init__(self, opened):
+        self.opened = opened
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.ping_error = None
+        self.list_error = None
+        self.tools = ["echo"]
+        self.message_handler = None
+
+    async def call_tool(self, tool_name, tool_args):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {"session": self.opened, "name": tool_name, "args": tool_args}
+
+    async def send_ping(self):
+        if self.ping_error is not None:
+            raise self.ping_error
+
+    async def list_tools(self):
+        if self.list_error is not None:
+            raise self.list_error
+        return SimpleNamespace(tools=[SimpleNamespace(name=name) for name in self.tools])
+
+
+def _fake_session_opener(monkeypatch):
+    from contextlib import asynccontextmanager
+
+    sessions = []
+
+    @asynccontextmanager
+    async def _open(_config, message_handler=None):
+        session = FakePooledSession(len(sessions) + 1)
+        session.message_handler = message_handler
+        sessions.append(session)
+        yield session
+
+    monkeypatch.setattr("app.nodes.mcp._open_session", _open)
+    return sessions
+
+
+def _stdio_config(**overrides):
+    values = {
+        "transport": "stdio",
+        "server_url": None,
+        "tool_name": "echo",
+        "api_key": None,
+        "command": "python",
+        "args": ["-m", "server"],
+    }
+    values.update(overrides)
+    return MCPConfig(**values)
+
+
+def test_mcp_node_reuses_pooled_session(monkeypatch):
+    sessions = _fake_session_opener(monkeypatch)
+    config = _stdio_config()
+
+    first = run_mcp_node({"text": "a"}, config=config)
+    second = run_mcp_node({"text": "b"}, config=config)
+
+    assert len(sessions) == 1
+    assert first["tool_result"] == {"session": 1, "name": "echo", "args": {"text": "a"}}
+    assert second["tool_result"] == {"session": 1, "name": "echo", "args": {"text": "b"}}
+
+
+def test_mcp_pool_restarts_session_that_fails_health_check(monkeypatch):
+    sessions = _fake_session_opener(monkeypatch)
+    config = _stdio_config(health_check_interval=0)
+
+    run_mcp_node({}, config=config)
+    sessions[0].ping_error = RuntimeError("server exited")
+    result = run_mcp_node({}, config=config)
+
+    assert len(sessions) == 2
+    assert result["tool_result"]["session"] == 2
+
+
+def test_mcp_pool_caps_concurrent_calls_per_session(monkeypatch):
+    from app.nodes.mcp import arun_mcp_node
+
+    sessions = _fake_session_opener(monkeypatch)
+    config = _stdio_config(max_concurrent_calls=2)
+
+    async def _run_many():
+        return await asyncio.gather(
+            *(arun_mcp_node({"i": i}, config=config) for i in range(6))
+        )
+
+    results = asyncio.run(_run_many())
+
+    assert all(result["status"] == "success" for result in results)
+    assert len(sessions) == 1
+    assert sessions[0].max_in_flight == 2
+
+
+def test_mcp_pool_refetches_tools_after_list_changed(monkeypatch):
+    sessions = _fake_session_opener(monkeypatch)
+    config = _stdio_config()
+
+    first = run_mcp_node({}, config=config, tool_name="echo")
+    sessions[0].tools = ["search"]
+    notification = SimpleNamespace(root=SimpleNamespace(method="notifications/tools/list_changed"))
+    asyncio.run(sessions[0].message_handler(notification))
+    second = run_mcp_node({}, config=config, tool_name="echo")
+
+    assert first["status"] == "success"
+    assert second["status"] == "failed"
+    assert "echo" in second["error"]
+
+
+def test_mcp_node_without_pool_opens_session_per_call(monkeypatch):
+    sessions = _fake_session_opener(monkeypatch)
+    config = _stdio_config(session_pool=False)
+
+    run_mcp_node({}, config=config)
+    run_mcp_node({}, config=config)
+
+    assert len(sessions) == 2
+
+
+def test_mcp_pool_rejects_unknown_tool_before_calling(monkeypatch):
+    sessions = _fake_session_opener(monkeypatch)
+    config = _stdio_config()
+
+    result = run_mcp_node({}, config=config, tool_name="missing")
+
+    assert result["status"] == "failed"
+    assert "missing" in result["error"]
+    assert sessions[0].max_in_flight == 0
+
+
+def _fake_jsonrpc_server(monkeypatch, tools=("echo",)):
+    methods = []
+    state = {"tools": list(tools), "notify": False}
+
+    def _post(_session, url, json, timeout):
+        if isinstance(json, list):
+            payload = _batch(json)
+            return SimpleNamespace(raise_for_status=lambda: None, json=lambda: payload)
+        methods.append(json["method"])
+        if json["method"] == "initialize":
+            reply = {"result": {"protocolVersion": "2025-03-26"}}
+        elif json["method"] == "tools/list" and state.get("reject_list"):
+            reply = {"error": {"code": -32601, "message": "Method not found"}}
+        elif json["method"] == "tools/list":
+            reply = {"result": {"tools": [{"name": name} for name in state["tools"]]}}
+        else:
+            reply = {"result": {"echo": json["params"]["arguments"]}}
+        reply.update({"jsonrpc": "2.0", "id": json["id"]})
+        return _reply(reply)
+
+    def _batch(payloads):
+        methods.append([payload["method"] for payload in payloads])
+        if state.get("fail_batch"):
+            raise requests.ConnectionError("connection refused")
+        if state.get("reject_batch"):
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600}}
+        return [
+            {"jsonrpc": "2.0", "id": payload["id"], "result": {"echo": payload["params"]}}
+            for payload in reversed(payloads)
+        ]
+
+    def _reply(reply):
+        payload = reply
+        if state["notify"]:
+            state["notify"] = False
+            payload = [reply, {"jsonrpc": "2.0", "method": "notifications/tools/list_changed"}]
+        return SimpleNamespace(raise_for_status=lambda: None, json=lambda: payload)
+
+    monkeypatch.setattr("app.nodes.mcp.requests.Session.post", _post)
+    return methods, state
+
+
+def _jsonrpc_config(**overrides):
+    return _stdio_config(transport="jsonrpc", server_url="http://mcp.local", **overrides)
+
+
+def test_mcp_jsonrpc_caches_capabilities(monkeypatch):
+    methods, _state = _fake_jsonrpc_server(monkeypatch)
+    config = _jsonrpc_config()
+
+    first = run_mcp_node({"text": "a"}, config=config)
+    second = run_mcp_node({"text": "b"}, config=config)
+
+    assert methods == ["initialize", "tools/list", "tools/call", "tools/call"]
+    assert first["tool_result"] == {"echo": {"text": "a"}}
+    assert second["tool_result"] == {"echo": {"text": "b"}}
+
+
+def test_mcp_jsonrpc_rejects_unknown_tool(monkeypatch):
+    methods, _state = _fake_jsonrpc_server(monkeypatch)
+
+    result = run_mcp_node({}, config=_jsonrpc_config(), tool_name="missing")
+
+    assert result["status"] == "failed"
+    assert "missing" in result["error"]
+    assert "tools/call" not in methods
+
+
+def test_mcp_jsonrpc_skips_validation_when_tools_list_rejected(monkeypatch):
+    methods, state = _fake_jsonrpc_server(monkeypatch)
+    state["reject_list"] = True
+    config = _jsonrpc_config()
+
+    first = run_mcp_node({}, config=config, tool_name="anything")
+    second = run_mcp_node({}, config=config, tool_name="anything")
+
+    assert first["status"] == "success"
+    assert second["status"] == "success"
+    assert methods == ["initialize", "tools/list", "tools/call", "tools/call"]
+
+
+def test_mcp_pool_skips_validation_when_list_tools_fails(monkeypatch):
+    from contextlib import asynccontextmanager
+
+    @asynccontextmanager
+    async def _open(_config, _message_handler=None):
+        session = FakePooledSession(1)
+        session.list_error = RuntimeError("Method not found")
+        yield session
+
+    monkeypatch.setattr("app.nodes.mcp._open_session", _open)
+
+    result = run_mcp_node({}, config=_stdio_config(), tool_name="unlisted")
+
+    assert result["status"] == "success"
+    assert result["tool_result"]["name"] == "unlisted"
+
+
+def test_mcp_jsonrpc_refetches_tools_after_list_changed(monkeypatch):
+    methods, state = _fake_jsonrpc_server(monkeypatch)
+    config = _jsonrpc_config()
+
+    state["notify"] = True
+    run_mcp_node({}, config=config)
+    state["tools"].append("search")
+    result = run_mcp_node({}, config=config, tool_name="search")
+
+    assert result["status"] == "success"
+    assert methods == ["initialize", "tools/list", "tools/call", "tools/list", "tools/call"]
+
+
+def test_mcp_jsonrpc_capabilities_expire(monkeypatch):
+    methods, _state = _fake_jsonrpc_server(monkeypatch)
+    config = _jsonrpc_config(capability_ttl=0)
+
+    run_mcp_node({}, config=config)
+    run_mcp_node({}, config=config)
+
+    assert methods.count("initialize") == 2
+
+
+def test_mcp_batch_jsonrpc_sends_one_batch(monkeypatch):
+    from app.nodes.mcp import run_mcp_batch
+
+    methods, _state = _fake_jsonrpc_server(monkeypatch)
+
+    result = run_mcp_batch(
+        [
+            {"tool": "echo", "args": {"text": "a"}, "id": "first"},
+            {"tool": "missing"},
+            {"tool": "echo"},
+        ],
+        config=_jsonrpc_config(),
+    )
+
+    assert methods == ["initialize", "tools/list", "tools/list", ["tools/call", "tools/call"]]
+    assert result["status"] == "failed"
+    assert result["error"] == "1 of 3 mcp tool calls failed"
+    calls = result["calls"]
+    assert [call["id"] for call in calls] == ["first", 1, 2]
+    assert [call["status"] for call in calls] == ["success", "failed", "success"]
+    assert calls[0]["tool_result"] == {"echo": {"name": "echo", "arguments": {"text": "a"}}}
+    assert "missing" in calls[1]["error"]
+    assert all("elapsed_ms" in call for call in calls)
+
+
+def test_mcp_batch_jsonrpc_falls_back_when_batch_rejected(monkeypatch):
+    from app.nodes.mcp import run_mcp_batch
+
+    methods, state = _fake_jsonrpc_server(monkeypatch)
+    state["reject_batch"] = True
+
+    result = run_mcp_batch([{"tool": "echo"}, {"tool": "echo"}], config=_jsonrpc_config())
+
+    assert result["status"] == "success"
+    assert methods.count("tools/call") == 2
+
+
+def test_mcp_batch_runs_calls_concurrently_on_pooled_session(monkeypatch):
+    from app.nodes.mcp import arun_mcp_batch
+
+    sessions = _fake_session_opener(monkeypatch)
+
+    calls = [{"tool": "echo", "args": {"i": i}} for i in range(4)]
+
+    result = asyncio.run(arun_mcp_batch(calls, config=_stdio_config()))
+
+    assert result["status"] == "success"
+    assert [call["tool_result"]["args"] for call in result["calls"]] == [
+        call["args"] for call in calls
+    ]
+    assert len(sessions) == 1
+    assert sessions[0].max_in_flight == 4
+
+
+def test_mcp_batch_shares_one_session_without_pool(monkeypatch):
+    from app.nodes.mcp import run_mcp_batch
+
+    sessions = _fake_session_opener(monkeypatch)
+
+    result = run_mcp_batch(
+        [{"tool": "echo"}, {"tool": "echo"}],
+        config=_stdio_config(session_pool=False),
+    )
+
+    assert result["status"] == "success"
+    assert len(sessions) == 1
+    assert sessions[0].max_in_flight == 2
+
+
+def test_mcp_batch_rejects_malformed_calls():
+    from app.nodes.mcp import run_mcp_batch
+
+    result = run_mcp_batch([{"args": {}}], config=_stdio_config())
+
+    assert result == {
+        "status": "failed",
+        "calls": [],
+        "error": "mcp tool call 0 must be an object with a 'tool' name",
+    }
+
+
+def test_run_mcp_node_works_inside_running_loop(monkeypatch):
+    from app.nodes.mcp import run_mcp_batch
+
+    sessions = _fake_session_opener(monkeypatch)
+
+    def _no_new_loop(coro):
+        coro.close()
+        raise AssertionError("asyncio.run should not be used")
+
+    async def _host():
+        monkeypatch.setattr("app.nodes.mcp.asyncio.run", _no_new_loop)
+        single = run_mcp_node({"text": "hi"}, config=_stdio_config(session_pool=False))
+        batch = run_mcp_batch([{"tool": "echo"}], config=_stdio_config())
+        return single, batch
+
+    single, batch = asyncio.run(_host())
+
+    assert single["status"] == "success"
+    assert batch["status"] == "success"
+    assert len(sessions) == 2
+
+
+def test_mcp_node_caches_allow_listed_tool(monkeypatch):
+    methods, _state = _fake_jsonrpc_server(monkeypatch)
+    config = _jsonrpc_config(cache_tools=["echo"])
+
+    first = run_mcp_node({"a": 1, "b": 2}, config=config)
+    second = run_mcp_node({"b": 2, "a": 1}, config=config)
+
+    assert methods.count("tools/call") == 1
+    assert first["cache"] == {"hit": False, "hits": 0, "misses": 1}
+    assert second["cache"] == {"hit": True, "hits": 1, "misses": 1}
+    assert second["tool_result"] == first["tool_result"]
+
+
+def test_mcp_node_does_not_cache_other_tools_or_errors(monkeypatch):
+    calls = []
+
+    def _fake_call(tool_name, tool_args, config):
+        calls.append(tool_name)
+        return {"content": [], "isError": tool_name == "flaky"}
+
+    monkeypatch.setattr("app.nodes.mcp._call_mcp_tool", _fake_call)
+    config = _stdio_config(cache_tools=["flaky"])
+
+    for name in ("echo", "echo", "flaky", "flaky"):
+        result = run_mcp_node({}, config=config, tool_name=name)
+
+    assert calls == ["echo", "echo", "flaky", "flaky"]
+    assert result["cache"]["hit"] is False
+
+
+def test_mcp_tool_cache_shares_sqlite_tier(monkeypatch, tmp_path):
+    from app.nodes.mcp import close_mcp_tool_caches
+
+    methods, _state = _fake_jsonrpc_server(monkeypatch)
+    config = _jsonrpc_config(cache_tools=["echo"], cache_path=str(tmp_path / "mcp.sqlite"))
+
+    run_mcp_node({"q": "x"}, config=config)
+    # A fresh memory tier stands in for another worker process.
+    close_mcp_tool_caches()
+    result = run_mcp_node({"q": "x"}, config=config)
+
+    assert methods.count("tools/call") == 1
+    assert result["cache"]["hit"] is True
+    assert result["tool_result"] == {"echo": {"q": "x"}}
+
+
+def test_mcp_batch_serves_cached_calls_without_sending(monkeypatch):
+    from app.nodes.mcp import run_mcp_batch
+
+    methods, _state = _fake_jsonrpc_server(monkeypatch)
+    config = _jsonrpc_config(cache_tools=["echo"])
+
+    run_mcp_node({"q": 1}, config=config)
+    result = run_mcp_batch(
+        [{"tool": "echo", "args": {"q": 1}}, {"tool": "echo", "args": {"q": 2}}],
+        config=config,
+    )
+
+    assert methods[-1] == ["tools/call"]
+    assert [call["cache"]["hit"] for call in result["calls"]] == [True, False]
+    assert result["calls"][0]["tool_result"] == {"echo": {"q": 1}}
+
+
+def test_mcp_batch_keeps_cache_hits_when_batch_request_fails(monkeypatch):
+    from app.nodes.mcp import run_mcp_batch
+
+    _methods, state = _fake_jsonrpc_server(monkeypatch)
+    config = _jsonrpc_config(cache_tools=["echo"])
+
+    run_mcp_node({"q": 1}, config=config)
+    state["fail_batch"] = True
+    result = run_mcp_batch(
+        [{"tool": "echo", "args": {"q": 1}}, {"tool": "echo", "args": {"q": 2}}],
+        config=config,
+    )
+
+    assert result["status"] == "failed"
+    assert [call["status"] for call in result["calls"]] == ["success", "failed"]
+    assert result["calls"][0]["cache"]["hit"] is True
+    assert "connection refused" in result["calls"][1]["error"]
+
+
+def test_mcp_node_spills_large_results_to_blob_store(monkeypatch, tmp_path):
+    from app.nodes.mcp import load_mcp_result
+
+    big = {"content": [{"type": "text", "text": "x" * 5000}], "isError": False}
+    monkeypatch.setattr("app.nodes.mcp._call_mcp_tool", lambda *_args: big)
+    config = _stdio_config(inline_limit=1024, blob_dir=str(tmp_path))
+
+    result = run_mcp_node({}, config=config)
+
+    reference = result["tool_result"]
+    assert reference["blob"]["size"] > 1024
+    assert reference["blob"]["media_type"] == "application/json"
+    assert reference["summary"] == {
+        "content_items": 1,
+        "content_types": ["text"],
+        "preview": "x" * 512,
+    }
+    assert load_mcp_result(reference, config=config) == big
+
+
+def test_mcp_node_keeps_small_results_inline(monkeypatch, tmp_path):
+    from app.nodes.mcp import load_mcp_result
+
+    monkeypatch.setattr("app.nodes.mcp._call_mcp_tool", lambda *_args: {"ok": True})
+    config = _stdio_config(inline_limit=1024, blob_dir=str(tmp_path))
+
+    result = run_mcp_node({}, config=config)
+
+    assert result["tool_result"] == {"ok": True}
+    assert load_mcp_result(result["tool_result"], config=config) == {"ok": True}
+    assert not any(tmp_path.iterdir())
+
+
+def test_mcp_batch_spills_large_call_results(monkeypatch, tmp_path):
+    from app.nodes.mcp import run_mcp_batch
+
+    _fake_jsonrpc_server(monkeypatch)
+    config = _jsonrpc_config(inline_limit=200, blob_dir=str(tmp_path))
+
+    result = run_mcp_batch(
+        [{"tool": "echo", "args": {"text": "y" * 500}}, {"tool": "echo"}],
+        config=config,
+    )
+
+    large, small = result["calls"]
+    assert set(large["tool_result"]) == {"blob", "summary"}
+    assert small["tool_result"] == {"echo": {"name": "echo", "arguments": {}}}
@@ -1,10 +1,14 @@
+import asyncio
+
 from app.config import Mem0Config
-from app.nodes.mem0 import run_mem0_node
+from app.nodes.mem0 import arun_mem0_node, run_mem0_node
 
 
 class FakeResponse:
-    def __init__(self, payload):
+    def __init__(self, payload, status_code=200, headers=None):
         self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
 
     def raise_for_status(self):
         return None
@@ -13,18 +17,28 @@ class FakeResponse:
         return self._payload
 
 
+def _fake_session_post(fake_post):
+    def _post(_session, url, **kwargs):
+        return fake_post(url, **kwargs)
+
+    return _post
+
+
 def test_mem0_node_success(monkeypatch):
     calls = []
 
-    def _fake_post(url, json, headers):
+    timeouts = []
+
+    def _fake_post(url, json, headers, timeout):
         calls.append({"url": url, "json": json, "headers": headers})
+        timeouts.append(timeout)
         if url.endswith("/memories/"):
             return FakeResponse({"id": "mem-123"})
         if url.endswith("/search/"):
             return FakeResponse({"results": ["hotpot"]})
         raise AssertionError(f"Unexpected url: {url}")
 
-    monkeypatch.setattr("app.nodes.mem0.requests.post", _fake_post)
+    monkeypatch.setattr("app.nodes.mem0.requests.Session.post", _fake_session_post(_fake_post))
 
     config = Mem0Config(
         server_url="http://mem0.local",
@@ -62,10 +76,12 @@ def test_mem0_node_success(monkeypatch):
             },
         },
     ]
+    assert timeouts == [(5.0, 30.0), (5.0, 30.0)]
     assert result == {
         "status": "success",
         "memory_id": "mem-123",
         "query_result": {"results": ["hotpot"]},
+        "ordering": "read_after_write",
     }
 
 
@@ -73,7 +89,7 @@ def test_mem0_node_failure(monkeypatch):
     def _fake_post(*_args, **_kwargs):
         raise RuntimeError("mem0 down")
 
-    monkeypatch.setattr("app.nodes.mem0.requests.post", _fake_post)
+    monkeypatch.setattr("app.nodes.mem0.requests.Session.post", _fake_session_post(_fake_post))
 
     config = Mem0Config(
         server_url="http://mem0.local",
@@ -91,3 +107,388 @@ def test_mem0_node_failure(monkeypatch):
     assert result["memory_id"] is None
     assert result["query_result"] is None
     assert "mem0 down" in result["error"]
+
+
+def test_arun_mem0_node_success(monkeypatch):
+    calls = []
+
+    class FakeAsyncClient:
+        def __init__(self, **_kwargs):
+            pass
+
+        async def aclose(self):
+            return None
+
+        async def post(self, url, json, headers):
+            calls.append(url)
+            if url.endswith("/memories/"):
+                return FakeResponse({"id": "mem-123"})
+            return FakeResponse({"results": ["hotpot"]})
+
+    monkeypatch.setattr("app.nodes.mem0.httpx.AsyncClient", FakeAsyncClient)
+
+    config = Mem0Config(
+        server_url="http://mem0.local",
+        api_key=None,
+        user_id="user-1",
+    )
+
+    result = asyncio.run(arun_mem0_node("I love hotpot", "What do I love?", config=config))
+
+    assert calls == ["http://mem0.local/memories/", "http://mem0.local/search/"]
+    assert result == {
+        "status": "success",
+        "memory_id": "mem-123",
+        "query_result": {"results": ["hotpot"]},
+        "ordering": "read_after_write",
+    }
+
+
+def test_arun_mem0_node_pools_client_per_loop(monkeypatch):
+    clients = []
+
+    class FakeAsyncClient:
+        def __init__(self, **_kwargs):
+            self.closed = False
+            clients.append(self)
+
+        async def aclose(self):
+            self.closed = True
+
+        async def post(self, url, json, headers):
+            return FakeResponse({"id": "mem-1"} if url.endswith("/memories/") else {})
+
+    monkeypatch.setattr("app.nodes.mem0.httpx.AsyncClient", FakeAsyncClient)
+    config = Mem0Config(server_url="http://mem0.local", api_key=None, user_id="user-1")
+
+    async def _twice():
+        await arun_mem0_node("a", "q", config=config)
+        await arun_mem0_node("b", "q", config=config)
+        return [client.closed for client in clients]
+
+    open_during_run = asyncio.run(_twice())
+    asyncio.run(arun_mem0_node("c", "q", config=config))
+
+    assert open_during_run == [False]
+    assert len(clients) == 2
+    assert all(client.closed for client in clients)
+
+
+def test_mem0_node_reuses_pooled_session():
+    from app.nodes.mem0 import _get_session
+
+    config = Mem0Config(
+        server_url="http://mem0.local",
+        api_key=None,
+        user_id="user-1",
+        pool_size=4,
+        max_retries=2,
+        retry_backoff=0.1,
+    )
+
+    session = _get_session(config)
+    adapter = session.get_adapter("http://mem0.local/search/")
+
+    assert _get_session(config) is session
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 2
+    assert adapter.max_retries.read == 0
+    assert adapter.max_retries.backoff_factor == 0.1
+    assert 503 in adapter.max_retries.status_forcelist
+    assert "POST" in adapter.max_retries.allowed_methods
+
+
+def test_mem0_add_retries_only_unprocessed_statuses():
+    from app.nodes.mem0 import _get_session
+
+    config = Mem0Config(server_url="http://mem0.local", api_key=None, user_id="user-1")
+
+    session = _get_session(config)
+    add_retry = session.get_adapter("http://mem0.local/memories/").max_retries
+    search_retry = session.get_adapter("http://mem0.local/search/").max_retries
+
+    assert set(add_retry.status_forcelist) == {429, 503}
+    assert add_retry.read == 0
+    assert {500, 502, 504} <= set(search_retry.status_forcelist)
+
+
+def test_arun_mem0_node_retries_retryable_status(monkeypatch):
+    responses = [
+        FakeResponse({}, status_code=503, headers={"Retry-After": "0"}),
+        FakeResponse({"id": "mem-1"}),
+        FakeResponse({}, status_code=429),
+        FakeResponse({"results": []}),
+    ]
+    sleeps = []
+
+    class FakeAsyncClient:
+        def __init__(self, **_kwargs):
+            pass
+
+        async def aclose(self):
+            return None
+
+        async def post(self, url, json, headers):
+            return responses.pop(0)
+
+    async def _fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("app.nodes.mem0.httpx.AsyncClient", FakeAsyncClient)
+    monkeypatch.setattr("app.nodes.mem0.asyncio.sleep", _fake_sleep)
+
+    config = Mem0Config(
+        server_url="http://mem0.local",
+        api_key=None,
+        user_id="user-1",
+        retry_backoff=0.25,
+    )
+
+    result = asyncio.run(arun_mem0_node("hi", "q", config=config))
+
+    assert result["status"] == "success"
+    assert result["memory_id"] == "mem-1"
+    assert sleeps == [0.0, 0.25]
+
+
+def test_arun_mem0_node_does_not_retry_add_on_server_error(monkeypatch):
+    calls = []
+
+    class FakeAsyncClient:
+        def __init__(self, **_kwargs):
+            pass
+
+        async def aclose(self):
+            return None
+
+        async def post(self, url, json, headers):
+            calls.append(url)
+            return FakeResponse({}, status_code=500)
+
+    async def _fake_sleep(_delay):
+        return None
+
+    monkeypatch.setattr("app.nodes.mem0.httpx.AsyncClient", FakeAsyncClient)
+    monkeypatch.setattr("app.nodes.mem0.asyncio.sleep", _fake_sleep)
+
+    config = Mem0Config(server_url="http://mem0.local", api_key=None, user_id="user-1")
+
+    asyncio.run(arun_mem0_node("hi", "q", config=config))
+
+    assert calls[0] == "http://mem0.local/memories/"
+    assert calls.count("http://mem0.local/memories/") == 1
+
+
+def test_mem0_node_concurrent_mode_overlaps_add_and_search(monkeypatch):
+    import threading
+
+    search_started = threading.Event()
+
+    def _fake_post(url, json, headers, timeout):
+        if url.endswith("/memories/"):
+            # Only returns once the search is in flight at the same time.
+            assert search_started.wait(timeout=5)
+            return FakeResponse({"id": "mem-9"})
+        search_started.set()
+        return FakeResponse({"results": []})
+
+    monkeypatch.setattr("app.nodes.mem0.requests.Session.post", _fake_session_post(_fake_post))
+
+    config = Mem0Config(
+        server_url="http://mem0.local",
+        api_key=None,
+        user_id="user-1",
+        write_mode="concurrent",
+    )
+
+    result = run_mem0_node("hi", "q", config=config)
+
+    assert result == {
+        "status": "success",
+        "memory_id": "mem-9",
+        "query_result": {"results": []},
+        "ordering": "concurrent",
+    }
+
+
+def test_mem0_node_background_mode_queues_add(monkeypatch):
+    from app.nodes.mem0 import flush_mem0_writes
+
+    calls = []
+
+    def _fake_post(url, json, headers, timeout):
+        calls.append(url)
+        if url.endswith("/memories/"):
+            return FakeResponse({"id": "mem-9"})
+        return FakeResponse({"results": []})
+
+    monkeypatch.setattr("app.nodes.mem0.requests.Session.post", _fake_session_post(_fake_post))
+
+    config = Mem0Config(
+        server_url="http://mem0.local",
+        api_key=None,
+        user_id="user-1",
+        write_mode="background",
+    )
+
+    result = run_mem0_node("hi", "q", config=config)
+    flush_mem0_writes()
+
+    assert result["memory_id"] is None
+    assert result["ordering"] == "fire_and_forget"
+    assert sorted(calls) == ["http://mem0.local/memories/", "http://mem0.local/search/"]
+
+
+def test_mem0_node_rejects_unknown_write_mode():
+    config = Mem0Config(
+        server_url="http://mem0.local",
+        api_key=None,
+        user_id="user-1",
+        write_mode="eventually",
+    )
+
+    result = run_mem0_node("hi", "q", config=config)
+
+    assert result["status"] == "failed"
+    assert "MEM0_WRITE_MODE" in result["error"]
+
+
+def test_arun_mem0_node_concurrent_mode(monkeypatch):
+    calls = []
+
+    class FakeAsyncClient:
+        def __init__(self, **_kwargs):
+            pass
+
+        async def aclose(self):
+            return None
+
+        async def post(self, url, json, headers):
+            calls.append(url)
+            if url.endswith("/memories/"):
+                return FakeResponse({"id": "mem-2"})
+            return FakeResponse({"results": ["x"]})
+
+    monkeypatch.setattr("app.nodes.mem0.httpx.AsyncClient", FakeAsyncClient)
+
+    config = Mem0Config(
+        server_url="http://mem0.local",
+        api_key=None,
+        user_id="user-1",
+        write_mode="concurrent",
+    )
+
+    result = asyncio.run(arun_mem0_node("hi", "q", config=config))
+
+    assert len(calls) == 2
+    assert result["memory_id"] == "mem-2"
+    assert result["ordering"] == "concurrent"
+
+
+def test_mem0_background_writes_are_batched_per_user(monkeypatch):
+    from dataclasses import replace
+
+    from app.nodes.mem0 import flush_mem0_writes, mem0_write_metrics
+
+    adds = []
+
+    def _fake_post(url, json, headers, timeout):
+        if url.endswith("/memories/"):
+            adds.append(json)
+            return FakeResponse({"id": "mem-batch"})
+        return FakeResponse({"results": []})
+
+    monkeypatch.setattr("app.nodes.mem0.requests.Session.post", _fake_session_post(_fake_post))
+
+    config = Mem0Config(
+        server_url="http://mem0.local",
+        api_key=None,
+        user_id="user-1",
+        write_mode="background",
+        batch_window=0.5,
+        batch_max_items=10,
+    )
+
+    for content in ("a", "b", "c"):
+        run_mem0_node(content, "q", config=config)
+    run_mem0_node("d", "q", config=replace(config, user_id="user-2"))
+    flush_mem0_writes()
+
+    assert sorted(adds, key=lambda payload: payload["user_id"]) == [
+        {
+            "messages": [
+                {"role": "user", "content": "a"},
+                {"role": "user", "content": "b"},
+                {"role": "user", "content": "c"},
+            ],
+            "user_id": "user-1",
+        },
+        {"messages": [{"role": "user", "content": "d"}], "user_id": "user-2"},
+    ]
+    metrics = mem0_write_metrics()
+    assert metrics["queue_depth"] == 0
+    assert metrics["queued"] == 4
+    assert metrics["sent_items"] == 4
+    assert metrics["requests"] == 2
+    assert metrics["last_flush_ms"] is not None
+
+
+def test_mem0_search_cache_hits_until_user_adds_memory(monkeypatch):
+    from app.nodes.mem0 import flush_mem0_writes
+
+    searches = []
+
+    def _fake_post(url, json, headers, timeout):
+        if url.endswith("/memories/"):
+            return FakeResponse({"id": "mem-1"})
+        searches.append(json["user_id"])
+        return FakeResponse({"results": [len(searches)]})
+
+    monkeypatch.setattr("app.nodes.mem0.requests.Session.post", _fake_session_post(_fake_post))
+
+    config = Mem0Config(
+        server_url="http://mem0.local",
+        api_key=None,
+        user_id="user-1",
+        write_mode="background",
+        batch_window=0.5,
+        search_cache_enabled=True,
+    )
+
+    first = run_mem0_node("a", "q", config=config)
+    second = run_mem0_node("b", "q", config=config)
+    flush_mem0_writes()
+    third = run_mem0_node("c", "q", config=config)
+    flush_mem0_writes()
+
+    assert searches == ["user-1", "user-1"]
+    assert first["search_cache"] == {"hit": False, "hits": 0, "misses": 1}
+    assert second["query_result"] == {"results": [1]}
+    assert second["search_cache"] == {"hit": True, "hits": 1, "misses": 1}
+    assert third["query_result"] == {"results": [2]}
+    assert third["search_cache"]["hit"] is False
+
+
+def test_mem0_search_cache_is_invalidated_by_sequential_add(monkeypatch):
+    searches = []
+
+    def _fake_post(url, json, headers, timeout):
+        if url.endswith("/memories/"):
+            return FakeResponse({"id": "mem-1"})
+        searches.append(url)
+        return FakeResponse({"results": []})
+
+    monkeypatch.setattr("app.nodes.mem0.requests.Session.post", _fake_session_post(_fake_post))
+
+    config = Mem0Config(
+        server_url="http://mem0.local",
+        api_key=None,
+        user_id="user-1",
+        search_cache_enabled=True,
+    )
+
+    run_mem0_node("a", "q", config=config)
+    result = run_mem0_node("b", "q", config=config)
+
+    assert len(searches) == 2
+    assert result["search_cache"]["hit"] is False
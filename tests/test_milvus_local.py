@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from app.nodes.milvus_local import LocalVectorIndex
+
+
+def test_local_index_l2_brute_force():
+    index = LocalVectorIndex(metric_type="L2")
+    ids = index.insert([[0.0, 0.0], [1.0, 0.0], [5.0, 5.0]])
+
+    hit_ids, distances = index.search([[0.9, 0.0]], top_k=2)
+
+    assert ids == [0, 1, 2]
+    assert hit_ids == [[1, 0]]
+    assert distances[0] == pytest.approx([0.01, 0.81], abs=1e-6)
+
+
+def test_local_index_ip_and_cosine_rank_by_similarity():
+    vectors = [[1.0, 0.0], [10.0, 1.0], [0.0, 1.0]]
+    ip_index = LocalVectorIndex(metric_type="IP")
+    cosine_index = LocalVectorIndex(metric_type="COSINE")
+    ip_index.insert(vectors)
+    cosine_index.insert(vectors)
+
+    ip_ids, _ = ip_index.search([[1.0, 0.0]], top_k=1)
+    cosine_ids, cosine_distances = cosine_index.search([[1.0, 0.0]], top_k=1)
+
+    assert ip_ids == [[1]]
+    assert cosine_ids == [[0]]
+    assert cosine_distances[0][0] == pytest.approx(1.0)
+
+
+def test_local_index_ivf_finds_nearest_cluster():
+    rng = np.random.default_rng(1)
+    centers = np.array([[0.0, 0.0], [100.0, 100.0], [-100.0, 100.0], [100.0, -100.0]])
+    vectors = np.concatenate([center + rng.normal(size=(50, 2)) for center in centers])
+    index = LocalVectorIndex(metric_type="L2", nlist=4)
+    index.insert(vectors)
+
+    hit_ids, _ = index.search([[100.0, 100.0]], top_k=5, nprobe=1)
+
+    assert len(hit_ids[0]) == 5
+    assert all(50 <= hit_id < 100 for hit_id in hit_ids[0])
+
+
+def test_local_index_persists_to_npy(tmp_path):
+    path = str(tmp_path / "vectors")
+    index = LocalVectorIndex(path=path)
+    index.insert([[1.0, 2.0], [3.0, 4.0]])
+    index.flush()
+
+    reopened = LocalVectorIndex(path=path)
+    new_ids = reopened.insert([[5.0, 6.0]])
+    hit_ids, _ = reopened.search([[3.0, 4.0]], top_k=1)
+
+    assert (tmp_path / "vectors.npy").exists()
+    assert len(reopened) == 3
+    assert new_ids == [2]
+    assert hit_ids == [[1]]
+
+
+def test_local_index_persists_in_batches(tmp_path, monkeypatch):
+    from app.nodes.milvus_local import clear_local_indexes, get_local_index
+
+    monkeypatch.setattr("app.nodes.milvus_local._PERSIST_BATCH_ROWS", 3)
+    index = get_local_index("vectors", metric_type="L2", nlist=None, directory=str(tmp_path))
+    index.insert([[1.0, 2.0]])
+    index.insert([[3.0, 4.0]])
+
+    assert not (tmp_path / "vectors.npy").exists()
+
+    index.insert([[5.0, 6.0]])
+    index.insert([[7.0, 8.0]])
+
+    assert len(LocalVectorIndex(path=str(tmp_path / "vectors"))) == 3
+
+    clear_local_indexes()
+
+    assert len(LocalVectorIndex(path=str(tmp_path / "vectors"))) == 4
+
+
+def test_local_index_grows_buffer_geometrically():
+    index = LocalVectorIndex()
+    capacities = set()
+    for value in range(1000):
+        index.insert([[float(value), 0.0]])
+        capacities.add(index._vector_buffer.shape[0])
+    hit_ids, _ = index.search([[500.0, 0.0]], top_k=1)
+
+    assert len(index) == 1000
+    assert hit_ids == [[500]]
+    # A handful of copies rather than one per insert.
+    assert capacities == {64, 128, 256, 512, 1024}
+
+
+def test_local_index_rejects_dimension_change():
+    index = LocalVectorIndex()
+    index.insert([[1.0, 2.0]])
+
+    with pytest.raises(ValueError):
+        index.insert([[1.0, 2.0, 3.0]])
+
+
+def test_local_index_rejects_non_positive_top_k():
+    index = LocalVectorIndex()
+    index.insert([[1.0, 2.0]])
+
+    with pytest.raises(ValueError):
+        index.search([[1.0, 2.0]], top_k=0)
+
+
+def test_get_local_index_rejects_conflicting_settings():
+    from app.nodes.milvus_local import get_local_index
+
+    index = get_local_index("vectors", metric_type="l2", nlist=None, directory=None)
+
+    assert get_local_index("vectors", metric_type="L2", nlist=None, directory=None) is index
+    with pytest.raises(ValueError):
+        get_local_index("vectors", metric_type="IP", nlist=None, directory=None)
+    with pytest.raises(ValueError):
+        get_local_index("vectors", metric_type="L2", nlist=16, directory=None)
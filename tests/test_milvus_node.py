@@ -1,3 +1,4 @@
+import asyncio
 from types import SimpleNamespace
 
 from app.config import MilvusConfig
@@ -32,13 +33,22 @@ class FakeCollection:
     def load(self):
         self._calls["load"] = True
 
-    def search(self, data, anns_field, param, limit, partition_names=None):
+    def search(
+        self,
+        data,
+        anns_field,
+        param,
+        limit,
+        partition_names=None,
+        consistency_level=None,
+    ):
         self._calls["search"] = {
             "data": data,
             "anns_field": anns_field,
             "param": param,
             "limit": limit,
             "partition_names": partition_names,
+            "consistency_level": consistency_level,
         }
         return self._search_result
 
@@ -50,12 +60,15 @@ def test_milvus_node_success(monkeypatch):
     def _fake_connect(**kwargs):
         calls["connect"] = kwargs
 
-    def _fake_collection(name):
+    def _fake_collection(name, using=None):
+        calls["using"] = using
         return FakeCollection(name, calls, search_result)
 
     monkeypatch.setattr("app.nodes.milvus.connections.connect", _fake_connect)
     monkeypatch.setattr("app.nodes.milvus.Collection", _fake_collection)
-    monkeypatch.setattr("app.nodes.milvus.utility.has_collection", lambda _name: True)
+    monkeypatch.setattr(
+        "app.nodes.milvus.utility.has_collection", lambda _name, using=None: True
+    )
 
     config = MilvusConfig(
         host="127.0.0.1",
@@ -74,8 +87,10 @@ def test_milvus_node_success(monkeypatch):
         top_k=2,
     )
 
+    alias = calls["connect"].pop("alias")
+    assert alias.startswith("agent-milvus-")
+    assert calls["using"] == alias
     assert calls["connect"] == {
-        "alias": "default",
         "host": "127.0.0.1",
         "port": 19530,
         "user": "user",
@@ -88,7 +103,7 @@ def test_milvus_node_success(monkeypatch):
         "data": [{"embedding": [0.1, 0.2, 0.3]}],
         "partition_name": "test_partition",
     }
-    assert calls["flush"] is True
+    assert "flush" not in calls
     assert calls["load"] is True
     assert calls["search"] == {
         "data": [[0.2, 0.1, 0.0]],
@@ -96,6 +111,7 @@ def test_milvus_node_success(monkeypatch):
         "param": {"metric_type": "L2", "params": {"nprobe": 10}},
         "limit": 2,
         "partition_names": ["test_partition"],
+        "consistency_level": "Session",
     }
     assert result == {
         "status": "success",
@@ -146,3 +162,827 @@ def test_serialize_search_result_passthrough():
     payload = {"hits": []}
 
     assert _serialize_search_result(payload) == payload
+
+
+def test_arun_milvus_node_success(monkeypatch):
+    from app.nodes.milvus import arun_milvus_node
+
+    calls = {}
+
+    class FakeIndexParams:
+        def add_index(self, **kwargs):
+            calls["index"] = kwargs
+
+    class FakeAsyncClient:
+        def __init__(self, **kwargs):
+            calls["init"] = kwargs
+
+        async def has_collection(self, name):
+            return True
+
+        async def describe_collection(self, name):
+            return {"fields": [{"name": "id"}, {"name": "embedding"}]}
+
+        async def insert(self, name, data, partition_name=""):
+            calls["insert"] = {"name": name, "data": data, "partition_name": partition_name}
+            return {"insert_count": 1, "ids": [7]}
+
+        async def flush(self, name):
+            calls["flush"] = name
+
+        async def list_indexes(self, name, field_name=""):
+            return []
+
+        def prepare_index_params(self):
+            return FakeIndexParams()
+
+        async def create_index(self, name, index_params):
+            calls["create_index"] = name
+
+        async def load_collection(self, name):
+            calls["load"] = name
+
+        async def search(self, name, **kwargs):
+            calls["search"] = kwargs
+            return {"hits": ["ok"]}
+
+        async def close(self):
+            calls["closed"] = True
+
+    monkeypatch.setattr("app.nodes.milvus.AsyncMilvusClient", FakeAsyncClient)
+
+    config = MilvusConfig(
+        host="127.0.0.1",
+        port=19530,
+        username=None,
+        password=None,
+        collection="test_collection",
+        partition=None,
+        db_name=None,
+    )
+
+    result = asyncio.run(arun_milvus_node([0.1, 0.2, 0.3], config=config))
+
+    assert calls["init"]["uri"] == "http://127.0.0.1:19530"
+    assert calls["insert"]["data"] == [{"embedding": [0.1, 0.2, 0.3]}]
+    assert calls["index"]["index_type"] == "IVF_FLAT"
+    assert calls["search"]["data"] == [[0.1, 0.2, 0.3]]
+    assert calls["search"]["consistency_level"] == "Session"
+    assert "flush" not in calls
+    assert calls["closed"] is True
+    assert result == {
+        "status": "success",
+        "write_id": 7,
+        "query_result": {"hits": ["ok"]},
+    }
+
+
+def _session_config():
+    return MilvusConfig(
+        host="127.0.0.1",
+        port=19530,
+        username=None,
+        password=None,
+        collection="test_collection",
+        partition=None,
+        db_name=None,
+    )
+
+
+def _patch_session_backend(monkeypatch, calls):
+    def _fake_connect(**kwargs):
+        calls["connect"] = calls.get("connect", 0) + 1
+
+    def _fake_collection(name, using=None):
+        calls["collection"] = calls.get("collection", 0) + 1
+        collection = FakeCollection(name, {}, {"hits": []})
+        collection.has_index = lambda: True
+        original_load = collection.load
+
+        def _load():
+            calls["load"] = calls.get("load", 0) + 1
+            original_load()
+
+        collection.load = _load
+        return collection
+
+    monkeypatch.setattr("app.nodes.milvus.connections.connect", _fake_connect)
+    monkeypatch.setattr("app.nodes.milvus.connections.disconnect", lambda _alias: None)
+    monkeypatch.setattr("app.nodes.milvus.Collection", _fake_collection)
+    monkeypatch.setattr(
+        "app.nodes.milvus.utility.has_collection", lambda _name, using=None: True
+    )
+
+
+def test_milvus_node_reuses_session(monkeypatch):
+    calls = {}
+    _patch_session_backend(monkeypatch, calls)
+    config = _session_config()
+
+    first = run_milvus_node([0.1, 0.2, 0.3], config=config)
+    second = run_milvus_node([0.1, 0.2, 0.3], config=config)
+
+    assert first["status"] == "success"
+    assert second["status"] == "success"
+    assert calls["connect"] == 1
+    assert calls["collection"] == 1
+    assert calls["load"] == 1
+
+
+def test_milvus_node_reconnects_after_failed_health_check(monkeypatch):
+    from dataclasses import replace
+
+    calls = {}
+    _patch_session_backend(monkeypatch, calls)
+
+    def _broken_channel(using=None):
+        raise RuntimeError("channel closed")
+
+    monkeypatch.setattr("app.nodes.milvus.utility.get_server_version", _broken_channel)
+    config = replace(_session_config(), health_check_interval=0)
+
+    run_milvus_node([0.1, 0.2, 0.3], config=config)
+    result = run_milvus_node([0.1, 0.2, 0.3], config=config)
+
+    assert result["status"] == "success"
+    assert calls["connect"] == 2
+    assert calls["collection"] == 2
+    assert calls["load"] == 2
+
+
+def _fail_first_search(monkeypatch, exc):
+    real_search = FakeCollection.search
+    failures = [exc]
+
+    def _search(self, *args, **kwargs):
+        if failures:
+            raise failures.pop()
+        return real_search(self, *args, **kwargs)
+
+    monkeypatch.setattr(FakeCollection, "search", _search)
+
+
+def test_milvus_node_keeps_session_after_server_error(monkeypatch):
+    from pymilvus.exceptions import MilvusException
+
+    calls = {}
+    _patch_session_backend(monkeypatch, calls)
+    _fail_first_search(monkeypatch, MilvusException(message="collection not loaded"))
+    config = _session_config()
+
+    failed = run_milvus_node([0.1, 0.2, 0.3], config=config)
+    result = run_milvus_node([0.1, 0.2, 0.3], config=config)
+
+    assert failed["status"] == "failed"
+    assert result["status"] == "success"
+    assert calls["connect"] == 1
+    # Only the collection setup is redone.
+    assert calls["collection"] == 2
+    assert calls["load"] == 2
+
+
+def test_milvus_node_health_checks_after_connection_error(monkeypatch):
+    from pymilvus.exceptions import MilvusUnavailableException
+
+    calls = {}
+    _patch_session_backend(monkeypatch, calls)
+    _fail_first_search(monkeypatch, MilvusUnavailableException(message="unavailable"))
+
+    def _ping(using=None):
+        calls["ping"] = calls.get("ping", 0) + 1
+
+    monkeypatch.setattr("app.nodes.milvus.utility.get_server_version", _ping)
+    config = _session_config()
+
+    failed = run_milvus_node([0.1, 0.2, 0.3], config=config)
+    result = run_milvus_node([0.1, 0.2, 0.3], config=config)
+
+    assert failed["status"] == "failed"
+    assert result["status"] == "success"
+    assert calls["ping"] == 1
+    assert calls["connect"] == 1
+    assert calls["collection"] == 1
+
+
+def test_milvus_node_flush_and_consistency_are_configurable(monkeypatch):
+    from dataclasses import replace
+
+    calls = {}
+
+    def _fake_collection(name, using=None):
+        return FakeCollection(name, calls, {"hits": []})
+
+    monkeypatch.setattr("app.nodes.milvus.connections.connect", lambda **_kwargs: None)
+    monkeypatch.setattr("app.nodes.milvus.Collection", _fake_collection)
+    monkeypatch.setattr(
+        "app.nodes.milvus.utility.has_collection", lambda _name, using=None: True
+    )
+    config = replace(_session_config(), consistency_level="strong", flush_on_write=True)
+
+    result = run_milvus_node([0.1, 0.2, 0.3], config=config)
+
+    assert result["status"] == "success"
+    assert calls["flush"] is True
+    assert calls["search"]["consistency_level"] == "Strong"
+
+
+def test_milvus_node_rejects_unknown_consistency_level():
+    from dataclasses import replace
+
+    config = replace(_session_config(), consistency_level="Immediate")
+
+    result = run_milvus_node([0.1, 0.2, 0.3], config=config)
+
+    assert result["status"] == "failed"
+    assert "MILVUS_CONSISTENCY_LEVEL" in result["error"]
+
+
+class FakeHits:
+    def __init__(self, ids, distances):
+        self.ids = ids
+        self.distances = distances
+
+
+def _patch_batch_backend(monkeypatch, calls, search_result=None):
+    class BatchCollection(FakeCollection):
+        def insert(self, data, partition_name=None):
+            calls.setdefault("insert_batches", []).append(len(data))
+            start = sum(calls["insert_batches"][:-1])
+            return SimpleNamespace(primary_keys=list(range(start, start + len(data))))
+
+        def has_index(self):
+            return True
+
+    def _fake_collection(name, using=None):
+        return BatchCollection(name, calls, search_result)
+
+    monkeypatch.setattr("app.nodes.milvus.connections.connect", lambda **_kwargs: None)
+    monkeypatch.setattr("app.nodes.milvus.Collection", _fake_collection)
+    monkeypatch.setattr(
+        "app.nodes.milvus.utility.has_collection", lambda _name, using=None: True
+    )
+
+
+def test_milvus_batch_insert_chunks_numpy_rows(monkeypatch):
+    import numpy as np
+
+    from app.nodes.milvus import run_milvus_batch_insert
+
+    calls = {}
+    _patch_batch_backend(monkeypatch, calls)
+    vectors = np.arange(30, dtype=np.float32).reshape(10, 3)
+
+    # 3 float32 values per row -> 12 bytes, so 4 rows fit into 48 bytes.
+    result = run_milvus_batch_insert(vectors, config=_session_config(), max_batch_bytes=48)
+
+    assert calls["insert_batches"] == [4, 4, 2]
+    assert result == {
+        "status": "success",
+        "inserted": 10,
+        "batches": 3,
+        "write_ids": list(range(10)),
+    }
+
+
+def test_milvus_batch_search_returns_per_query_arrays(monkeypatch):
+    from app.nodes.milvus import run_milvus_batch_search
+
+    calls = {}
+    search_result = [FakeHits([1, 2], [0.1, 0.2]), FakeHits([3], [0.3])]
+    _patch_batch_backend(monkeypatch, calls, search_result)
+
+    result = run_milvus_batch_search(
+        [[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]],
+        config=_session_config(),
+        top_k=2,
+    )
+
+    assert calls["search"]["data"] == [[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]]
+    assert calls["search"]["limit"] == 2
+    assert result == {
+        "status": "success",
+        "ids": [[1, 2], [3]],
+        "distances": [[0.1, 0.2], [0.3]],
+    }
+
+
+def test_milvus_batch_insert_rejects_ragged_vectors():
+    from app.nodes.milvus import run_milvus_batch_insert
+
+    result = run_milvus_batch_insert([[0.1, 0.2], [0.3]], config=_session_config())
+
+    assert result["status"] == "failed"
+    assert "dimension" in result["error"]
+
+
+def _patch_index_backend(monkeypatch, calls, *, existing_index=None):
+    class IndexedCollection(FakeCollection):
+        def has_index(self):
+            return existing_index is not None
+
+        @property
+        def indexes(self):
+            return [existing_index] if existing_index is not None else []
+
+        def create_index(self, field_name, index_params):
+            calls["create_index"] = {"field_name": field_name, "index_params": index_params}
+
+    def _fake_collection(name, using=None):
+        return IndexedCollection(name, calls, {"hits": []})
+
+    monkeypatch.setattr("app.nodes.milvus.connections.connect", lambda **_kwargs: None)
+    monkeypatch.setattr("app.nodes.milvus.Collection", _fake_collection)
+    monkeypatch.setattr(
+        "app.nodes.milvus.utility.has_collection", lambda _name, using=None: True
+    )
+
+
+def test_milvus_node_uses_configured_hnsw_index(monkeypatch):
+    from dataclasses import replace
+
+    calls = {}
+    _patch_index_backend(monkeypatch, calls)
+    config = replace(
+        _session_config(),
+        index_type="hnsw",
+        metric_type="ip",
+        index_params={"M": 32},
+        search_ef=8,
+    )
+
+    result = run_milvus_node([0.1, 0.2, 0.3], config=config, top_k=16)
+
+    assert result["status"] == "success"
+    assert calls["create_index"] == {
+        "field_name": "embedding",
+        "index_params": {
+            "index_type": "HNSW",
+            "metric_type": "IP",
+            "params": {"M": 32, "efConstruction": 200},
+        },
+    }
+    assert calls["search"]["param"] == {"metric_type": "IP", "params": {"ef": 16}}
+
+
+def test_milvus_node_reports_index_mismatch(monkeypatch):
+    from dataclasses import replace
+
+    calls = {}
+    existing_index = SimpleNamespace(
+        field_name="embedding",
+        params={"index_type": "IVF_FLAT", "metric_type": "L2", "params": {"nlist": 128}},
+    )
+    _patch_index_backend(monkeypatch, calls, existing_index=existing_index)
+    config = replace(_session_config(), index_type="DISKANN", search_list=50)
+
+    result = run_milvus_node([0.1, 0.2, 0.3], config=config)
+
+    assert "create_index" not in calls
+    assert "index_type='IVF_FLAT' (config 'DISKANN')" in result["index_warning"]
+    # Searches follow the index that actually exists.
+    assert calls["search"]["param"] == {"metric_type": "L2", "params": {"nprobe": 10}}
+
+
+def test_milvus_node_reads_flattened_string_index_params(monkeypatch):
+    from dataclasses import replace
+
+    from app.nodes.milvus import close_milvus_sessions
+
+    calls = {}
+    existing_index = SimpleNamespace(
+        field_name="embedding",
+        params={"index_type": "HNSW", "metric_type": "IP", "M": "16", "efConstruction": "200"},
+    )
+    _patch_index_backend(monkeypatch, calls, existing_index=existing_index)
+    config = replace(_session_config(), index_type="HNSW", metric_type="IP")
+
+    result = run_milvus_node([0.1, 0.2, 0.3], config=config)
+
+    assert result["status"] == "success"
+    assert "index_warning" not in result
+
+    close_milvus_sessions()
+    result = run_milvus_node([0.1, 0.2, 0.3], config=replace(config, index_params={"M": 32}))
+
+    assert result["index_warning"] == "existing index differs from config: params.M=16 (config 32)"
+
+
+def test_milvus_node_ivf_pq_requires_m():
+    from dataclasses import replace
+
+    config = replace(_session_config(), index_type="IVF_PQ")
+
+    result = run_milvus_node([0.1, 0.2, 0.3], config=config)
+
+    assert result["status"] == "failed"
+    assert "IVF_PQ" in result["error"]
+
+
+class FakeColumnarHits(list):
+    def __init__(self, ids, distances, entities):
+        super().__init__(
+            {"id": hit_id, "distance": distance, "entity": entity}
+            for hit_id, distance, entity in zip(ids, distances, entities)
+        )
+        self.ids = ids
+        self.distances = distances
+
+
+def test_columnar_search_result_fast_path():
+    from app.nodes.milvus import _columnar_search_result
+
+    result = [
+        FakeColumnarHits([1, 2], [0.1, 0.2], [{"tag": "a"}, {"tag": "b"}]),
+        FakeColumnarHits([3], [0.3], [{"tag": "c"}]),
+    ]
+
+    assert _columnar_search_result(result, ["tag"]) == {
+        "ids": [[1, 2], [3]],
+        "distances": [[0.1, 0.2], [0.3]],
+        "fields": {"tag": [["a", "b"], ["c"]]},
+    }
+    assert _columnar_search_result([{"hits": []}]) is None
+
+
+def test_milvus_node_returns_columnar_query_result(monkeypatch):
+    calls = {}
+    search_result = [FakeColumnarHits([5, 6], [0.5, 0.6], [{}, {}])]
+
+    def _fake_collection(name, using=None):
+        return FakeCollection(name, calls, search_result)
+
+    monkeypatch.setattr("app.nodes.milvus.connections.connect", lambda **_kwargs: None)
+    monkeypatch.setattr("app.nodes.milvus.Collection", _fake_collection)
+    monkeypatch.setattr(
+        "app.nodes.milvus.utility.has_collection", lambda _name, using=None: True
+    )
+
+    result = run_milvus_node([0.1, 0.2, 0.3], config=_session_config())
+
+    assert result["query_result"] == {"ids": [[5, 6]], "distances": [[0.5, 0.6]]}
+
+
+def test_milvus_node_local_backend(tmp_path):
+    from dataclasses import replace
+
+    from app.nodes.milvus import run_milvus_batch_insert, run_milvus_batch_search
+    from app.nodes.milvus_local import flush_local_indexes
+
+    config = replace(
+        _session_config(),
+        host=None,
+        port=None,
+        backend="local",
+        local_path=str(tmp_path),
+        index_type="FLAT",
+    )
+
+    inserted = run_milvus_batch_insert([[0.0, 0.0, 1.0], [1.0, 0.0, 0.0]], config=config)
+    result = run_milvus_node([0.0, 1.0, 0.0], config=config, query_vector=[1.0, 0.0, 0.0], top_k=1)
+    searched = run_milvus_batch_search([[0.0, 0.0, 1.0]], config=config, top_k=1)
+
+    assert inserted["write_ids"] == [0, 1]
+    assert result["status"] == "success"
+    assert result["write_id"] == 2
+    assert result["query_result"]["ids"] == [[1]]
+    assert searched["ids"] == [[0]]
+
+    flush_local_indexes()
+
+    assert (tmp_path / "test_collection.npy").exists()
+
+
+def _patch_dedupe_backend(monkeypatch, calls, stored):
+    class HashedCollection(FakeCollection):
+        schema = SimpleNamespace(
+            fields=[SimpleNamespace(name="id"), SimpleNamespace(name="embedding"),
+                    SimpleNamespace(name="content_hash")]
+        )
+
+        def insert(self, data, partition_name=None):
+            calls.setdefault("inserted", []).extend(data)
+            ids = []
+            for row in data:
+                stored[row["content_hash"]] = 100 + len(stored)
+                ids.append(stored[row["content_hash"]])
+            return SimpleNamespace(primary_keys=ids)
+
+        def query(self, expr, output_fields, consistency_level=None):
+            calls.setdefault("queries", []).append(expr)
+            return [
+                {"id": pk, "content_hash": content_hash}
+                for content_hash, pk in stored.items()
+                if f'"{content_hash}"' in expr
+            ]
+
+    def _fake_collection(name, using=None):
+        return HashedCollection(name, calls, {"hits": []})
+
+    monkeypatch.setattr("app.nodes.milvus.connections.connect", lambda **_kwargs: None)
+    monkeypatch.setattr("app.nodes.milvus.connections.disconnect", lambda _alias: None)
+    monkeypatch.setattr("app.nodes.milvus.Collection", _fake_collection)
+    monkeypatch.setattr(
+        "app.nodes.milvus.utility.has_collection", lambda _name, using=None: True
+    )
+    return HashedCollection
+
+
+def test_milvus_node_deduplicates_repeated_vector(monkeypatch):
+    from app.nodes.milvus import close_milvus_sessions
+
+    calls = {}
+    stored = {}
+    _patch_dedupe_backend(monkeypatch, calls, stored)
+    config = _session_config()
+
+    first = run_milvus_node([0.1, 0.2, 0.3], config=config)
+    second = run_milvus_node([0.1, 0.2, 0.3], config=config)
+
+    assert first["deduplicated"] is False
+    assert second["deduplicated"] is True
+    assert second["write_id"] == first["write_id"] == 100
+    assert len(calls["inserted"]) == 1
+    # The second call is answered from the in-process cache.
+    assert len(calls["queries"]) == 1
+
+    close_milvus_sessions()
+    third = run_milvus_node([0.1, 0.2, 0.3], config=config)
+
+    assert third["write_id"] == 100
+    assert len(calls["inserted"]) == 1
+    assert len(calls["queries"]) == 2
+
+
+def test_milvus_node_dedupe_hashes_metadata_and_can_be_disabled(monkeypatch):
+    from dataclasses import replace
+
+    calls = {}
+    stored = {}
+    _patch_dedupe_backend(monkeypatch, calls, stored)
+    config = _session_config()
+
+    run_milvus_node([0.1, 0.2, 0.3], config=config, metadata={"source": "a"})
+    tagged = run_milvus_node([0.1, 0.2, 0.3], config=config, metadata={"source": "b"})
+    disabled = run_milvus_node([0.1, 0.2, 0.3], config=replace(config, dedupe=False))
+
+    assert tagged["deduplicated"] is False
+    assert "deduplicated" not in disabled
+    assert "content_hash" not in calls["inserted"][-1]
+    assert len(calls["inserted"]) == 3
+
+
+def test_milvus_batch_insert_deduplicates_within_batch(monkeypatch):
+    from app.nodes.milvus import run_milvus_batch_insert
+
+    calls = {}
+    stored = {}
+    _patch_dedupe_backend(monkeypatch, calls, stored)
+    config = _session_config()
+    run_milvus_node([1.0, 1.0, 1.0], config=config)
+
+    result = run_milvus_batch_insert(
+        [[0.5, 0.5, 0.5], [1.0, 1.0, 1.0], [0.5, 0.5, 0.5]],
+        config=config,
+    )
+
+    assert result == {
+        "status": "success",
+        "inserted": 1,
+        "batches": 1,
+        "write_ids": [101, 100, 101],
+        "deduplicated": 2,
+    }
+
+
+def test_milvus_node_warns_once_when_collection_lacks_hash_field(monkeypatch, caplog):
+    calls = {}
+    _patch_session_backend(monkeypatch, calls)
+    config = _session_config()
+
+    with caplog.at_level("WARNING", logger="app.nodes.milvus"):
+        run_milvus_node([0.1, 0.2, 0.3], config=config)
+        result = run_milvus_node([0.1, 0.2, 0.3], config=config)
+
+    assert "deduplicated" not in result
+    warnings = [record for record in caplog.records if "content_hash" in record.getMessage()]
+    assert len(warnings) == 1
+
+
+def test_milvus_schema_adds_hash_field_only_with_dedupe():
+    from app.nodes.milvus import _build_schema
+
+    with_hash = _build_schema(dim=3, dedupe=True)
+    without_hash = _build_schema(dim=3, dedupe=False)
+
+    assert [field.name for field in with_hash.fields] == ["id", "embedding", "content_hash"]
+    assert [field.name for field in without_hash.fields] == ["id", "embedding"]
+
+
+def test_milvus_node_dedupe_serialises_concurrent_writers(monkeypatch):
+    import threading
+    import time
+
+    calls = {}
+    stored = {}
+    collection_cls = _patch_dedupe_backend(monkeypatch, calls, stored)
+    real_query = collection_cls.query
+
+    def _slow_query(self, *args, **kwargs):
+        time.sleep(0.05)
+        return real_query(self, *args, **kwargs)
+
+    monkeypatch.setattr(collection_cls, "query", _slow_query)
+    config = _session_config()
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(run_milvus_node([0.1, 0.2, 0.3], config=config))
+        )
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls["inserted"]) == 1
+    assert sorted(result["deduplicated"] for result in results) == [False, True]
+
+
+def test_arun_milvus_node_deduplicates_repeated_vector(monkeypatch):
+    from app.nodes.milvus import arun_milvus_node
+
+    calls = {"inserted": [], "queries": []}
+    stored = {}
+
+    class FakeAsyncClient:
+        def __init__(self, **_kwargs):
+            pass
+
+        async def has_collection(self, name):
+            return True
+
+        async def describe_collection(self, name):
+            return {"fields": [{"name": "id"}, {"name": "embedding"}, {"name": "content_hash"}]}
+
+        async def query(self, name, filter, output_fields, partition_names, consistency_level):
+            calls["queries"].append(filter)
+            return [
+                {"id": pk, "content_hash": content_hash}
+                for content_hash, pk in stored.items()
+                if f'"{content_hash}"' in filter
+            ]
+
+        async def insert(self, name, data, partition_name=""):
+            calls["inserted"].extend(data)
+            for row in data:
+                stored[row["content_hash"]] = 100 + len(stored)
+            return {"ids": [stored[row["content_hash"]] for row in data]}
+
+        async def list_indexes(self, name, field_name=""):
+            return ["embedding"]
+
+        async def describe_index(self, name, index_name):
+            return {"index_type": "IVF_FLAT", "metric_type": "L2", "params": {"nlist": 128}}
+
+        async def load_collection(self, name):
+            pass
+
+        async def search(self, name, **kwargs):
+            return {"hits": []}
+
+        async def close(self):
+            pass
+
+    monkeypatch.setattr("app.nodes.milvus.AsyncMilvusClient", FakeAsyncClient)
+    config = _session_config()
+
+    async def _run_twice():
+        first = await arun_milvus_node([0.1, 0.2, 0.3], config=config)
+        second = await arun_milvus_node([0.1, 0.2, 0.3], config=config)
+        return first, second
+
+    first, second = asyncio.run(_run_twice())
+
+    assert first["deduplicated"] is False
+    assert second["deduplicated"] is True
+    assert first["write_id"] == second["write_id"] == 100
+    assert len(calls["inserted"]) == 1
+    assert "content_hash" in calls["inserted"][0]
+
+
+def test_arun_milvus_node_reuses_client_and_collection_setup(monkeypatch):
+    from app.nodes.milvus import arun_milvus_node
+
+    calls = []
+    clients = []
+
+    class FakeAsyncClient:
+        def __init__(self, **_kwargs):
+            self.closed = False
+            clients.append(self)
+
+        async def has_collection(self, name):
+            calls.append("has_collection")
+            return True
+
+        async def describe_collection(self, name):
+            calls.append("describe_collection")
+            return {"fields": [{"name": "id"}, {"name": "embedding"}]}
+
+        async def insert(self, name, data, partition_name=""):
+            return {"ids": [7]}
+
+        async def list_indexes(self, name, field_name=""):
+            calls.append("list_indexes")
+            return ["embedding"]
+
+        async def describe_index(self, name, index_name):
+            calls.append("describe_index")
+            return {"index_type": "IVF_FLAT", "metric_type": "L2", "params": {"nlist": 128}}
+
+        async def load_collection(self, name):
+            calls.append("load_collection")
+
+        async def search(self, name, **kwargs):
+            return {"hits": []}
+
+        async def close(self):
+            self.closed = True
+
+    monkeypatch.setattr("app.nodes.milvus.AsyncMilvusClient", FakeAsyncClient)
+    config = _session_config()
+
+    async def _run_twice():
+        await arun_milvus_node([0.1, 0.2, 0.3], config=config)
+        result = await arun_milvus_node([0.1, 0.2, 0.3], config=config)
+        return result, [client.closed for client in clients]
+
+    result, open_during_run = asyncio.run(_run_twice())
+
+    assert result["status"] == "success"
+    assert open_during_run == [False]
+    assert calls == [
+        "has_collection",
+        "describe_collection",
+        "list_indexes",
+        "describe_index",
+        "load_collection",
+    ]
+    assert clients[0].closed is True
+
+
+def test_arun_milvus_node_reports_index_mismatch(monkeypatch):
+    from dataclasses import replace
+
+    from app.nodes.milvus import arun_milvus_node
+
+    calls = {}
+
+    class FakeAsyncClient:
+        def __init__(self, **_kwargs):
+            pass
+
+        async def has_collection(self, name):
+            return True
+
+        async def describe_collection(self, name):
+            return {"fields": [{"name": "id"}, {"name": "embedding"}]}
+
+        async def insert(self, name, data, partition_name=""):
+            return {"ids": [7]}
+
+        async def list_indexes(self, name, field_name=""):
+            return ["embedding"]
+
+        async def describe_index(self, name, index_name):
+            return {
+                "index_type": "HNSW",
+                "metric_type": "IP",
+                "M": "8",
+                "efConstruction": "100",
+                "field_name": "embedding",
+                "index_name": index_name,
+                "total_rows": 1,
+                "state": "Finished",
+            }
+
+        async def load_collection(self, name):
+            pass
+
+        async def search(self, name, **kwargs):
+            calls["search_params"] = kwargs["search_params"]
+            return {"hits": []}
+
+        async def close(self):
+            pass
+
+    monkeypatch.setattr("app.nodes.milvus.AsyncMilvusClient", FakeAsyncClient)
+    config = replace(_session_config(), index_type="HNSW", index_params={"M": 16})
+
+    result = asyncio.run(arun_milvus_node([0.1, 0.2, 0.3], config=config))
+
+    assert result["status"] == "success"
+    assert "params.M=8 (config 16)" in result["index_warning"]
+    assert "metric_type='IP'" in result["index_warning"]
+    assert calls["search_params"] == {"metric_type": "IP", "params": {"ef": 64}}
@@ -0,0 +1,167 @@
+import threading
+
+import pytest
+
+from app.config import (
+    AppConfig,
+    CheckpointConfig,
+    LangfuseConfig,
+    LLMConfig,
+    MCPConfig,
+    Mem0Config,
+    MilvusConfig,
+)
+from app.graph import run_agent_many
+
+
+def _config():
+    return AppConfig(
+        milvus=MilvusConfig(
+            host=None,
+            port=None,
+            username=None,
+            password=None,
+            collection="test_collection",
+            partition=None,
+            db_name=None,
+        ),
+        mem0=Mem0Config(
+            server_url=None,
+            api_key=None,
+            user_id="user-1",
+        ),
+        llm=LLMConfig(
+            api_key=None,
+            endpoint=None,
+            model="gpt-test",
+            timeout=None,
+            temperature=None,
+        ),
+        langfuse=LangfuseConfig(
+            public_key=None,
+            secret_key=None,
+            host=None,
+            env=None,
+        ),
+        mcp=MCPConfig(
+            transport=None,
+            server_url=None,
+            tool_name="echo",
+            api_key=None,
+            command=None,
+            args=[],
+        ),
+        checkpoint=CheckpointConfig(
+            backend="memory",
+            path=None,
+        ),
+    )
+
+
+def _overrides(llm_node):
+    return {
+        "llm": llm_node,
+        "mem0": lambda _state: {"mem0": {"status": "success"}},
+        "milvus": lambda _state: {"milvus": {"status": "success"}},
+        "mcp": lambda _state: {"mcp": {"status": "success"}},
+    }
+
+
+def test_run_agent_many_runs_states_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _llm(state):
+        barrier.wait()
+        return {"llm": {"output_text": state["prompt"]}}
+
+    results = list(
+        run_agent_many(
+            [{"prompt": "a"}, {"prompt": "b"}, {"prompt": "c"}],
+            config=_config(),
+            concurrency=3,
+            ordered=True,
+            node_overrides=_overrides(_llm),
+        )
+    )
+
+    assert [item["index"] for item in results] == [0, 1, 2]
+    assert [item["result"]["llm"]["output_text"] for item in results] == ["a", "b", "c"]
+    assert all(item["status"] == "success" for item in results)
+    assert len({item["thread_id"] for item in results}) == 3
+
+
+def test_run_agent_many_yields_in_completion_order():
+    release_slow = threading.Event()
+
+    def _llm(state):
+        if state["prompt"] == "slow":
+            assert release_slow.wait(timeout=5)
+        return {"llm": {"output_text": state["prompt"]}}
+
+    results = run_agent_many(
+        [{"prompt": "slow"}, {"prompt": "fast"}],
+        config=_config(),
+        concurrency=2,
+        node_overrides=_overrides(_llm),
+    )
+    # Slow is only released once fast has been yielded, so fast has fully finished.
+    first = next(results)
+    release_slow.set()
+    rest = list(results)
+
+    assert [item["index"] for item in [first, *rest]] == [1, 0]
+
+
+def test_run_agent_many_ordered_keeps_workers_busy_behind_slow_head():
+    release_head = threading.Event()
+    tail_started = threading.Barrier(2, timeout=5)
+
+    def _llm(state):
+        if state["prompt"] == "head":
+            assert release_head.wait(timeout=5)
+        elif state["prompt"] in {"c", "d"}:
+            # Only reachable while the head is still running if the freed
+            # worker slots are refilled.
+            tail_started.wait()
+            if state["prompt"] == "d":
+                release_head.set()
+        return {"llm": {"output_text": state["prompt"]}}
+
+    results = list(
+        run_agent_many(
+            [{"prompt": "head"}, {"prompt": "b"}, {"prompt": "c"}, {"prompt": "d"}],
+            config=_config(),
+            concurrency=3,
+            ordered=True,
+            node_overrides=_overrides(_llm),
+        )
+    )
+
+    assert [item["index"] for item in results] == [0, 1, 2, 3]
+    assert all(item["status"] == "success" for item in results)
+
+
+def test_run_agent_many_returns_failures_as_data():
+    def _llm(state):
+        if state["prompt"] == "bad":
+            raise RuntimeError("boom")
+        return {"llm": {"output_text": state["prompt"]}}
+
+    results = list(
+        run_agent_many(
+            [{"prompt": "ok"}, {"prompt": "bad"}, {"prompt": "ok"}],
+            config=_config(),
+            concurrency=1,
+            ordered=True,
+            node_overrides=_overrides(_llm),
+        )
+    )
+
+    assert [item["status"] for item in results] == ["success", "failed", "success"]
+    assert results[1]["result"] is None
+    assert "boom" in results[1]["error"]
+
+
+def test_run_agent_many_rejects_invalid_concurrency():
+    with pytest.raises(ValueError):
+        next(run_agent_many([{"prompt": "a"}], config=_config(), concurrency=0))